@@ -0,0 +1,65 @@
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the standard library encoder
+    orjson = None
+
+
+# Database types found in account rows, keyed by exact type for a single dict lookup
+ENCODERS = {
+    datetime: datetime.isoformat,
+    date: date.isoformat,
+    Decimal: float,
+    uuid.UUID: str,
+}
+
+
+def encode_value(value: Any) -> Any:
+    """Convert the database types found in account rows to JSON-native values"""
+    encoder = ENCODERS.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+
+    for value_type, encoder in ENCODERS.items():
+        if isinstance(value, value_type):
+            return encoder(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj: Any, indent: Any = None) -> bytes:
+    """Encode a response body, with orjson when it is installed"""
+    if orjson:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, default=encode_value, option=option)
+    return json.dumps(obj, default=encode_value, indent=indent, ensure_ascii=False).encode()
+
+
+class AccountJSONProvider(DefaultJSONProvider):
+    """JSON provider encoding rows straight from the database
+
+    datetimes become ISO 8601 strings, Decimals floats and UUIDs strings, so
+    serializers can pass row values through unconverted. Uses orjson when it
+    is installed; keys keep their insertion order either way.
+    """
+
+    sort_keys = False
+    backend = "orjson" if orjson else "json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.dumps_bytes(obj, indent=kwargs.get("indent")).decode()
+
+    def dumps_bytes(self, obj: Any, indent: Any = None) -> bytes:
+        return dumps_bytes(obj, indent)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Like jsonify, without encoding the body to a str and back to bytes"""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = 2 if self.compact is False or (self.compact is None and self._app.debug) else None
+        return self._app.response_class(self.dumps_bytes(obj, indent=indent) + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,90 @@
+import re
+import time
+from flask import Response, g, request
+from src.db.connection import pool_stats
+from src.db.instrumentation import track_queries
+from src.utils.metrics import RequestMetrics, render_metrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Requests that match no route share one label, so unknown paths cannot grow the series
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Starlette path parameters ("{account_id:uuid}") in the Flask rule syntax ("<account_id>")
+_PATH_PARAM = re.compile(r"\{(\w+)(?::\w+)?\}")
+
+
+def init_metrics(app, metrics=None):
+    """Record request, response and SQL metrics for every route and serve them on /metrics"""
+    metrics = metrics or RequestMetrics()
+    app.extensions["request_metrics"] = metrics
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+        g.query_stats = track_queries()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop("request_started", None)
+        if started is None or request.path == "/metrics":
+            return response
+
+        route = request.url_rule.rule if request.url_rule else UNMATCHED_ROUTE
+        queries = g.pop("query_stats")
+        metrics.observe(
+            route,
+            request.method,
+            response.status_code,
+            time.perf_counter() - started,
+            response.content_length,  # None for streamed bodies
+            queries.seconds,
+            queries.queries,
+        )
+        return response
+
+    @app.route("/metrics")
+    def prometheus_metrics():
+        return Response(render_metrics(metrics, pool_stats()), content_type=PROMETHEUS_CONTENT_TYPE)
+
+    return metrics
+
+
+class MetricsMiddleware:
+    """ASGI counterpart of init_metrics, for the async routes
+
+    Records the requests served by ``routes`` into the Flask app's metrics,
+    under the route labels Flask would use, so /metrics reports both apps;
+    requests passed through to Flask are recorded by Flask itself.
+    """
+
+    def __init__(self, app, metrics, routes):
+        self.app = app
+        self.metrics = metrics
+        self.labels = {route.endpoint: _PATH_PARAM.sub(r"<\1>", route.path) for route in routes}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        queries = track_queries()
+
+        async def send_with_metrics(message):
+            # The router has set the matched endpoint by the time the response starts
+            route = self.labels.get(scope.get("endpoint"))
+            if message["type"] == "http.response.start" and route:
+                headers = dict(message.get("headers", []))
+                size = headers.get(b"content-length")
+                self.metrics.observe(
+                    route,
+                    scope["method"],
+                    message["status"],
+                    time.perf_counter() - started,
+                    int(size) if size is not None else None,  # None for streamed bodies
+                    queries.seconds,
+                    queries.queries,
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_metrics)
@@ -0,0 +1,48 @@
+from flask import g, request
+from src.utils.logger import set_request_id
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+
+def init_request_id(app):
+    """Give every request an id (the caller's X-Request-ID if sane), log it and echo it back"""
+
+    @app.before_request
+    def start_request_id():
+        g.request_id = set_request_id(request.headers.get(REQUEST_ID_HEADER))
+
+    @app.after_request
+    def echo_request_id(response):
+        request_id = g.get("request_id")
+        if request_id:
+            response.headers[REQUEST_ID_HEADER] = request_id
+        return response
+
+
+class RequestIdMiddleware:
+    """ASGI counterpart of init_request_id, for the async routes
+
+    The id is written back into the request headers, so the Flask app behind
+    the ASGI front reuses it instead of generating another.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        header = REQUEST_ID_HEADER.lower().encode()
+        incoming = next((value for name, value in scope["headers"] if name == header), None)
+        request_id = set_request_id(incoming.decode("latin-1") if incoming else None)
+        headers = [(name, value) for name, value in scope["headers"] if name != header]
+        scope = dict(scope, headers=headers + [(header, request_id.encode())])
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                response_headers = [(name, value) for name, value in message.get("headers", []) if name.lower() != header]
+                message = dict(message, headers=response_headers + [(header, request_id.encode())])
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
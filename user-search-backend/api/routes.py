@@ -1,9 +1,11 @@
 # api/routes.py
 from flask import Blueprint
 from .v1.accounts import accounts_bp
+from .v1.search import search_bp
 
 # Create main API blueprint
 api_bp = Blueprint("api", __name__)
 
 # Register v1 blueprints
 api_bp.register_blueprint(accounts_bp, url_prefix="/v1")
+api_bp.register_blueprint(search_bp, url_prefix="/v1")
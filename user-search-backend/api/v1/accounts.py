@@ -1,8 +1,12 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, json, stream_with_context
 from src.models.service_provider import ServiceProvider
 from src.models.service_consumer import ServiceConsumer
-from src.db.queries import AccountQueries
-from src.db.connection import get_db
+from src.db.queries import AccountQueries, LIST_SORTS, parse_fields
+from src.db.connection import get_db, get_pool
+from src.db.pagination import parse_limit
+from .serializers import format_account
+from .filters import list_filters, parse_sort
+from .etags import account_etag, account_not_modified, collection_etag, not_modified, with_etag
 
 accounts_bp = Blueprint("accounts", __name__)
 
@@ -10,52 +14,148 @@ accounts_bp = Blueprint("accounts", __name__)
 accounts_storage = {}
 
 
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+REQUIRED_FIELDS = ["name", "email", "address"]
+MAX_BATCH_SIZE = 10000
+# hourly_rate and preferred_budget are DECIMAL(10, 2) columns
+MAX_AMOUNT = 10**8
+
+
+def wants_stream(args, accept_mimetypes):
+    """Streaming is requested with ?stream=1 or by preferring NDJSON in the Accept header"""
+    if args.get("stream", "").lower() in ("1", "true"):
+        return True
+    return accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def stream_accounts(filters, fields, sort):
+    """Stream every matching account as one JSON document per line
+
+    The query runs (and its first row is read) before the response starts, so
+    invalid parameters and database errors still get a 400 or 500.
+    """
+    # The request's connection goes back to the pool when the view returns,
+    # before the body is sent, so the stream borrows one of its own
+    pool = get_pool()
+    conn = pool.getconn()
+    rows = AccountQueries(conn).iter_accounts(**filters, fields=fields, sort=sort)
+    try:
+        first = next(rows, None)
+    except Exception:
+        rows.close()
+        pool.putconn(conn)
+        raise
+
+    released = []
+
+    def release():
+        # Once the body is sent, or when the server closes the response (a client gone mid-stream)
+        if not released:
+            released.append(True)
+            rows.close()
+            pool.putconn(conn)
+
+    def generate():
+        try:
+            if first is None:
+                return
+            yield json.dumps(format_account(first, fields)) + "\n"
+            for account in rows:
+                yield json.dumps(format_account(account, fields)) + "\n"
+        finally:
+            release()
+
+    response = Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+    response.call_on_close(release)
+    return response
+
+
+def validate_coordinates(address):
+    """Return an error message if the address has lat/lon that are not valid coordinates, or None"""
+    for key, limit in (("lat", 90), ("lon", 180)):
+        value = address.get(key)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not -limit <= value <= limit:
+            return f"address.{key} must be a number between -{limit} and {limit}"
+    return None
+
+
+def validate_amount(field, value):
+    """Return an error message if the value does not fit a DECIMAL(10, 2) amount column, or None"""
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return f"{field} must be a number"
+    if not 0 <= value < MAX_AMOUNT:  # also rejects NaN
+        return f"{field} must be at least 0 and less than {MAX_AMOUNT}"
+    return None
+
+
+def validate_service_history(value):
+    """Return an error message unless the service history is absent or a list of objects, or None"""
+    if value is None:
+        return None
+    if not isinstance(value, list) or not all(isinstance(entry, dict) for entry in value):
+        return "service_history must be a list of objects"
+    return None
+
+
+def write_miss_response(queries, account_id, label):
+    """404 or 400 for a type-guarded write that matched no row
+
+    The extra type lookup only runs on this failure path.
+    """
+    if queries.get_account_type(account_id) is None:
+        return jsonify({"error": f"{label} not found"}), 404
+    return jsonify({"error": f"Account is not a {label}"}), 400
+
+
 # GENERAL ACCOUNT ENDPOINTS
 @accounts_bp.route("/", methods=["GET"])
 def list_all_accounts():
-    """List all accounts with optional filters"""
+    """List accounts with optional filters, one keyset-paginated page at a time (or streamed as NDJSON)"""
     try:
-        account_type = request.args.get("account_type")
-        tags = request.args.getlist("tags")
+        filters = list_filters(request.args)
+        fields = parse_fields(request.args.get("fields"))
+        sort = parse_sort(request.args, LIST_SORTS, "distance" if filters["near"] else "created_at")
+
+        if wants_stream(request.args, request.accept_mimetypes):
+            return stream_accounts(filters, fields, sort)
+
+        cursor = request.args.get("cursor")
+        limit = parse_limit(request.args.get("limit"))
 
         # Get database connection and create queries instance
         db = get_db()
         queries = AccountQueries(db)
 
+        # Unchanged data costs only the change version lookup
+        etag = collection_etag(queries.get_change_version(), request.path, request.args.items(multi=True))
+        cached = not_modified(etag)
+        if cached:
+            return cached
+
         # Query the database
-        accounts_data = queries.get_all_accounts(account_type=account_type, tags=tags if tags else None)
+        accounts_data, next_cursor = queries.get_all_accounts(
+            **filters, limit=limit, cursor=cursor, fields=fields, sort=sort
+        )
 
         # Format response data
-        formatted_accounts = []
-        for account in accounts_data:
-            response_data = {
-                "id": account["id"],
-                "name": account["name"],
-                "email": account["email"],
-                "address": account["address"],
-                "tags": account["tags"],
-                "account_type": account["account_type"],
-                "created_at": account["created_at"].isoformat(),
-                "updated_at": account["updated_at"].isoformat(),
-            }
-
-            # Add type-specific fields
-            if account["account_type"] == "service_provider":
-                if account["hourly_rate"]:
-                    response_data["hourly_rate"] = float(account["hourly_rate"])
-                if account["availability"]:
-                    response_data["availability"] = account["availability"]
+        formatted_accounts = [format_account(account, fields) for account in accounts_data]
 
-            elif account["account_type"] == "service_consumer":
-                if account["preferred_budget"]:
-                    response_data["preferred_budget"] = float(account["preferred_budget"])
-                if account["service_history"]:
-                    response_data["service_history"] = account["service_history"]
-
-            formatted_accounts.append(response_data)
-
-        return jsonify({"message": f"Found {len(formatted_accounts)} accounts", "data": formatted_accounts}), 200
+        response = jsonify(
+            {
+                "message": f"Found {len(formatted_accounts)} accounts",
+                "data": formatted_accounts,
+                "next_cursor": next_cursor,
+            }
+        )
+        return with_etag(response, etag), 200
 
+    except ValueError as ve:
+        return jsonify({"error": "Validation error", "details": str(ve)}), 400
     except Exception as e:
         return jsonify({"error": "Failed to list accounts", "details": str(e)}), 500
 
@@ -64,43 +164,27 @@ def list_all_accounts():
 def get_account_by_id(account_id):
     """Get account details by ID"""
     try:
+        fields = parse_fields(request.args.get("fields"))
+
         # Get database connection and create queries instance
         db = get_db()
         queries = AccountQueries(db)
 
+        cached = account_not_modified(queries, account_id, fields=fields)
+        if cached:
+            return cached
+
         # Query the database
-        account_data = queries.get_account_by_id(account_id)
+        account_data = queries.get_account_by_id(account_id, fields=fields)
 
         if not account_data:
             return jsonify({"error": "Account not found"}), 404
 
-        # Convert database result to response format
-        response_data = {
-            "id": account_data["id"],
-            "name": account_data["name"],
-            "email": account_data["email"],
-            "address": account_data["address"],
-            "tags": account_data["tags"],
-            "account_type": account_data["account_type"],
-            "created_at": account_data["created_at"].isoformat(),
-            "updated_at": account_data["updated_at"].isoformat(),
-        }
-
-        # Add type-specific fields
-        if account_data["account_type"] == "service_provider":
-            if account_data["hourly_rate"]:
-                response_data["hourly_rate"] = float(account_data["hourly_rate"])
-            if account_data["availability"]:
-                response_data["availability"] = account_data["availability"]
-
-        elif account_data["account_type"] == "service_consumer":
-            if account_data["preferred_budget"]:
-                response_data["preferred_budget"] = float(account_data["preferred_budget"])
-            if account_data["service_history"]:
-                response_data["service_history"] = account_data["service_history"]
-
-        return jsonify({"message": "Account found", "data": response_data}), 200
+        response = jsonify({"message": "Account found", "data": format_account(account_data, fields)})
+        return with_etag(response, account_etag(account_data, fields)), 200
 
+    except ValueError as ve:
+        return jsonify({"error": "Validation error", "details": str(ve)}), 400
     except Exception as e:
         return jsonify({"error": "Failed to retrieve account", "details": str(e)}), 500
 
@@ -112,17 +196,11 @@ def delete_account_by_id(account_id):
         db = get_db()
         queries = AccountQueries(db)
 
-        # Check if account exists
-        existing_account = queries.get_account_by_id(account_id)
-        if not existing_account:
+        # Delete the account; nothing deleted means it does not exist
+        if not queries.delete_account_by_id(account_id):
             return jsonify({"error": "Account not found"}), 404
 
-        # Delete the account
-        success = queries.delete_account_by_id(account_id)
-        if success:
-            return jsonify({"message": "Account deleted successfully"}), 200
-        else:
-            return jsonify({"error": "Failed to delete account"}), 500
+        return jsonify({"message": "Account deleted successfully"}), 200
 
     except Exception as e:
         return jsonify({"error": "Failed to delete account", "details": str(e)}), 500
@@ -145,12 +223,16 @@ def create_service_provider():
         if not isinstance(data["address"], dict):
             return jsonify({"error": "Address must be a dictionary"}), 400
 
+        coordinates_error = validate_coordinates(data["address"])
+        if coordinates_error:
+            return jsonify({"error": "Validation error", "details": coordinates_error}), 400
+
         # Get database connection and create queries instance
         db = get_db()
         queries = AccountQueries(db)
 
-        # Create the service provider
-        account_id = queries.create_service_provider(
+        # Create the service provider (the insert returns the full account)
+        account_data = queries.create_service_provider(
             name=data["name"],
             email=data["email"],
             address=data["address"],
@@ -159,28 +241,7 @@ def create_service_provider():
             availability=data.get("availability"),
         )
 
-        # Get the created account to return full data
-        account_data = queries.get_account_by_id(account_id)
-
-        # Format response
-        response_data = {
-            "id": account_data["id"],
-            "name": account_data["name"],
-            "email": account_data["email"],
-            "address": account_data["address"],
-            "tags": account_data["tags"],
-            "account_type": account_data["account_type"],
-            "created_at": account_data["created_at"].isoformat(),
-            "updated_at": account_data["updated_at"].isoformat(),
-        }
-
-        # Add provider-specific fields
-        if account_data["hourly_rate"]:
-            response_data["hourly_rate"] = float(account_data["hourly_rate"])
-        if account_data["availability"]:
-            response_data["availability"] = account_data["availability"]
-
-        return jsonify({"message": "ServiceProvider created successfully", "data": response_data}), 201
+        return jsonify({"message": "ServiceProvider created successfully", "data": format_account(account_data)}), 201
 
     except ValueError as ve:
         return jsonify({"error": "Validation error", "details": str(ve)}), 400
@@ -192,10 +253,16 @@ def create_service_provider():
 def get_service_provider_by_id(account_id):
     """Get ServiceProvider details by ID"""
     try:
+        fields = parse_fields(request.args.get("fields"))
+
         db = get_db()
         queries = AccountQueries(db)
 
-        account_data = queries.get_account_by_id(account_id)
+        cached = account_not_modified(queries, account_id, account_type="service_provider", fields=fields)
+        if cached:
+            return cached
+
+        account_data = queries.get_account_by_id(account_id, fields=fields)
 
         if not account_data:
             return jsonify({"error": "ServiceProvider not found"}), 404
@@ -203,26 +270,11 @@ def get_service_provider_by_id(account_id):
         if account_data["account_type"] != "service_provider":
             return jsonify({"error": "Account is not a ServiceProvider"}), 400
 
-        # Format response
-        response_data = {
-            "id": account_data["id"],
-            "name": account_data["name"],
-            "email": account_data["email"],
-            "address": account_data["address"],
-            "tags": account_data["tags"],
-            "account_type": account_data["account_type"],
-            "created_at": account_data["created_at"].isoformat(),
-            "updated_at": account_data["updated_at"].isoformat(),
-        }
-
-        # Add provider-specific fields
-        if account_data["hourly_rate"]:
-            response_data["hourly_rate"] = float(account_data["hourly_rate"])
-        if account_data["availability"]:
-            response_data["availability"] = account_data["availability"]
-
-        return jsonify({"message": "ServiceProvider found", "data": response_data}), 200
+        response = jsonify({"message": "ServiceProvider found", "data": format_account(account_data, fields)})
+        return with_etag(response, account_etag(account_data, fields)), 200
 
+    except ValueError as ve:
+        return jsonify({"error": "Validation error", "details": str(ve)}), 400
     except Exception as e:
         return jsonify({"error": "Failed to retrieve ServiceProvider", "details": str(e)}), 500
 
@@ -235,43 +287,21 @@ def update_service_provider(account_id):
         db = get_db()
         queries = AccountQueries(db)
 
-        # Check if account exists and is a service provider
-        existing_account = queries.get_account_by_id(account_id)
-        if not existing_account:
-            return jsonify({"error": "ServiceProvider not found"}), 404
-
-        if existing_account["account_type"] != "service_provider":
-            return jsonify({"error": "Account is not a ServiceProvider"}), 400
-
         data = request.get_json()
         if not data:
             return jsonify({"error": "No data provided"}), 400
 
-        # Update the service provider
-        queries.update_service_provider(account_id, **data)
+        if isinstance(data.get("address"), dict):
+            coordinates_error = validate_coordinates(data["address"])
+            if coordinates_error:
+                return jsonify({"error": "Validation error", "details": coordinates_error}), 400
 
-        # Get updated account data
-        updated_account = queries.get_account_by_id(account_id)
+        # Update the service provider (the write only matches a ServiceProvider)
+        updated_account = queries.update_service_provider(account_id, **data)
+        if not updated_account:
+            return write_miss_response(queries, account_id, "ServiceProvider")
 
-        # Format response
-        response_data = {
-            "id": updated_account["id"],
-            "name": updated_account["name"],
-            "email": updated_account["email"],
-            "address": updated_account["address"],
-            "tags": updated_account["tags"],
-            "account_type": updated_account["account_type"],
-            "created_at": updated_account["created_at"].isoformat(),
-            "updated_at": updated_account["updated_at"].isoformat(),
-        }
-
-        # Add provider-specific fields
-        if updated_account["hourly_rate"]:
-            response_data["hourly_rate"] = float(updated_account["hourly_rate"])
-        if updated_account["availability"]:
-            response_data["availability"] = updated_account["availability"]
-
-        return jsonify({"message": "ServiceProvider updated successfully", "data": response_data}), 200
+        return jsonify({"message": "ServiceProvider updated successfully", "data": format_account(updated_account)}), 200
 
     except Exception as e:
         return jsonify({"error": "Failed to update ServiceProvider", "details": str(e)}), 500
@@ -284,20 +314,11 @@ def delete_service_provider(account_id):
         db = get_db()
         queries = AccountQueries(db)
 
-        # Check if account exists and is a service provider
-        existing_account = queries.get_account_by_id(account_id)
-        if not existing_account:
-            return jsonify({"error": "ServiceProvider not found"}), 404
-
-        if existing_account["account_type"] != "service_provider":
-            return jsonify({"error": "Account is not a ServiceProvider"}), 400
+        # Delete the account only if it is a ServiceProvider
+        if not queries.delete_account_by_id(account_id, account_type="service_provider"):
+            return write_miss_response(queries, account_id, "ServiceProvider")
 
-        # Delete the account
-        success = queries.delete_account_by_id(account_id)
-        if success:
-            return jsonify({"message": "ServiceProvider deleted successfully"}), 200
-        else:
-            return jsonify({"error": "Failed to delete ServiceProvider"}), 500
+        return jsonify({"message": "ServiceProvider deleted successfully"}), 200
 
     except Exception as e:
         return jsonify({"error": "Failed to delete ServiceProvider", "details": str(e)}), 500
@@ -319,12 +340,20 @@ def create_service_consumer():
         if not isinstance(data["address"], dict):
             return jsonify({"error": "Address must be a dictionary"}), 400
 
+        coordinates_error = validate_coordinates(data["address"])
+        if coordinates_error:
+            return jsonify({"error": "Validation error", "details": coordinates_error}), 400
+
+        history_error = validate_service_history(data.get("service_history"))
+        if history_error:
+            return jsonify({"error": "Validation error", "details": history_error}), 400
+
         # Get database connection and create queries instance
         db = get_db()
         queries = AccountQueries(db)
 
-        # Create the service consumer
-        account_id = queries.create_service_consumer(
+        # Create the service consumer (the insert returns the full account)
+        account_data = queries.create_service_consumer(
             name=data["name"],
             email=data["email"],
             address=data["address"],
@@ -333,28 +362,7 @@ def create_service_consumer():
             service_history=data.get("service_history", []),
         )
 
-        # Get the created account to return full data
-        account_data = queries.get_account_by_id(account_id)
-
-        # Format response
-        response_data = {
-            "id": account_data["id"],
-            "name": account_data["name"],
-            "email": account_data["email"],
-            "address": account_data["address"],
-            "tags": account_data["tags"],
-            "account_type": account_data["account_type"],
-            "created_at": account_data["created_at"].isoformat(),
-            "updated_at": account_data["updated_at"].isoformat(),
-        }
-
-        # Add consumer-specific fields
-        if account_data["preferred_budget"]:
-            response_data["preferred_budget"] = float(account_data["preferred_budget"])
-        if account_data["service_history"]:
-            response_data["service_history"] = account_data["service_history"]
-
-        return jsonify({"message": "ServiceConsumer created successfully", "data": response_data}), 201
+        return jsonify({"message": "ServiceConsumer created successfully", "data": format_account(account_data)}), 201
 
     except ValueError as ve:
         return jsonify({"error": "Validation error", "details": str(ve)}), 400
@@ -366,10 +374,16 @@ def create_service_consumer():
 def get_service_consumer_by_id(account_id):
     """Get ServiceConsumer details by ID"""
     try:
+        fields = parse_fields(request.args.get("fields"))
+
         db = get_db()
         queries = AccountQueries(db)
 
-        account_data = queries.get_account_by_id(account_id)
+        cached = account_not_modified(queries, account_id, account_type="service_consumer", fields=fields)
+        if cached:
+            return cached
+
+        account_data = queries.get_account_by_id(account_id, fields=fields)
 
         if not account_data:
             return jsonify({"error": "ServiceConsumer not found"}), 404
@@ -377,26 +391,11 @@ def get_service_consumer_by_id(account_id):
         if account_data["account_type"] != "service_consumer":
             return jsonify({"error": "Account is not a ServiceConsumer"}), 400
 
-        # Format response
-        response_data = {
-            "id": account_data["id"],
-            "name": account_data["name"],
-            "email": account_data["email"],
-            "address": account_data["address"],
-            "tags": account_data["tags"],
-            "account_type": account_data["account_type"],
-            "created_at": account_data["created_at"].isoformat(),
-            "updated_at": account_data["updated_at"].isoformat(),
-        }
-
-        # Add consumer-specific fields
-        if account_data["preferred_budget"]:
-            response_data["preferred_budget"] = float(account_data["preferred_budget"])
-        if account_data["service_history"]:
-            response_data["service_history"] = account_data["service_history"]
-
-        return jsonify({"message": "ServiceConsumer found", "data": response_data}), 200
+        response = jsonify({"message": "ServiceConsumer found", "data": format_account(account_data, fields)})
+        return with_etag(response, account_etag(account_data, fields)), 200
 
+    except ValueError as ve:
+        return jsonify({"error": "Validation error", "details": str(ve)}), 400
     except Exception as e:
         return jsonify({"error": "Failed to retrieve ServiceConsumer", "details": str(e)}), 500
 
@@ -408,43 +407,25 @@ def update_service_consumer(account_id):
         db = get_db()
         queries = AccountQueries(db)
 
-        # Check if account exists and is a service consumer
-        existing_account = queries.get_account_by_id(account_id)
-        if not existing_account:
-            return jsonify({"error": "ServiceConsumer not found"}), 404
-
-        if existing_account["account_type"] != "service_consumer":
-            return jsonify({"error": "Account is not a ServiceConsumer"}), 400
-
         data = request.get_json()
         if not data:
             return jsonify({"error": "No data provided"}), 400
 
-        # Update the service consumer
-        queries.update_service_consumer(account_id, **data)
-
-        # Get updated account data
-        updated_account = queries.get_account_by_id(account_id)
+        if isinstance(data.get("address"), dict):
+            coordinates_error = validate_coordinates(data["address"])
+            if coordinates_error:
+                return jsonify({"error": "Validation error", "details": coordinates_error}), 400
 
-        # Format response
-        response_data = {
-            "id": updated_account["id"],
-            "name": updated_account["name"],
-            "email": updated_account["email"],
-            "address": updated_account["address"],
-            "tags": updated_account["tags"],
-            "account_type": updated_account["account_type"],
-            "created_at": updated_account["created_at"].isoformat(),
-            "updated_at": updated_account["updated_at"].isoformat(),
-        }
+        history_error = validate_service_history(data.get("service_history"))
+        if history_error:
+            return jsonify({"error": "Validation error", "details": history_error}), 400
 
-        # Add consumer-specific fields
-        if updated_account["preferred_budget"]:
-            response_data["preferred_budget"] = float(updated_account["preferred_budget"])
-        if updated_account["service_history"]:
-            response_data["service_history"] = updated_account["service_history"]
+        # Update the service consumer (the write only matches a ServiceConsumer)
+        updated_account = queries.update_service_consumer(account_id, **data)
+        if not updated_account:
+            return write_miss_response(queries, account_id, "ServiceConsumer")
 
-        return jsonify({"message": "ServiceConsumer updated successfully", "data": response_data}), 200
+        return jsonify({"message": "ServiceConsumer updated successfully", "data": format_account(updated_account)}), 200
 
     except Exception as e:
         return jsonify({"error": "Failed to update ServiceConsumer", "details": str(e)}), 500
@@ -457,49 +438,56 @@ def add_service_to_history(account_id):
         db = get_db()
         queries = AccountQueries(db)
 
-        # Check if account exists and is a service consumer
-        existing_account = queries.get_account_by_id(account_id)
-        if not existing_account:
-            return jsonify({"error": "ServiceConsumer not found"}), 404
-
-        if existing_account["account_type"] != "service_consumer":
-            return jsonify({"error": "Account is not a ServiceConsumer"}), 400
-
         data = request.get_json()
         if not data:
             return jsonify({"error": "No service data provided"}), 400
 
-        # Add service to history
-        success = queries.add_service_to_consumer_history(account_id, data)
+        # Add service to history (the write only matches a ServiceConsumer)
+        updated_account = queries.add_service_to_consumer_history(account_id, data)
+        if not updated_account:
+            return write_miss_response(queries, account_id, "ServiceConsumer")
 
-        if not success:
-            return jsonify({"error": "Failed to add service to history"}), 500
+        return jsonify({"message": "Service added to history successfully", "data": format_account(updated_account)}), 200
 
-        # Get updated account data
-        updated_account = queries.get_account_by_id(account_id)
+    except Exception as e:
+        return jsonify({"error": "Failed to add service to history", "details": str(e)}), 500
 
-        # Format response
-        response_data = {
-            "id": updated_account["id"],
-            "name": updated_account["name"],
-            "email": updated_account["email"],
-            "address": updated_account["address"],
-            "tags": updated_account["tags"],
-            "account_type": updated_account["account_type"],
-            "created_at": updated_account["created_at"].isoformat(),
-            "updated_at": updated_account["updated_at"].isoformat(),
-        }
 
-        # Add consumer-specific fields
-        if updated_account["preferred_budget"]:
-            response_data["preferred_budget"] = float(updated_account["preferred_budget"])
-        if updated_account["service_history"]:
-            response_data["service_history"] = updated_account["service_history"]
+@accounts_bp.route("/consumers/<account_id>/service-history", methods=["GET"])
+def get_service_history(account_id):
+    """List a ServiceConsumer's service history, oldest first, one keyset-paginated page at a time"""
+    try:
+        cursor = request.args.get("cursor")
+        limit = parse_limit(request.args.get("limit"))
 
-        return jsonify({"message": "Service added to history successfully", "data": response_data}), 200
+        db = get_db()
+        queries = AccountQueries(db)
+
+        entries, next_cursor = queries.get_service_history(account_id, limit=limit, cursor=cursor)
+
+        # Only an empty page needs the account lookup, to tell an empty history from a missing consumer
+        if not entries:
+            account_type = queries.get_account_type(account_id)
+            if account_type is None:
+                return jsonify({"error": "ServiceConsumer not found"}), 404
+            if account_type != "service_consumer":
+                return jsonify({"error": "Account is not a ServiceConsumer"}), 400
+
+        return (
+            jsonify(
+                {
+                    "message": f"Found {len(entries)} service history entries",
+                    "data": entries,
+                    "next_cursor": next_cursor,
+                }
+            ),
+            200,
+        )
 
+    except ValueError as ve:
+        return jsonify({"error": "Validation error", "details": str(ve)}), 400
     except Exception as e:
-        return jsonify({"error": "Failed to add service to history", "details": str(e)}), 500
+        return jsonify({"error": "Failed to retrieve service history", "details": str(e)}), 500
 
 
 @accounts_bp.route("/consumers/<account_id>", methods=["DELETE"])
@@ -509,20 +497,123 @@ def delete_service_consumer(account_id):
         db = get_db()
         queries = AccountQueries(db)
 
-        # Check if account exists and is a service consumer
-        existing_account = queries.get_account_by_id(account_id)
-        if not existing_account:
-            return jsonify({"error": "ServiceConsumer not found"}), 404
+        # Delete the account only if it is a ServiceConsumer
+        if not queries.delete_account_by_id(account_id, account_type="service_consumer"):
+            return write_miss_response(queries, account_id, "ServiceConsumer")
 
-        if existing_account["account_type"] != "service_consumer":
-            return jsonify({"error": "Account is not a ServiceConsumer"}), 400
-
-        # Delete the account
-        success = queries.delete_account_by_id(account_id)
-        if success:
-            return jsonify({"message": "ServiceConsumer deleted successfully"}), 200
-        else:
-            return jsonify({"error": "Failed to delete ServiceConsumer"}), 500
+        return jsonify({"message": "ServiceConsumer deleted successfully"}), 200
 
     except Exception as e:
         return jsonify({"error": "Failed to delete ServiceConsumer", "details": str(e)}), 500
+
+
+# BATCH CREATE ENDPOINTS
+def validate_batch_item(item, numeric_fields):
+    """Return a validation error message for one batch item, or None if it is valid"""
+    if not isinstance(item, dict):
+        return "Item must be a JSON object"
+
+    missing = [k for k in REQUIRED_FIELDS if k not in item]
+    if missing:
+        return f"Missing required fields: {', '.join(missing)}"
+
+    for field in ["name", "email"]:
+        if not isinstance(item[field], str) or not item[field].strip() or len(item[field]) > 255:
+            return f"{field} must be a non-empty string of at most 255 characters"
+
+    if not isinstance(item["address"], dict):
+        return "Address must be a dictionary"
+
+    coordinates_error = validate_coordinates(item["address"])
+    if coordinates_error:
+        return coordinates_error
+
+    tags = item.get("tags")
+    if tags is not None and (not isinstance(tags, list) or not all(isinstance(t, str) for t in tags)):
+        return "tags must be a list of strings"
+
+    for field in numeric_fields:
+        amount_error = validate_amount(field, item.get(field))
+        if amount_error:
+            return amount_error
+
+    history_error = validate_service_history(item.get("service_history"))
+    if history_error:
+        return history_error
+
+    # Free-form schedule text or a {days: hours} object (see parse_availability)
+    availability = item.get("availability")
+    if availability is not None and not isinstance(availability, (str, dict)):
+        return "availability must be a string or an object"
+
+    return None
+
+
+def create_accounts_batch(create_batch, numeric_fields, label):
+    """Validate every item, insert the valid ones in one transaction and report per-item results"""
+    try:
+        data = request.get_json()
+
+        if not isinstance(data, list) or not data:
+            return jsonify({"error": "Expected a non-empty JSON array"}), 400
+
+        if len(data) > MAX_BATCH_SIZE:
+            return jsonify({"error": f"Batch too large (max {MAX_BATCH_SIZE} items)"}), 400
+
+        results = [{"index": i} for i in range(len(data))]
+        valid_items = []
+        seen_emails = set()
+
+        for i, item in enumerate(data):
+            error = validate_batch_item(item, numeric_fields)
+            if error is None and item["email"] in seen_emails:
+                error = "Duplicate email in batch"
+
+            if error:
+                results[i]["error"] = error
+            else:
+                seen_emails.add(item["email"])
+                valid_items.append((i, item))
+
+        created_ids = {}
+        if valid_items:
+            db = get_db()
+            queries = AccountQueries(db)
+            created_ids = create_batch(queries, [item for _, item in valid_items])
+
+        for i, item in valid_items:
+            if item["email"] in created_ids:
+                results[i]["id"] = created_ids[item["email"]]
+            else:
+                results[i]["error"] = "Email already exists"
+
+        created = len(created_ids)
+        status = 201 if created else 400
+        return (
+            jsonify(
+                {
+                    "message": f"Created {created} of {len(data)} {label}s",
+                    "created": created,
+                    "failed": len(data) - created,
+                    "data": results,
+                }
+            ),
+            status,
+        )
+
+    except Exception as e:
+        return jsonify({"error": f"Failed to create {label}s", "details": str(e)}), 500
+
+
+@accounts_bp.route("/providers/batch", methods=["POST"])
+def create_service_providers_batch():
+    """Create many ServiceProviders in one request"""
+    return create_accounts_batch(AccountQueries.create_service_providers_batch, ["hourly_rate"], "ServiceProvider")
+
+
+@accounts_bp.route("/consumers/batch", methods=["POST"])
+def create_service_consumers_batch():
+    """Create many ServiceConsumers in one request"""
+    return create_accounts_batch(
+        AccountQueries.create_service_consumers_batch, ["preferred_budget"], "ServiceConsumer"
+    )
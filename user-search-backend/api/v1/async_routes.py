@@ -0,0 +1,197 @@
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header, parse_etags
+from src.db.async_queries import AsyncAccountQueries
+from src.db.queries import LIST_SORTS, SEARCH_SORTS, parse_fields
+from src.db.pagination import parse_limit
+from api.json_provider import dumps_bytes
+from .serializers import format_account
+from .filters import list_filters, parse_sort
+from .etags import account_etag, collection_etag
+from .accounts import NDJSON_MIMETYPE, wants_stream
+
+# Async twins of the hot read endpoints of the accounts and search blueprints.
+# Query parsing, SQL, serialization and ETags are shared with the blueprints, so
+# responses are identical; every other route is served by the Flask app.
+
+# Origins allowed by the Flask app's CORS setup (app.py)
+CORS_ORIGINS = ("http://localhost:3001",)
+
+
+def json_response(request, body, status=200, etag=None):
+    response = Response(dumps_bytes(body) + b"\n", status_code=status, media_type="application/json")
+    origin = request.headers.get("origin")
+    if origin in CORS_ORIGINS:
+        response.headers["Access-Control-Allow-Origin"] = origin
+        response.headers["Vary"] = "Origin"
+    if etag:
+        response.headers["ETag"] = f'"{etag}"'
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def not_modified(request, etag):
+    """Return a 304 response if If-None-Match already names this ETag, else None"""
+    if not parse_etags(request.headers.get("if-none-match")).contains_weak(etag):
+        return None
+    return Response(status_code=304, headers={"ETag": f'"{etag}"', "Cache-Control": "no-cache"})
+
+
+async def account_not_modified(request, queries, account_id, account_type=None, fields=None):
+    """See etags.account_not_modified"""
+    if "if-none-match" not in request.headers:
+        return None
+
+    version = await queries.get_account_version(account_id)
+    if not version or (account_type and version["account_type"] != account_type):
+        return None
+    return not_modified(request, account_etag(version, fields))
+
+
+async def stream_accounts(queries, filters, fields, sort):
+    """Stream every matching account as one JSON document per line
+
+    The query runs (and its first row is read) before the response starts, so
+    invalid parameters and database errors still get a 400 or 500.
+    """
+    rows = queries.iter_accounts(**filters, fields=fields, sort=sort)
+    try:
+        first = await anext(rows, None)
+    except Exception:
+        await rows.aclose()
+        raise
+
+    async def generate():
+        try:
+            if first is None:
+                return
+            yield dumps_bytes(format_account(first, fields)) + b"\n"
+            async for account in rows:
+                yield dumps_bytes(format_account(account, fields)) + b"\n"
+        finally:
+            await rows.aclose()
+
+    return StreamingResponse(generate(), media_type=NDJSON_MIMETYPE)
+
+
+async def list_all_accounts(request):
+    """List accounts with optional filters, one keyset-paginated page at a time (or streamed as NDJSON)"""
+    try:
+        args = request.query_params
+        filters = list_filters(args)
+        fields = parse_fields(args.get("fields"))
+        sort = parse_sort(args, LIST_SORTS, "distance" if filters["near"] else "created_at")
+        queries = AsyncAccountQueries(request.app.state.db_pool)
+
+        accept = parse_accept_header(request.headers.get("accept"), MIMEAccept)
+        if wants_stream(args, accept):
+            return await stream_accounts(queries, filters, fields, sort)
+
+        cursor = args.get("cursor")
+        limit = parse_limit(args.get("limit"))
+
+        etag = collection_etag(await queries.get_change_version(), request.url.path, args.multi_items())
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+
+        accounts_data, next_cursor = await queries.get_all_accounts(
+            **filters, limit=limit, cursor=cursor, fields=fields, sort=sort
+        )
+        formatted_accounts = [format_account(account, fields) for account in accounts_data]
+
+        body = {
+            "message": f"Found {len(formatted_accounts)} accounts",
+            "data": formatted_accounts,
+            "next_cursor": next_cursor,
+        }
+        return json_response(request, body, etag=etag)
+
+    except ValueError as ve:
+        return json_response(request, {"error": "Validation error", "details": str(ve)}, 400)
+    except Exception as e:
+        return json_response(request, {"error": "Failed to list accounts", "details": str(e)}, 500)
+
+
+async def search_accounts(request):
+    """Ranked full-text search over accounts, combinable with the list filters"""
+    try:
+        args = request.query_params
+        q = args.get("q", "").strip()
+        if not q:
+            return json_response(request, {"error": "Missing search query", "required": ["q"]}, 400)
+
+        filters = list_filters(args)
+        cursor = args.get("cursor")
+        limit = parse_limit(args.get("limit"))
+        fields = parse_fields(args.get("fields"))
+        sort = parse_sort(args, SEARCH_SORTS, "distance" if filters["near"] else "relevance")
+        prefix = args.get("prefix", "").lower() in ("1", "true")
+
+        queries = AsyncAccountQueries(request.app.state.db_pool)
+
+        etag = collection_etag(await queries.get_change_version(), request.url.path, args.multi_items())
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+
+        accounts_data, next_cursor = await queries.search_accounts(
+            q, **filters, limit=limit, cursor=cursor, fields=fields, sort=sort, prefix=prefix
+        )
+        formatted_accounts = [format_account(account, fields) for account in accounts_data]
+
+        body = {
+            "message": f"Found {len(formatted_accounts)} accounts",
+            "data": formatted_accounts,
+            "next_cursor": next_cursor,
+        }
+        return json_response(request, body, etag=etag)
+
+    except ValueError as ve:
+        return json_response(request, {"error": "Validation error", "details": str(ve)}, 400)
+    except Exception as e:
+        return json_response(request, {"error": "Failed to search accounts", "details": str(e)}, 500)
+
+
+def account_endpoint(account_type=None, label="Account"):
+    """GET handler for one account, optionally of one type (the by-id, provider and consumer routes)"""
+
+    async def get_account(request):
+        try:
+            account_id = str(request.path_params["account_id"])
+            fields = parse_fields(request.query_params.get("fields"))
+            queries = AsyncAccountQueries(request.app.state.db_pool)
+
+            cached = await account_not_modified(request, queries, account_id, account_type, fields)
+            if cached:
+                return cached
+
+            account_data = await queries.get_account_by_id(account_id, fields=fields)
+            if not account_data:
+                return json_response(request, {"error": f"{label} not found"}, 404)
+
+            if account_type and account_data["account_type"] != account_type:
+                return json_response(request, {"error": f"Account is not a {label}"}, 400)
+
+            body = {"message": f"{label} found", "data": format_account(account_data, fields)}
+            return json_response(request, body, etag=account_etag(account_data, fields))
+
+        except ValueError as ve:
+            return json_response(request, {"error": "Validation error", "details": str(ve)}, 400)
+        except Exception as e:
+            failure = f"Failed to retrieve {label}" if account_type else "Failed to retrieve account"
+            return json_response(request, {"error": failure, "details": str(e)}, 500)
+
+    return get_account
+
+
+# Only well-formed ids are matched here; anything else falls through to Flask,
+# which answers it the same way
+routes = [
+    Route("/api/v1/", list_all_accounts, methods=["GET"]),
+    Route("/api/v1/search", search_accounts, methods=["GET"]),
+    Route("/api/v1/providers/{account_id:uuid}", account_endpoint("service_provider", "ServiceProvider"), methods=["GET"]),
+    Route("/api/v1/consumers/{account_id:uuid}", account_endpoint("service_consumer", "ServiceConsumer"), methods=["GET"]),
+    Route("/api/v1/{account_id:uuid}", account_endpoint(), methods=["GET"]),
+]
@@ -0,0 +1,52 @@
+import hashlib
+from flask import Response, request
+
+
+def _digest(value):
+    return hashlib.sha1(value.encode()).hexdigest()
+
+
+def account_etag(account, fields=None):
+    """Strong ETag of a single account, derived from its id and updated_at (and the fieldset)"""
+    value = f"{account['id']}:{account['updated_at'].isoformat()}"
+    if fields:
+        value += ":" + ",".join(fields)
+    return _digest(value)
+
+
+def collection_etag(version, path, args):
+    """Strong ETag of a list/search page: the accounts change version plus the normalized query
+
+    ``args`` are the query string's (key, value) pairs, repeated keys included.
+    """
+    query = "&".join(f"{key}={value}" for key, value in sorted(args))
+    return _digest(f"{version}:{path}?{query}")
+
+
+def with_etag(response, etag):
+    """Attach an ETag and ask clients to revalidate it before reusing the body"""
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def not_modified(etag):
+    """Return a 304 response if If-None-Match already names this ETag, else None"""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    return with_etag(Response(status=304), etag)
+
+
+def account_not_modified(queries, account_id, account_type=None, fields=None):
+    """Answer a conditional GET for one account with a primary-key lookup instead of the full join
+
+    Returns None when the full response has to be built (no If-None-Match, a changed
+    or missing account, or one of another type, whose error the caller reports).
+    """
+    if not request.if_none_match:
+        return None
+
+    version = queries.get_account_version(account_id)
+    if not version or (account_type and version["account_type"] != account_type):
+        return None
+    return not_modified(account_etag(version, fields))
@@ -0,0 +1,102 @@
+from datetime import datetime
+from src.db.queries import RANGE_FILTERS, availability_ranges
+
+
+def parse_ranges(args):
+    """Numeric range filters (min_rate, max_rate, min_budget, max_budget) from the query string"""
+    ranges = {}
+    for name in RANGE_FILTERS:
+        value = args.get(name)
+        if value in (None, ""):
+            continue
+        try:
+            ranges[name] = float(value)
+        except ValueError:
+            raise ValueError(f"{name} must be a number")
+    return ranges or None
+
+
+def parse_near(args):
+    """Proximity filter from ?near=lat,lon and an optional ?radius_km=, or None"""
+    value = args.get("near")
+    if not value:
+        if args.get("radius_km"):
+            raise ValueError("radius_km requires near")
+        return None
+
+    try:
+        lat, lon = (float(part) for part in value.split(","))
+    except ValueError:
+        raise ValueError("near must be lat,lon")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError("near must be a latitude within ±90 and a longitude within ±180")
+
+    near = {"lat": lat, "lon": lon, "radius_km": None}
+    radius = args.get("radius_km")
+    if radius:
+        try:
+            near["radius_km"] = float(radius)
+        except ValueError:
+            raise ValueError("radius_km must be a number")
+        if not near["radius_km"] > 0:
+            raise ValueError("radius_km must be greater than 0")
+    return near
+
+
+def parse_timestamp(name, value):
+    try:
+        return datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO 8601 timestamp")
+
+
+def parse_available(args):
+    """Availability filter from ?available_at=<timestamp> or ?available_between=<start>,<end>, or None
+
+    Timestamps are read as the provider's local wall-clock time; a UTC offset is ignored.
+    """
+    available_at = args.get("available_at")
+    available_between = args.get("available_between")
+    if available_at and available_between:
+        raise ValueError("Use either available_at or available_between, not both")
+
+    if available_at:
+        return availability_ranges(parse_timestamp("available_at", available_at).replace(tzinfo=None))
+
+    if available_between:
+        try:
+            start, end = available_between.split(",")
+        except ValueError:
+            raise ValueError("available_between must be start,end")
+        start = parse_timestamp("available_between", start).replace(tzinfo=None)
+        end = parse_timestamp("available_between", end).replace(tzinfo=None)
+        if end <= start:
+            raise ValueError("available_between must end after it starts")
+        return availability_ranges(start, end)
+
+    return None
+
+
+def list_filters(args):
+    """Filters shared by the list and search endpoints, as AccountQueries keyword arguments
+
+    ``args`` is the query string: a werkzeug MultiDict in the blueprints, Starlette
+    QueryParams in the async app (both provide get and getlist).
+    """
+    tags = args.getlist("tags")
+    return {
+        "account_type": args.get("account_type"),
+        "tags": tags if tags else None,
+        "tags_mode": args.get("tags_mode") or "any",
+        "ranges": parse_ranges(args),
+        "near": parse_near(args),
+        "available": parse_available(args),
+    }
+
+
+def parse_sort(args, allowed, default):
+    """The sort order requested with ?sort=, checked against the endpoint's allowed orders"""
+    sort = args.get("sort") or default
+    if sort not in allowed:
+        raise ValueError(f"sort must be one of {', '.join(allowed)}")
+    return sort
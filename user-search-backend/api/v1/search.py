@@ -0,0 +1,126 @@
+from flask import Blueprint, request, jsonify
+from src.db.queries import AccountQueries, SEARCH_SORTS, parse_fields
+from src.db.connection import get_db
+from src.db.pagination import parse_limit
+from .serializers import format_account
+from .filters import list_filters, parse_sort
+from .etags import collection_etag, not_modified, with_etag
+
+search_bp = Blueprint("search", __name__)
+
+DEFAULT_SUGGEST_LIMIT = 10
+MAX_SUGGEST_LIMIT = 50
+DEFAULT_SUGGEST_THRESHOLD = 0.3
+DEFAULT_FACET_LIMIT = 20
+MAX_FACET_LIMIT = 200
+
+
+@search_bp.route("/search", methods=["GET"])
+def search_accounts():
+    """Ranked full-text search over accounts, combinable with the list filters"""
+    try:
+        q = request.args.get("q", "").strip()
+        if not q:
+            return jsonify({"error": "Missing search query", "required": ["q"]}), 400
+
+        filters = list_filters(request.args)
+        cursor = request.args.get("cursor")
+        limit = parse_limit(request.args.get("limit"))
+        fields = parse_fields(request.args.get("fields"))
+        sort = parse_sort(request.args, SEARCH_SORTS, "distance" if filters["near"] else "relevance")
+        prefix = request.args.get("prefix", "").lower() in ("1", "true")
+
+        db = get_db()
+        queries = AccountQueries(db)
+
+        etag = collection_etag(queries.get_change_version(), request.path, request.args.items(multi=True))
+        cached = not_modified(etag)
+        if cached:
+            return cached
+
+        accounts_data, next_cursor = queries.search_accounts(
+            q, **filters, limit=limit, cursor=cursor, fields=fields, sort=sort, prefix=prefix
+        )
+
+        formatted_accounts = [format_account(account, fields) for account in accounts_data]
+
+        response = jsonify(
+            {
+                "message": f"Found {len(formatted_accounts)} accounts",
+                "data": formatted_accounts,
+                "next_cursor": next_cursor,
+            }
+        )
+        return with_etag(response, etag), 200
+
+    except ValueError as ve:
+        return jsonify({"error": "Validation error", "details": str(ve)}), 400
+    except Exception as e:
+        return jsonify({"error": "Failed to search accounts", "details": str(e)}), 500
+
+
+@search_bp.route("/suggest", methods=["GET"])
+def suggest_accounts():
+    """Typeahead suggestions (id, name, account_type) for a partial or misspelled query"""
+    try:
+        q = request.args.get("q", "").strip()
+        if not q:
+            return jsonify({"error": "Missing search query", "required": ["q"]}), 400
+
+        account_type = request.args.get("account_type")
+
+        try:
+            limit = int(request.args.get("limit", DEFAULT_SUGGEST_LIMIT))
+            threshold = float(request.args.get("threshold", DEFAULT_SUGGEST_THRESHOLD))
+        except ValueError:
+            return jsonify({"error": "Validation error", "details": "limit and threshold must be numbers"}), 400
+
+        if not 1 <= limit <= MAX_SUGGEST_LIMIT:
+            return jsonify({"error": "Validation error", "details": f"limit must be between 1 and {MAX_SUGGEST_LIMIT}"}), 400
+        if not 0 <= threshold <= 1:
+            return jsonify({"error": "Validation error", "details": "threshold must be between 0 and 1"}), 400
+
+        db = get_db()
+        queries = AccountQueries(db)
+
+        suggestions = queries.suggest_accounts(q, account_type=account_type, limit=limit, threshold=threshold)
+
+        return jsonify({"message": f"Found {len(suggestions)} suggestions", "data": suggestions}), 200
+
+    except Exception as e:
+        return jsonify({"error": "Failed to suggest accounts", "details": str(e)}), 500
+
+
+@search_bp.route("/facets/tags", methods=["GET"])
+def tag_facets():
+    """Tag facet counts, optionally scoped by account_type, tags and a search query"""
+    try:
+        account_type = request.args.get("account_type")
+        tags = request.args.getlist("tags")
+        q = request.args.get("q", "").strip()
+
+        try:
+            limit = int(request.args.get("limit", DEFAULT_FACET_LIMIT))
+        except ValueError:
+            return jsonify({"error": "Validation error", "details": "limit must be an integer"}), 400
+
+        if not 1 <= limit <= MAX_FACET_LIMIT:
+            return jsonify({"error": "Validation error", "details": f"limit must be between 1 and {MAX_FACET_LIMIT}"}), 400
+
+        db = get_db()
+        queries = AccountQueries(db)
+
+        facets = queries.get_tag_facets(
+            account_type=account_type,
+            tags=tags if tags else None,
+            q=q or None,
+            limit=limit,
+            tags_mode=request.args.get("tags_mode") or "any",
+        )
+
+        return jsonify({"message": f"Found {len(facets)} tags", "data": facets}), 200
+
+    except ValueError as ve:
+        return jsonify({"error": "Validation error", "details": str(ve)}), 400
+    except Exception as e:
+        return jsonify({"error": "Failed to count tags", "details": str(e)}), 500
@@ -0,0 +1,35 @@
+from typing import Any, Dict, Optional, Tuple
+
+ACCOUNT_FIELDS = ("id", "name", "email", "address", "tags", "account_type", "created_at", "updated_at")
+
+# Type-specific fields, included only when set
+TYPE_FIELDS = {
+    "service_provider": ("hourly_rate", "availability"),
+    "service_consumer": ("preferred_budget", "service_history"),
+}
+
+
+def format_account(account: Dict[str, Any], fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+    """Convert a joined account row to its response format
+
+    Values are passed through as read from the database (datetime, Decimal,
+    UUID); the app's JSON provider encodes them, so there is no per-field
+    conversion here. ``fields`` restricts the output to a sparse fieldset.
+    Rows from a proximity search also carry their distance_km.
+    """
+    if fields is None:
+        response_data = {field: account[field] for field in ACCOUNT_FIELDS}
+        type_fields = TYPE_FIELDS.get(account["account_type"], ())
+    else:
+        response_data = {field: account[field] for field in ACCOUNT_FIELDS if field in fields}
+        type_fields = [field for field in TYPE_FIELDS.get(account["account_type"], ()) if field in fields]
+
+    for field in type_fields:
+        value = account[field]
+        if value:
+            response_data[field] = value
+
+    if account.get("distance_km") is not None:
+        response_data["distance_km"] = round(account["distance_km"], 3)
+
+    return response_data
@@ -1,7 +1,12 @@
 # app.py
 from flask import Flask
 from api.routes import api_bp
-from src.db.connection import get_db, close_db
+from api.json_provider import AccountJSONProvider
+from api.metrics import init_metrics
+from api.request_id import init_request_id
+from src.db.connection import get_db, close_db, pool_stats
+from src.db.cache import get_account_cache
+from src.db.instrumentation import method_stats
 from dotenv import load_dotenv
 import os
 from src import setup_logging
@@ -14,12 +19,15 @@ def create_app():
     logger = setup_logging()
 
     app = Flask(__name__)
+    app.json = AccountJSONProvider(app)
 
     CORS(app, origins=["http://localhost:3001"])
 
     # Register API blueprint
     app.register_blueprint(api_bp, url_prefix="/api")
     app.teardown_appcontext(close_db)
+    init_request_id(app)
+    init_metrics(app)
 
     @app.route("/")
     def health_check():
@@ -28,6 +36,18 @@ def create_app():
             "status": "healthy",
         }
 
+    @app.route("/db/pool")
+    def db_pool_stats():
+        return {"message": "Connection pool stats", "data": pool_stats()}
+
+    @app.route("/db/cache")
+    def account_cache_stats():
+        return {"message": "Account cache stats", "data": get_account_cache().stats()}
+
+    @app.route("/db/queries")
+    def account_query_stats():
+        return {"message": "SQL statements by AccountQueries method", "data": method_stats()}
+
     try:
         with app.app_context():
             db = get_db()
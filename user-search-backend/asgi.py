@@ -0,0 +1,43 @@
+# asgi.py
+from contextlib import asynccontextmanager
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.routing import Mount
+from app import create_app
+from api.metrics import MetricsMiddleware
+from api.request_id import RequestIdMiddleware
+from api.v1.async_routes import routes
+from src.db.async_connection import create_async_pool
+
+
+def create_asgi_app():
+    """The Flask app behind an ASGI front that serves the hot reads without blocking
+
+    List, search and by-id reads run on the event loop over a psycopg 3 pool;
+    every other request is handed to the Flask app on a worker thread.
+    """
+    flask_app = create_app()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        pool = create_async_pool()
+        await pool.open()
+        app.state.db_pool = pool
+        try:
+            yield
+        finally:
+            await pool.close()
+
+    return Starlette(
+        routes=routes + [Mount("/", app=WSGIMiddleware(flask_app))],
+        middleware=[
+            Middleware(RequestIdMiddleware),
+            Middleware(MetricsMiddleware, metrics=flask_app.extensions["request_metrics"], routes=routes),
+        ],
+        lifespan=lifespan,
+    )
+
+
+# uvicorn asgi:app
+app = create_asgi_app()
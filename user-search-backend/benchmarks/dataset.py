@@ -0,0 +1,170 @@
+# benchmarks/dataset.py
+"""Reproducible synthetic account datasets, loaded with the bulk importer
+
+Tags, cities, provider rates, consumer budgets and service history lengths
+are Zipf-distributed: a few values are very common and there is a long tail,
+as in real directories. The same --seed always produces the same records, so
+runs against a dataset of a given size are comparable.
+
+    python -m benchmarks.dataset --size 10k
+    python -m benchmarks.dataset --size 1m --workers 8 --initial-load
+    python -m benchmarks.dataset --size 10m --workers 8 --initial-load --output /data/accounts-10m.ndjson
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import tempfile
+
+from src.db.import_accounts import import_accounts
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+TRADES = [
+    "plumber", "electrician", "cleaner", "handyman", "painter", "carpenter", "gardener", "mover",
+    "roofer", "locksmith", "hvac", "landscaper", "tutor", "pet-sitter", "babysitter", "photographer",
+    "caterer", "mechanic", "welder", "tiler", "plasterer", "glazier", "pool-service", "pest-control",
+]
+QUALIFIERS = ["emergency", "licensed", "insured", "weekend", "eco-friendly", "commercial", "residential", "24h"]
+
+# Ranked by frequency (largest first); the tail is synthetic towns near them
+CITIES = [
+    ("New York", 40.7128, -74.0060), ("Los Angeles", 34.0522, -118.2437), ("Chicago", 41.8781, -87.6298),
+    ("Houston", 29.7604, -95.3698), ("Phoenix", 33.4484, -112.0740), ("Philadelphia", 39.9526, -75.1652),
+    ("San Antonio", 29.4241, -98.4936), ("San Diego", 32.7157, -117.1611), ("Dallas", 32.7767, -96.7970),
+    ("Austin", 30.2672, -97.7431), ("Jacksonville", 30.3322, -81.6557), ("San Jose", 37.3382, -121.8863),
+    ("Columbus", 39.9612, -82.9988), ("Charlotte", 35.2271, -80.8431), ("Indianapolis", 39.7684, -86.1581),
+    ("Seattle", 47.6062, -122.3321), ("Denver", 39.7392, -104.9903), ("Boston", 42.3601, -71.0589),
+    ("Nashville", 36.1627, -86.7816), ("Portland", 45.5152, -122.6784), ("Atlanta", 33.7490, -84.3880),
+    ("Miami", 25.7617, -80.1918), ("Minneapolis", 44.9778, -93.2650), ("New Orleans", 29.9511, -90.0715),
+]
+
+RATES = [50, 75, 60, 100, 40, 80, 65, 90, 120, 45, 55, 70, 150, 35, 85, 95, 110, 30, 200, 125, 175, 250]
+BUDGETS = [100, 200, 500, 150, 250, 1000, 300, 50, 750, 400, 2000, 600, 5000, 350, 800, 1500]
+SCHEDULES = [
+    "Mon-Fri 9AM-5PM", "Mon-Fri 8AM-6PM", "24/7", "Mon-Sat 8AM-8PM",
+    {"sat-sun": "10:00-16:00"}, "Mon-Fri 7AM-3PM", "Sun 10pm-2am", "Weekdays",
+]
+SERVICES = ["cleaning", "plumbing repair", "electrical inspection", "lawn care", "painting", "moving", "tutoring"]
+MAX_HISTORY = 40
+
+# Share of records that are providers, and of addresses with coordinates
+PROVIDER_SHARE = 0.5
+LOCATED_SHARE = 0.9
+
+
+class Zipf:
+    """Samples ``values`` with probability proportional to 1 / rank ** exponent"""
+
+    def __init__(self, values, exponent=1.1):
+        self.values = list(values)
+        weights = [1 / rank**exponent for rank in range(1, len(self.values) + 1)]
+        self.cum_weights = list(itertools.accumulate(weights))
+
+    def sample(self, rng, k=1):
+        return rng.choices(self.values, cum_weights=self.cum_weights, k=k)
+
+    def one(self, rng):
+        return self.sample(rng)[0]
+
+
+def tag_vocabulary():
+    """Trades first, then trade/qualifier pairs, then a long tail of rare tags"""
+    combined = [f"{qualifier}-{trade}" for qualifier in QUALIFIERS for trade in TRADES]
+    return TRADES + QUALIFIERS + combined + [f"niche-{n}" for n in range(1000)]
+
+
+def city_table(rng):
+    """The listed cities followed by 500 towns scattered around them"""
+    towns = []
+    for n in range(500):
+        name, lat, lon = CITIES[n % len(CITIES)]
+        towns.append((f"{name} Township {n}", lat + rng.uniform(-0.8, 0.8), lon + rng.uniform(-0.8, 0.8)))
+    return CITIES + towns
+
+
+class Distributions:
+    """The value distributions of a dataset, shared with the load driver's query mix"""
+
+    def __init__(self, seed=42):
+        self.tags = Zipf(tag_vocabulary())
+        self.cities = Zipf(city_table(random.Random(seed)))
+        self.rates = Zipf(RATES)
+        self.budgets = Zipf(BUDGETS)
+        self.schedules = Zipf(SCHEDULES, exponent=0.8)
+        self.history_lengths = Zipf(range(MAX_HISTORY + 1), exponent=1.3)
+        self.tag_counts = Zipf(range(1, 7), exponent=0.7)
+
+
+def make_record(i, rng, dist, seed):
+    provider = rng.random() < PROVIDER_SHARE
+    city, lat, lon = dist.cities.one(rng)
+    address = {"street": f"{rng.randint(1, 9999)} Main St", "city": city, "zip": f"{rng.randint(10000, 99999)}"}
+    if rng.random() < LOCATED_SHARE:
+        address["lat"] = round(lat + rng.uniform(-0.15, 0.15), 6)
+        address["lon"] = round(lon + rng.uniform(-0.15, 0.15), 6)
+
+    record = {
+        "name": f"{city} {'Services' if provider else 'Resident'} {i}",
+        "email": f"bench-{seed}-{i}@example.com",
+        "account_type": "service_provider" if provider else "service_consumer",
+        "address": address,
+        "tags": list(dict.fromkeys(dist.tags.sample(rng, dist.tag_counts.one(rng)))),
+    }
+    if provider:
+        record["hourly_rate"] = dist.rates.one(rng)
+        record["availability"] = dist.schedules.one(rng)
+    else:
+        record["preferred_budget"] = dist.budgets.one(rng)
+        record["service_history"] = [
+            {"service": rng.choice(SERVICES), "cost": dist.budgets.one(rng), "date": f"2024-{m % 12 + 1:02d}-15"}
+            for m in range(dist.history_lengths.one(rng))
+        ]
+    return record
+
+
+def write_dataset(path, count, seed=42):
+    """Write ``count`` records as NDJSON; record i is the same for a given seed whatever the count"""
+    dist = Distributions(seed)
+    with open(path, "w") as f:
+        for i in range(count):
+            rng = random.Random(f"{seed}:{i}")
+            f.write(json.dumps(make_record(i, rng, dist, seed)) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate and load a synthetic account dataset")
+    parser.add_argument("--size", choices=SIZES, default="10k", help="Dataset size (default: 10k)")
+    parser.add_argument("--accounts", type=int, help="Exact number of accounts (overrides --size)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--workers", type=int, default=1, help="Importer worker processes (default: 1)")
+    parser.add_argument("--output", help="Keep the NDJSON file at this path (default: a temporary file)")
+    parser.add_argument("--generate-only", action="store_true", help="Write the file without loading it")
+    parser.add_argument(
+        "--initial-load",
+        action="store_true",
+        help="Drop secondary indexes while loading and rebuild them afterwards (for an empty database)",
+    )
+    args = parser.parse_args()
+
+    count = args.accounts or SIZES[args.size]
+    path = args.output or os.path.join(tempfile.mkdtemp(prefix="accounts-"), "accounts.ndjson")
+
+    print(f"Generating {count:,} accounts (seed {args.seed}) into {path}")
+    write_dataset(path, count, args.seed)
+    if args.generate_only:
+        return
+
+    try:
+        # Records whose email already exists (an earlier load of the same seed) are skipped
+        import_accounts(path, workers=args.workers, initial_load=args.initial_load)
+    finally:
+        if not args.output:
+            os.remove(path)
+            os.rmdir(os.path.dirname(path))
+
+
+if __name__ == "__main__":
+    main()
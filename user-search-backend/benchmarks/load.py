@@ -0,0 +1,353 @@
+# benchmarks/load.py
+"""Fixed-concurrency load driver for the /api/v1 endpoints
+
+Each endpoint is driven in turn by --concurrency threads (one keep-alive
+connection each) for --duration seconds after a short warm-up. Request
+parameters follow the distributions of benchmarks.dataset, so popular tags
+and cities are queried more often, as in production. Results are JSON:
+throughput plus p50/p95/p99 latency per endpoint.
+
+    python -m benchmarks.load run --url http://localhost:3000 --output results.json
+    python -m benchmarks.load run --endpoints list,search,by_id --baseline baseline.json
+    python -m benchmarks.load compare baseline.json results.json --threshold 0.1
+
+The write endpoints (create, update, add_history) change the dataset and only
+run when listed in --endpoints. ``compare`` exits with status 1 when an
+endpoint's throughput dropped, or its p95/p99 latency grew, by more than the
+threshold, or when more of its requests failed.
+"""
+
+import argparse
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks.dataset import Distributions
+
+READ_ENDPOINTS = [
+    "list", "list_tags", "list_all_tags", "list_rate", "near", "available", "search", "suggest",
+    "facets", "by_id", "provider", "consumer", "history", "stream",
+]
+WRITE_ENDPOINTS = ["create", "update", "add_history"]
+SEARCH_TERMS = ["plumber", "cleaning", "emergency electrician", "boston", "licensed", "handy", "painter weekend"]
+
+DEFAULT_THRESHOLD = 0.1
+# Increase of the share of failed requests (5xx or no response) that fails a comparison
+MAX_ERROR_RATE_INCREASE = 0.001
+SAMPLE_IDS = 500
+
+
+class Scenarios:
+    """Request factories per endpoint; each returns (method, path, JSON body or None)"""
+
+    def __init__(self, provider_ids, consumer_ids, seed=42):
+        self.dist = Distributions(seed)
+        self.provider_ids = provider_ids
+        self.consumer_ids = consumer_ids
+
+    def _get(self, path, **params):
+        return "GET", f"{path}?{urlencode(params, doseq=True)}" if params else path, None
+
+    def build(self, endpoint, rng):
+        dist = self.dist
+        if endpoint == "list":
+            return self._get("/api/v1/", limit=20)
+        if endpoint == "list_tags":
+            return self._get("/api/v1/", tags=dist.tags.one(rng), limit=20)
+        if endpoint == "list_all_tags":
+            return self._get("/api/v1/", tags=dist.tags.sample(rng, 2), tags_mode="all", limit=20)
+        if endpoint == "list_rate":
+            rate = dist.rates.one(rng)
+            return self._get("/api/v1/", account_type="service_provider", max_rate=rate, sort="rate", limit=20)
+        if endpoint == "near":
+            _, lat, lon = dist.cities.one(rng)
+            return self._get("/api/v1/", near=f"{lat},{lon}", radius_km=rng.choice([5, 10, 25]), limit=20)
+        if endpoint == "available":
+            moment = f"2024-05-{rng.randint(6, 12):02d}T{rng.randint(0, 23):02d}:00"
+            return self._get("/api/v1/", tags=dist.tags.one(rng), available_at=moment, limit=20)
+        if endpoint == "search":
+            return self._get("/api/v1/search", q=rng.choice(SEARCH_TERMS), limit=20)
+        if endpoint == "suggest":
+            term = dist.cities.one(rng)[0]
+            return self._get("/api/v1/suggest", q=term[: rng.randint(3, 6)])
+        if endpoint == "facets":
+            return self._get("/api/v1/facets/tags", tags=dist.tags.one(rng))
+        if endpoint == "by_id":
+            return self._get(f"/api/v1/{rng.choice(self.provider_ids + self.consumer_ids)}")
+        if endpoint == "provider":
+            return self._get(f"/api/v1/providers/{rng.choice(self.provider_ids)}")
+        if endpoint == "consumer":
+            return self._get(f"/api/v1/consumers/{rng.choice(self.consumer_ids)}")
+        if endpoint == "history":
+            return self._get(f"/api/v1/consumers/{rng.choice(self.consumer_ids)}/service-history", limit=20)
+        if endpoint == "stream":
+            return self._get("/api/v1/", tags=dist.tags.one(rng), stream=1)
+        if endpoint == "create":
+            city = dist.cities.one(rng)[0]
+            body = {
+                "name": f"{city} Load Test",
+                "email": f"load-{uuid.uuid4().hex}@example.com",
+                "address": {"street": "1 Load St", "city": city},
+                "tags": list(dict.fromkeys(dist.tags.sample(rng, 2))),
+                "hourly_rate": dist.rates.one(rng),
+            }
+            return "POST", "/api/v1/providers", body
+        if endpoint == "update":
+            return "PUT", f"/api/v1/providers/{rng.choice(self.provider_ids)}", {"hourly_rate": dist.rates.one(rng)}
+        if endpoint == "add_history":
+            body = {"service": "cleaning", "cost": dist.budgets.one(rng), "date": "2024-06-01"}
+            return "POST", f"/api/v1/consumers/{rng.choice(self.consumer_ids)}/service-history", body
+        raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+def connect(url):
+    parts = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    return connection_class(parts.hostname, parts.port, timeout=30)
+
+
+def request(conn, method, path, body=None):
+    """Send one request; returns (status, response bytes)"""
+    headers = {}
+    payload = None
+    if body is not None:
+        payload = json.dumps(body).encode()
+        headers["Content-Type"] = "application/json"
+    conn.request(method, path, body=payload, headers=headers)
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+def sample_ids(url, account_type):
+    """Ids of up to SAMPLE_IDS accounts of a type, for the by-id and write endpoints"""
+    conn = connect(url)
+    try:
+        query = urlencode({"account_type": account_type, "fields": "id", "limit": SAMPLE_IDS})
+        status, data = request(conn, "GET", f"/api/v1/?{query}")
+        if status != 200:
+            raise RuntimeError(f"Could not list {account_type} accounts (HTTP {status})")
+        return [account["id"] for account in json.loads(data)["data"]]
+    finally:
+        conn.close()
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def drive(url, scenarios, endpoint, concurrency, duration, warmup, seed):
+    """Run one endpoint at fixed concurrency; returns its summary"""
+    latencies = []
+    statuses = {}
+    totals = {"errors": 0, "bytes": 0}
+    lock = threading.Lock()
+    start_at = time.monotonic() + warmup
+    stop_at = start_at + duration
+
+    def worker(n):
+        rng = random.Random(f"{seed}:{endpoint}:{n}")
+        conn = connect(url)
+        local_latencies, local_statuses, errors, received = [], {}, 0, 0
+        try:
+            while True:
+                method, path, body = scenarios.build(endpoint, rng)
+                started = time.monotonic()
+                if started >= stop_at:
+                    break
+                try:
+                    status, data = request(conn, method, path, body)
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    conn = connect(url)
+                    status, data = None, b""
+                finished = time.monotonic()
+                if started < start_at:
+                    continue
+
+                local_latencies.append(finished - started)
+                local_statuses[status] = local_statuses.get(status, 0) + 1
+                received += len(data)
+                if status is None or status >= 500:
+                    errors += 1
+        finally:
+            conn.close()
+            with lock:
+                latencies.extend(local_latencies)
+                for status, count in local_statuses.items():
+                    statuses[str(status)] = statuses.get(str(status), 0) + count
+                totals["errors"] += errors
+                totals["bytes"] += received
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    count = len(latencies)
+
+    def ms(value):
+        return round(value * 1000, 3) if value is not None else None
+
+    return {
+        "requests": count,
+        "errors": totals["errors"],
+        "statuses": statuses,
+        "throughput_rps": round(count / duration, 2),
+        "bytes_per_request": round(totals["bytes"] / count) if count else 0,
+        "latency_ms": {
+            "mean": ms(sum(latencies) / count) if count else None,
+            "p50": ms(percentile(latencies, 0.50)),
+            "p95": ms(percentile(latencies, 0.95)),
+            "p99": ms(percentile(latencies, 0.99)),
+            "max": ms(latencies[-1]) if count else None,
+        },
+    }
+
+
+def run(args):
+    endpoints = args.endpoints.split(",") if args.endpoints else READ_ENDPOINTS
+    unknown = set(endpoints) - set(READ_ENDPOINTS + WRITE_ENDPOINTS)
+    if unknown:
+        raise SystemExit(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+
+    scenarios = Scenarios(sample_ids(args.url, "service_provider"), sample_ids(args.url, "service_consumer"), args.seed)
+    if not scenarios.provider_ids or not scenarios.consumer_ids:
+        raise SystemExit("The database needs providers and consumers; seed it with benchmarks.dataset first")
+
+    results = {
+        "meta": {
+            "url": args.url,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "seed": args.seed,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "endpoints": {},
+    }
+    for endpoint in endpoints:
+        summary = drive(args.url, scenarios, endpoint, args.concurrency, args.duration, args.warmup, args.seed)
+        results["endpoints"][endpoint] = summary
+        latency = summary["latency_ms"]
+        print(
+            f"{endpoint:<14} {summary['throughput_rps']:>9.1f} req/s  p50 {latency['p50']} ms  "
+            f"p95 {latency['p95']} ms  p99 {latency['p99']} ms  errors {summary['errors']}",
+            file=sys.stderr,
+        )
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        return report(compare(baseline, results, args.threshold))
+    return 0
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Per-endpoint changes against a baseline; an entry is a regression past ``threshold`` (0.1 = 10%)"""
+    rows = []
+    for endpoint, now in current["endpoints"].items():
+        before = baseline["endpoints"].get(endpoint)
+        if not before or not before["requests"] or not now["requests"]:
+            continue
+
+        metrics = [("throughput_rps", before["throughput_rps"], now["throughput_rps"], True)]
+        metrics += [(p, before["latency_ms"][p], now["latency_ms"][p], False) for p in ("p50", "p95", "p99")]
+        for metric, old, new, higher_is_better in metrics:
+            change = (new - old) / old if old else 0.0
+            worse = -change if higher_is_better else change
+            rows.append(
+                {
+                    "endpoint": endpoint,
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "change": round(change, 4),
+                    # p50 is reported but does not fail the comparison
+                    "regression": metric != "p50" and worse > threshold,
+                }
+            )
+
+        old_rate = before["errors"] / before["requests"]
+        new_rate = now["errors"] / now["requests"]
+        rows.append(
+            {
+                "endpoint": endpoint,
+                "metric": "error_rate",
+                "baseline": round(old_rate, 4),
+                "current": round(new_rate, 4),
+                "change": round(new_rate - old_rate, 4),
+                "regression": new_rate - old_rate > MAX_ERROR_RATE_INCREASE,
+            }
+        )
+    return rows
+
+
+def report(rows):
+    """Print a comparison; returns the exit status (1 if anything regressed)"""
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['endpoint']:<14} {row['metric']:<15} {row['baseline']:>10} -> {row['current']:>10} "
+            f"({row['change']:+.1%}) {flag}"
+        )
+    regressions = [row for row in rows if row["regression"]]
+    print(f"{len(regressions)} regression(s)" if regressions else "No regressions")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the /api/v1 endpoints")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Drive the endpoints and report throughput and latency")
+    run_parser.add_argument("--url", default="http://localhost:3000", help="Base URL (default: http://localhost:3000)")
+    run_parser.add_argument(
+        "--endpoints",
+        help=f"Comma-separated endpoints (default: all reads). Reads: {', '.join(READ_ENDPOINTS)}; "
+        f"writes: {', '.join(WRITE_ENDPOINTS)}",
+    )
+    run_parser.add_argument("--concurrency", type=int, default=8, help="Concurrent connections (default: 8)")
+    run_parser.add_argument("--duration", type=float, default=10, help="Measured seconds per endpoint (default: 10)")
+    run_parser.add_argument("--warmup", type=float, default=2, help="Unmeasured seconds per endpoint (default: 2)")
+    run_parser.add_argument("--seed", type=int, default=42, help="Seed of the dataset and request mix (default: 42)")
+    run_parser.add_argument("--output", help="Write the JSON results here (default: stdout)")
+    run_parser.add_argument("--baseline", help="Compare the results with this earlier run")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (default: 0.1)")
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", help="Earlier results")
+    compare_parser.add_argument("current", help="New results")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (default: 0.1)")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        return run(args)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    return report(compare(baseline, current, args.threshold))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+# benchmarks/prepared_statements.py
+"""Time saved by running the hot AccountQueries statements as prepared statements
+
+Seeds service providers (removed again at the end), then for each statement
+shape reports the mean round-trip per call and the server-side planning time
+(from EXPLAIN ANALYZE) with plain execution and with prepared statements.
+Needs the database settings of the app (DB_HOST, DB_NAME, ...).
+
+    python -m benchmarks.prepared_statements --accounts 5000 --repeat 500
+"""
+
+import argparse
+import json
+import random
+import time
+
+from src.db import prepared as prepared_module
+from src.db.connection import connect
+from src.db.prepared import prepared
+from src.db.queries import ACCOUNT_BY_ID_QUERY, AccountQueries
+
+BENCHMARK_TAG = "prepared-statement-benchmark"
+TAGS = ["plumber", "electrician", "carpenter", "painter", "cleaner", "gardener", "roofer", "mover"]
+
+
+def seed(queries, count):
+    """Insert ``count`` providers tagged with BENCHMARK_TAG; returns their ids"""
+    providers = [
+        {
+            "name": f"Benchmark Provider {i}",
+            "email": f"prepared-benchmark-{i}@example.com",
+            "address": {"street": f"{i} Main St", "city": "Boston"},
+            "tags": [BENCHMARK_TAG] + random.sample(TAGS, 2),
+            "hourly_rate": random.randint(20, 200),
+        }
+        for i in range(count)
+    ]
+    return list(queries.create_service_providers_batch(providers).values())
+
+
+def cleanup(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("DELETE FROM accounts WHERE %s = ANY(tags)", [BENCHMARK_TAG])
+    conn.commit()
+
+
+def read_statements(queries, ids):
+    """(name, build) pairs of the read shapes to compare; build() returns a query and its params"""
+
+    def list_page(**filters):
+        def build():
+            return queries._list_statement(
+                filters.get("account_type"), filters.get("tags"), 20, None, None, None, "created_at", None, None, "any"
+            )
+
+        return build
+
+    return [
+        ("by id", lambda: (ACCOUNT_BY_ID_QUERY, [random.choice(ids)])),
+        ("list by type", list_page(account_type="service_provider")),
+        ("list by tags", list_page(tags=[random.choice(TAGS)])),
+    ]
+
+
+def planning_ms(cursor, query, params):
+    cursor.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + query, params)
+    return cursor.fetchone()["QUERY PLAN"][0]["Planning Time"]
+
+
+def measure_read(conn, build, repeat):
+    """Mean ms per call and mean planning ms for the statement built by ``build``"""
+    with conn.cursor() as cursor:
+        # Warm up: a prepared statement switches to its generic plan after five runs
+        for _ in range(10):
+            cursor.execute(*prepared(cursor, *build()))
+            cursor.fetchall()
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            cursor.execute(*prepared(cursor, *build()))
+            cursor.fetchall()
+        per_call = (time.perf_counter() - start) / repeat * 1000
+
+        planning = [planning_ms(cursor, *prepared(cursor, *build())) for _ in range(min(repeat, 50))]
+    conn.rollback()
+    return per_call, sum(planning) / len(planning)
+
+
+def measure_update(queries, ids, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        queries.update_service_provider(random.choice(ids), hourly_rate=random.randint(20, 200))
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(cache_size, ids, repeat):
+    """Results of one variant, on a fresh connection so nothing is prepared beforehand"""
+    prepared_module.PREPARED_STATEMENT_CACHE_SIZE = cache_size
+    conn = connect()
+    try:
+        queries = AccountQueries(conn)
+        results = {}
+        for name, build in read_statements(queries, ids):
+            per_call, planning = measure_read(conn, build, repeat)
+            results[name] = {"ms_per_call": round(per_call, 4), "planning_ms": round(planning, 4)}
+        results["update"] = {"ms_per_call": round(measure_update(queries, ids, repeat), 4), "planning_ms": None}
+        return results
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prepared statements for the hot account queries")
+    parser.add_argument("--accounts", type=int, default=5000, help="Providers to seed (default: 5000)")
+    parser.add_argument("--repeat", type=int, default=500, help="Calls per statement and variant (default: 500)")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    cache_size = prepared_module.PREPARED_STATEMENT_CACHE_SIZE or 100
+    conn = connect()
+    try:
+        ids = seed(AccountQueries(conn), args.accounts)
+        results = {
+            "plain": run(0, ids, args.repeat),
+            "prepared": run(cache_size, ids, args.repeat),
+        }
+    finally:
+        cleanup(conn)
+        conn.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.accounts} seeded providers, {args.repeat} calls per statement")
+    print(f"  {'statement':<14} {'plain ms/call':>14} {'prepared':>10} {'plain planning ms':>18} {'prepared':>10}")
+    for name, plain in results["plain"].items():
+        fast = results["prepared"][name]
+        planning = ""
+        if plain["planning_ms"] is not None:
+            planning = f"{plain['planning_ms']:>18.3f} {fast['planning_ms']:>10.3f}"
+        print(f"  {name:<14} {plain['ms_per_call']:>14.3f} {fast['ms_per_call']:>10.3f} {planning}")
+
+
+if __name__ == "__main__":
+    main()
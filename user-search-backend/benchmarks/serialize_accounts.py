@@ -0,0 +1,126 @@
+# benchmarks/serialize_accounts.py
+"""Per-row cost of serializing a page of account rows to a JSON response body
+
+Compares the previous route code (per-field isoformat/float conversions, then
+Flask's default provider) with format_account + AccountJSONProvider, using
+orjson when installed and the standard library otherwise.
+
+    python -m benchmarks.serialize_accounts --rows 10000 --repeat 20
+"""
+
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from api import json_provider
+from api.json_provider import AccountJSONProvider
+from api.v1.serializers import format_account
+
+
+def make_rows(count):
+    """Rows shaped like AccountQueries results, half providers and half consumers"""
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        provider = i % 2 == 0
+        created_at = now - timedelta(seconds=i)
+        rows.append(
+            {
+                "id": str(uuid.uuid4()),
+                "name": f"Account {i}",
+                "email": f"account{i}@example.com",
+                "address": {"street": f"{i} Main St", "city": "Boston", "state": "MA", "zip": "02101"},
+                "tags": ["plumber", "emergency"] if provider else ["customer"],
+                "account_type": "service_provider" if provider else "service_consumer",
+                "created_at": created_at,
+                "updated_at": created_at,
+                "hourly_rate": Decimal("85.50") if provider else None,
+                "availability": {"mon": "9-17", "tue": "9-17"} if provider else None,
+                "preferred_budget": None if provider else Decimal("250.00"),
+                "service_history": None if provider else [{"service": "cleaning", "cost": 120.0}],
+            }
+        )
+    return rows
+
+
+def legacy_format_account(account):
+    """The hand-built response dict the routes used before format_account"""
+    response_data = {
+        "id": account["id"],
+        "name": account["name"],
+        "email": account["email"],
+        "address": account["address"],
+        "tags": account["tags"],
+        "account_type": account["account_type"],
+        "created_at": account["created_at"].isoformat(),
+        "updated_at": account["updated_at"].isoformat(),
+    }
+    if account["account_type"] == "service_provider":
+        if account["hourly_rate"]:
+            response_data["hourly_rate"] = float(account["hourly_rate"])
+        if account["availability"]:
+            response_data["availability"] = account["availability"]
+    elif account["account_type"] == "service_consumer":
+        if account["preferred_budget"]:
+            response_data["preferred_budget"] = float(account["preferred_budget"])
+        if account["service_history"]:
+            response_data["service_history"] = account["service_history"]
+    return response_data
+
+
+def measure(app, format_row, rows, repeat):
+    """Best-of-repeat seconds to format a page and build its response body"""
+    best = None
+    with app.app_context():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = app.json.response({"message": "", "data": [format_row(row) for row in rows], "next_cursor": None})
+            response.get_data()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def make_app(provider_class):
+    app = Flask(__name__)
+    app.json = provider_class(app)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark account response serialization")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows per page (default: 10000)")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per variant; the best is reported (default: 20)")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    variants = [("legacy (field conversions + Flask default provider)", make_app(DefaultJSONProvider), legacy_format_account)]
+
+    if json_provider.orjson:
+        variants.append(("format_account + AccountJSONProvider (orjson)", make_app(AccountJSONProvider), format_account))
+
+    results = [(name, measure(app, format_row, rows, args.repeat)) for name, app, format_row in variants]
+
+    # The provider checks the module-level orjson on every call
+    orjson = json_provider.orjson
+    json_provider.orjson = None
+    try:
+        stdlib = make_app(AccountJSONProvider)
+        results.append(("format_account + AccountJSONProvider (json)", measure(stdlib, format_account, rows, args.repeat)))
+    finally:
+        json_provider.orjson = orjson
+
+    baseline = results[0][1]
+    print(f"{args.rows} rows per page, best of {args.repeat}")
+    for name, seconds in results:
+        per_row_us = seconds / args.rows * 1e6
+        print(f"  {name:<55} {seconds * 1000:8.1f} ms/page {per_row_us:6.2f} us/row  x{baseline / seconds:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# src/db/async_connection.py
+
+import os
+from dotenv import load_dotenv
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+from .connection import db_host, db_port, db_name, db_user, db_password, pool_max_lifetime
+
+load_dotenv()
+
+# Async pool settings (per ASGI process). A connection runs one query at a time
+# but is only held for the query itself, so a small pool serves many requests.
+async_pool_min_size = int(os.getenv("ASYNC_DB_POOL_MIN_SIZE", "2"))
+async_pool_max_size = int(os.getenv("ASYNC_DB_POOL_MAX_SIZE", "20"))
+async_pool_timeout = float(os.getenv("ASYNC_DB_POOL_TIMEOUT", "5"))
+
+
+def create_async_pool() -> AsyncConnectionPool:
+    """Pool of psycopg 3 connections for the async app, opened by its lifespan
+
+    Connections are in autocommit mode (reads are single statements, so there
+    is no transaction to begin and roll back) and return rows as dicts, like
+    the RealDictCursor rows of the sync data layer.
+    """
+    conninfo = make_conninfo(host=db_host, port=db_port, dbname=db_name, user=db_user, password=db_password)
+    return AsyncConnectionPool(
+        conninfo,
+        min_size=async_pool_min_size,
+        max_size=async_pool_max_size,
+        timeout=async_pool_timeout,
+        max_lifetime=pool_max_lifetime,
+        kwargs={"autocommit": True, "row_factory": dict_row},
+        open=False,
+    )
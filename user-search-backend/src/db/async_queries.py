@@ -0,0 +1,163 @@
+# src/db/async_queries.py
+
+import uuid
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
+from .pagination import DEFAULT_PAGE_SIZE
+from .cache import get_account_cache
+from .instrumentation import tag_query_methods, timed_execute
+from .queries import (
+    ACCOUNT_BY_ID_QUERY,
+    ACCOUNT_VERSION_QUERY,
+    CHANGE_VERSION_QUERY,
+    STREAM_BATCH_SIZE,
+    TAG_IDS_QUERY,
+    AccountQueries,
+    account_projection,
+    cached_tag_ids,
+    is_valid_id,
+    normalize_tags,
+    remember_tag_ids,
+)
+
+
+class _StatementBuilder(AccountQueries):
+    """AccountQueries without a connection, building statements with tag ids looked up beforehand"""
+
+    def __init__(self, tag_ids: Dict[str, int]):
+        super().__init__(None)
+        self.known_tag_ids = tag_ids
+
+    def _tag_ids(self, tags: List[str]) -> List[int]:
+        return [self.known_tag_ids[tag] for tag in tags if tag in self.known_tag_ids]
+
+
+@tag_query_methods
+class AsyncAccountQueries:
+    """Account reads for the async app, over a psycopg 3 connection pool
+
+    The SQL is built by AccountQueries, so both apps run the same statements and
+    return the same rows; only the execution is awaited. Each method holds a
+    pooled connection for its own statements only. Statements are timed and
+    accounted to the calling method like those of AccountQueries (/db/queries).
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def _fetch(self, query: str, params: List[Any], one: bool = False):
+        async with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            await timed_execute(cursor, query, params)
+            return await (cursor.fetchone() if one else cursor.fetchall())
+
+    async def _builder(self, tags: Optional[List[str]]) -> _StatementBuilder:
+        """Statement builder with the dictionary ids of ``tags`` resolved"""
+        ids, missing = cached_tag_ids(normalize_tags(tags or []))
+        if missing:
+            ids.update(remember_tag_ids(await self._fetch(TAG_IDS_QUERY, [missing])))
+        return _StatementBuilder(ids)
+
+    async def get_all_accounts(
+        self,
+        account_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        ranges: Optional[Dict[str, float]] = None,
+        sort: str = "created_at",
+        near: Optional[Dict[str, float]] = None,
+        available: Optional[List[Tuple[int, int]]] = None,
+        tags_mode: str = "any",
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """See AccountQueries.get_all_accounts"""
+        builder = await self._builder(tags)
+        query, params = builder._list_statement(
+            account_type, tags, limit, cursor, fields, ranges, sort, near, available, tags_mode
+        )
+        return builder._page(await self._fetch(query, params), limit, sort)
+
+    async def iter_accounts(
+        self,
+        account_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        fields: Optional[Tuple[str, ...]] = None,
+        ranges: Optional[Dict[str, float]] = None,
+        sort: str = "created_at",
+        near: Optional[Dict[str, float]] = None,
+        available: Optional[List[Tuple[int, int]]] = None,
+        tags_mode: str = "any",
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """See AccountQueries.iter_accounts; holds one connection until the iteration ends"""
+        builder = await self._builder(tags)
+        query, params = builder._stream_statement(account_type, tags, fields, ranges, sort, near, available, tags_mode)
+
+        # Named (server-side) cursors need a transaction, even in autocommit mode
+        async with self.pool.connection() as conn, conn.transaction():
+            async with conn.cursor(name=f"stream_accounts_{uuid.uuid4().hex}") as cursor:
+                cursor.itersize = batch_size
+                await timed_execute(cursor, query, params)
+                async for row in cursor:
+                    yield row
+
+    async def search_accounts(
+        self,
+        q: str,
+        account_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        ranges: Optional[Dict[str, float]] = None,
+        sort: str = "relevance",
+        near: Optional[Dict[str, float]] = None,
+        available: Optional[List[Tuple[int, int]]] = None,
+        tags_mode: str = "any",
+        prefix: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """See AccountQueries.search_accounts"""
+        builder = await self._builder(tags)
+        query, params = builder._search_statement(
+            q, account_type, tags, limit, cursor, fields, ranges, sort, near, available, tags_mode, prefix
+        )
+        return builder._page(await self._fetch(query, params), limit, sort)
+
+    async def get_account_by_id(
+        self, account_id: str, fields: Optional[Tuple[str, ...]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """See AccountQueries.get_account_by_id; shares the process's account cache"""
+        if not is_valid_id(account_id):
+            return None
+
+        cache = get_account_cache()
+        key = str(account_id).lower()
+
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        if fields:
+            columns, joins = account_projection(fields)
+            result = await self._fetch(f"SELECT {columns} {joins} WHERE a.id = %s", [account_id], one=True)
+            return dict(result) if result else None
+
+        generation = cache.generation
+        result = await self._fetch(ACCOUNT_BY_ID_QUERY, [account_id], one=True)
+        if not result:
+            return None
+
+        account = dict(result)
+        cache.set(key, account, generation)
+        return account
+
+    async def get_account_version(self, account_id: str) -> Optional[Dict[str, Any]]:
+        """See AccountQueries.get_account_version"""
+        if not is_valid_id(account_id):
+            return None
+        return await self._fetch(ACCOUNT_VERSION_QUERY, [account_id], one=True)
+
+    async def get_change_version(self) -> int:
+        """See AccountQueries.get_change_version"""
+        result = await self._fetch(CHANGE_VERSION_QUERY, [], one=True)
+        return result["version"] if result else 0
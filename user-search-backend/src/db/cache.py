@@ -0,0 +1,160 @@
+# src/db/cache.py
+
+import os
+import select
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+from src.utils.logger import logger
+from .connection import connect
+
+load_dotenv()
+
+# Account cache settings (per worker process); size 0 disables caching
+cache_max_size = int(os.getenv("ACCOUNT_CACHE_SIZE", "10000"))
+cache_ttl = float(os.getenv("ACCOUNT_CACHE_TTL", "30"))
+
+# Writers NOTIFY this channel so every worker evicts its copy
+INVALIDATION_CHANNEL = "account_cache_invalidation"
+
+
+class AccountCache:
+    """Thread-safe LRU cache with a per-entry time to live
+
+    ``generation`` increases on every invalidation; loaders capture it before
+    reading the database and pass it to ``set`` so a value read before a
+    concurrent write is never cached after that write invalidated the key.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 30.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.generation = 0
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached value, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return dict(value)
+
+    def set(self, key: str, value: Dict[str, Any], generation: Optional[int] = None) -> None:
+        """Cache a value unless an invalidation happened since ``generation`` was read"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            self._entries[key] = (time.monotonic() + self.ttl, dict(value))
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self.generation += 1
+            self._counters["invalidations"] += 1
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "size": len(self._entries),
+                **self._counters,
+            }
+
+
+class InvalidationListener(threading.Thread):
+    """Background thread that LISTENs for invalidations issued by other workers"""
+
+    def __init__(self, cache: AccountCache, connect, poll_interval: float = 5.0, retry_interval: float = 5.0):
+        super().__init__(name="account-cache-invalidation", daemon=True)
+        self.cache = cache
+        self.connect = connect
+        self.poll_interval = poll_interval
+        self.retry_interval = retry_interval
+
+    def run(self):
+        while True:
+            try:
+                self._listen()
+            except Exception as e:
+                # Notifications may have been missed while disconnected
+                logger.warning(f"Account cache invalidation listener disconnected: {e}")
+                self.cache.clear()
+                time.sleep(self.retry_interval)
+
+    def _listen(self):
+        conn = self.connect()
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {INVALIDATION_CHANNEL}")
+
+            while True:
+                if select.select([conn], [], [], self.poll_interval) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self.cache.invalidate(conn.notifies.pop(0).payload)
+        finally:
+            conn.close()
+
+
+_cache = None
+_cache_pid = None
+_cache_lock = threading.Lock()
+
+
+def get_account_cache() -> AccountCache:
+    """Return the process-wide account cache, starting its listener on first use"""
+    global _cache, _cache_pid
+
+    if _cache is None or _cache_pid != os.getpid():
+        with _cache_lock:
+            if _cache is None or _cache_pid != os.getpid():
+                _cache = AccountCache(max_size=cache_max_size, ttl=cache_ttl)
+                _cache_pid = os.getpid()
+                if _cache.enabled:
+                    InvalidationListener(_cache, connect).start()
+    return _cache
+
+
+def invalidation_statement(account_id: str):
+    """SQL queuing a cross-worker invalidation; Postgres delivers it when the transaction commits"""
+    return "SELECT pg_notify(%s, %s);", [INVALIDATION_CHANNEL, str(account_id)]
@@ -1,8 +1,11 @@
 import os
+import threading
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from flask import g
 from dotenv import load_dotenv
+from .pool import ConnectionPool
+from .instrumentation import TimedConnection
 
 load_dotenv()
 
@@ -12,21 +15,61 @@ db_name = os.getenv("DB_NAME")
 db_user = os.getenv("DB_USER")
 db_password = os.getenv("DB_PASSWORD")
 
+# Connection pool settings (per worker process)
+pool_min_size = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+pool_max_size = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+pool_timeout = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+pool_max_lifetime = float(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))
+pool_health_check_idle = float(os.getenv("DB_POOL_HEALTH_CHECK_IDLE", "30"))
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def connect():
+    return psycopg2.connect(
+        host=db_host,
+        port=db_port,
+        dbname=db_name,
+        user=db_user,
+        password=db_password,
+        cursor_factory=RealDictCursor,
+        connection_factory=TimedConnection,
+    )
+
+
+def get_pool():
+    """Return the process-wide pool, creating it lazily (and again after a fork)"""
+    global _pool, _pool_pid
+
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ConnectionPool(
+                    connect,
+                    min_size=pool_min_size,
+                    max_size=pool_max_size,
+                    timeout=pool_timeout,
+                    max_lifetime=pool_max_lifetime,
+                    health_check_idle=pool_health_check_idle,
+                )
+                _pool_pid = os.getpid()
+                _pool.fill()
+    return _pool
+
+
+def pool_stats():
+    return get_pool().stats()
+
 
 def get_db():
     if "db" not in g:
-        g.db = psycopg2.connect(
-            host=db_host,
-            port=db_port,
-            dbname=db_name,
-            user=db_user,
-            password=db_password,
-            cursor_factory=RealDictCursor,
-        )
+        g.db = get_pool().getconn()
     return g.db
 
 
 def close_db(e=None):
     db = g.pop("db", None)
     if db is not None:
-        db.close()
+        get_pool().putconn(db)
@@ -0,0 +1,482 @@
+# src/db/import_accounts.py
+"""Bulk-load provider/consumer records from CSV or NDJSON dumps.
+
+Records are COPYed into a per-connection staging table in batches and fanned out
+into accounts, service_providers and service_consumers with one set-based
+INSERT ... SELECT per batch. Large files are split into line-aligned byte chunks
+that are loaded by parallel worker processes.
+
+Each record has: name, email, account_type (service_provider|service_consumer),
+address (object), tags (list), hourly_rate, availability (providers) and
+preferred_budget, service_history (consumers). In CSV files address,
+availability and service_history are JSON strings and tags is a JSON array or a
+semicolon-separated list. CSV records must not contain embedded newlines.
+
+Usage:
+    poetry run python src/db/import_accounts.py accounts.ndjson --workers 4
+    poetry run python src/db/import_accounts.py accounts.csv --workers 8 --initial-load
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import psycopg2
+from dotenv import load_dotenv
+
+load_dotenv()
+
+ACCOUNT_TYPES = ("service_provider", "service_consumer")
+STAGING_COLUMNS = [
+    "name",
+    "email",
+    "account_type",
+    "address",
+    "tags",
+    "hourly_rate",
+    "availability",
+    "preferred_budget",
+    "service_history",
+]
+DEFERRABLE_INDEX_TABLES = [
+    "accounts",
+    "service_providers",
+    "service_consumers",
+    "service_history_entries",
+    "provider_availability_windows",
+]
+
+DEFAULT_BATCH_ROWS = 50000
+DEFAULT_CHUNK_MB = 64
+
+CREATE_STAGING_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS staging_accounts (
+        id UUID DEFAULT uuid_generate_v4(),
+        name TEXT,
+        email TEXT,
+        account_type account_type_enum,
+        address JSONB,
+        tags JSONB,
+        hourly_rate DECIMAL(10, 2),
+        availability JSONB,
+        preferred_budget DECIMAL(10, 2),
+        service_history JSONB
+    )
+"""
+
+# New tags go into the dictionary (migration 011) sorted and in their own
+# transaction, before the fan-out. Left to the accounts trigger, they would stay
+# locked until the whole batch commits, and workers meeting the same new tags in
+# different orders would deadlock.
+TAG_DICTIONARY_SQL = """
+    INSERT INTO tag_dictionary (tag)
+    SELECT DISTINCT t.tag
+    FROM staging_accounts s
+    CROSS JOIN LATERAL unnest(
+        normalize_tags(ARRAY(SELECT jsonb_array_elements_text(coalesce(s.tags, '[]'::jsonb))))
+    ) AS t(tag)
+    WHERE NOT EXISTS (SELECT 1 FROM tag_dictionary d WHERE d.tag = t.tag)
+    ORDER BY t.tag
+    ON CONFLICT (tag) DO NOTHING
+"""
+
+FAN_OUT_SQL = """
+    WITH inserted AS (
+        INSERT INTO accounts (id, name, email, address, tags, account_type)
+        SELECT id, name, email, address,
+               ARRAY(SELECT jsonb_array_elements_text(coalesce(tags, '[]'::jsonb))),
+               account_type
+        FROM staging_accounts
+        ON CONFLICT (email) DO NOTHING
+        RETURNING id, account_type
+    ),
+    providers AS (
+        INSERT INTO service_providers (account_id, hourly_rate, availability)
+        SELECT s.id, s.hourly_rate, s.availability
+        FROM staging_accounts s JOIN inserted i USING (id)
+        WHERE i.account_type = 'service_provider'
+    ),
+    consumers AS (
+        INSERT INTO service_consumers (account_id, preferred_budget)
+        SELECT s.id, s.preferred_budget
+        FROM staging_accounts s JOIN inserted i USING (id)
+        WHERE i.account_type = 'service_consumer'
+    ),
+    history AS (
+        INSERT INTO service_history_entries (consumer_id, payload)
+        SELECT s.id, e.value
+        FROM staging_accounts s JOIN inserted i USING (id)
+        CROSS JOIN LATERAL jsonb_array_elements(coalesce(s.service_history, '[]'::jsonb)) WITH ORDINALITY AS e(value, ord)
+        WHERE i.account_type = 'service_consumer'
+        ORDER BY s.id, e.ord
+    )
+    SELECT count(*) AS inserted FROM inserted
+"""
+
+
+def get_conn_params():
+    return {
+        "host": os.getenv("DB_HOST"),
+        "port": os.getenv("DB_PORT"),
+        "dbname": os.getenv("DB_NAME"),
+        "user": os.getenv("DB_USER"),
+        "password": os.getenv("DB_PASSWORD"),
+    }
+
+
+# ============ PARSING ============
+
+
+def _json_field(value, expected_type, field):
+    """Decode a JSON-encoded CSV cell (empty cells become None)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str) and expected_type is not str:
+        value = json.loads(value)
+    if not isinstance(value, expected_type):
+        raise ValueError(f"{field} must be a {expected_type.__name__}")
+    return value
+
+
+def _number_field(value, field):
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"{field} must be a number")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a number")
+
+
+def _tags_field(value):
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        value = json.loads(value) if value.lstrip().startswith("[") else [t.strip() for t in value.split(";")]
+    if not isinstance(value, list) or not all(isinstance(t, str) for t in value):
+        raise ValueError("tags must be a list of strings")
+    return [t for t in value if t]
+
+
+def normalize_record(record):
+    """Validate one parsed record and return its staging row (list in STAGING_COLUMNS order)"""
+    if not isinstance(record, dict):
+        raise ValueError("record must be an object")
+
+    name = (record.get("name") or "").strip()
+    email = (record.get("email") or "").strip()
+    if not name:
+        raise ValueError("name is required")
+    if "@" not in email:
+        raise ValueError("invalid email")
+    if len(name) > 255 or len(email) > 255:
+        raise ValueError("name and email must be at most 255 characters")
+
+    account_type = record.get("account_type")
+    if account_type not in ACCOUNT_TYPES:
+        raise ValueError(f"account_type must be one of {', '.join(ACCOUNT_TYPES)}")
+
+    address = _json_field(record.get("address"), dict, "address")
+    if not address:
+        raise ValueError("address must be a non-empty object")
+
+    availability = record.get("availability")
+    if isinstance(availability, str) and availability.lstrip()[:1] in ("{", "[", '"'):
+        availability = json.loads(availability)
+
+    return [
+        name,
+        email,
+        account_type,
+        json.dumps(address),
+        json.dumps(_tags_field(record.get("tags"))),
+        _number_field(record.get("hourly_rate"), "hourly_rate"),
+        json.dumps(availability) if availability not in (None, "") else None,
+        _number_field(record.get("preferred_budget"), "preferred_budget"),
+        json.dumps(_json_field(record.get("service_history"), list, "service_history") or []),
+    ]
+
+
+def iter_records(lines, file_format, header=None):
+    """Yield (record, error) pairs for the given raw lines"""
+    if file_format == "ndjson":
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line), None
+            except ValueError as e:
+                yield None, f"invalid JSON: {e}"
+    else:
+        for row in csv.reader(lines):
+            if not row:
+                continue
+            if len(row) != len(header):
+                yield None, f"expected {len(header)} columns, got {len(row)}"
+                continue
+            yield dict(zip(header, row)), None
+
+
+# ============ CHUNKING ============
+
+
+def read_csv_header(path):
+    with open(path, "r", newline="") as f:
+        header_line = f.readline()
+        return next(csv.reader([header_line])), len(header_line.encode())
+
+
+def plan_chunks(path, chunk_bytes, start=0):
+    """Split a file into (start, end) byte ranges that begin and end on line boundaries"""
+    size = os.path.getsize(path)
+    chunks = []
+
+    with open(path, "rb") as f:
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            if end < size:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            chunks.append((start, end))
+            start = end
+
+    return chunks
+
+
+def read_chunk_lines(path, start, end):
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return io.StringIO(data.decode("utf-8"), newline="")
+
+
+# ============ LOADING ============
+
+_worker_conn = None
+
+
+def get_worker_connection():
+    """One connection (and staging table) per worker process"""
+    global _worker_conn
+    if _worker_conn is None or _worker_conn.closed:
+        _worker_conn = psycopg2.connect(**get_conn_params())
+        with _worker_conn.cursor() as cursor:
+            cursor.execute(CREATE_STAGING_SQL)
+        _worker_conn.commit()
+    return _worker_conn
+
+
+def load_batch(conn, rows):
+    """COPY one batch into staging and fan it out; returns the number of inserted accounts"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if v is None else v for v in row])
+    buffer.seek(0)
+
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("TRUNCATE staging_accounts")
+            cursor.copy_expert(
+                f"COPY staging_accounts ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+            cursor.execute(TAG_DICTIONARY_SQL)
+            conn.commit()
+            cursor.execute(FAN_OUT_SQL)
+            inserted = cursor.fetchone()[0]
+        conn.commit()
+        return inserted
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def load_chunk(task):
+    """Load one byte range of the input file; returns per-chunk counters"""
+    path, file_format, header, start, end, batch_rows = task
+    conn = get_worker_connection()
+
+    stats = {"rows": 0, "inserted": 0, "rejected": 0, "errors": []}
+    batch = []
+
+    def flush():
+        stats["inserted"] += load_batch(conn, batch)
+        batch.clear()
+
+    for record, error in iter_records(read_chunk_lines(path, start, end), file_format, header):
+        stats["rows"] += 1
+        if error is None:
+            try:
+                batch.append(normalize_record(record))
+            except (ValueError, TypeError) as e:
+                error = str(e)
+
+        if error is not None:
+            stats["rejected"] += 1
+            if len(stats["errors"]) < 5:
+                stats["errors"].append(f"bytes {start}-{end}: {error}")
+            continue
+
+        if len(batch) >= batch_rows:
+            flush()
+
+    if batch:
+        flush()
+
+    return stats
+
+
+# ============ DEFERRED INDEXES ============
+
+
+def drop_secondary_indexes(conn):
+    """Drop indexes not backing a constraint; returns their definitions for rebuilding"""
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT i.relname, pg_get_indexdef(i.oid)
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            JOIN pg_class t ON t.oid = x.indrelid
+            WHERE t.relname = ANY(%s)
+              AND t.relnamespace = 'public'::regnamespace
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+        """,
+            [DEFERRABLE_INDEX_TABLES],
+        )
+        indexes = cursor.fetchall()
+
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX IF EXISTS "{name}"')
+    conn.commit()
+    return indexes
+
+
+def rebuild_indexes(conn, indexes):
+    with conn.cursor() as cursor:
+        cursor.execute("SET maintenance_work_mem = '1GB'")
+        for name, definition in indexes:
+            started = time.monotonic()
+            cursor.execute(definition)
+            conn.commit()
+            print(f"Rebuilt index {name} in {time.monotonic() - started:.1f}s")
+
+        for table in DEFERRABLE_INDEX_TABLES:
+            cursor.execute(f"ANALYZE {table}")
+    conn.commit()
+
+
+# ============ COMMAND ============
+
+
+def detect_format(path):
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def import_accounts(
+    path,
+    file_format=None,
+    workers=1,
+    batch_rows=DEFAULT_BATCH_ROWS,
+    chunk_mb=DEFAULT_CHUNK_MB,
+    initial_load=False,
+):
+    """Import a CSV/NDJSON dump; returns the aggregated counters"""
+    file_format = file_format or detect_format(path)
+
+    header, start = (None, 0)
+    if file_format == "csv":
+        header, start = read_csv_header(path)
+        missing = {"name", "email", "account_type", "address"} - set(header)
+        if missing:
+            raise ValueError(f"CSV header is missing columns: {', '.join(sorted(missing))}")
+
+    chunks = plan_chunks(path, chunk_mb * 1024 * 1024, start)
+    tasks = [(path, file_format, header, s, e, batch_rows) for s, e in chunks]
+
+    admin_conn = psycopg2.connect(**get_conn_params())
+    dropped_indexes = []
+    totals = {"rows": 0, "inserted": 0, "rejected": 0}
+    started = time.monotonic()
+
+    try:
+        if initial_load:
+            dropped_indexes = drop_secondary_indexes(admin_conn)
+            print(f"Dropped {len(dropped_indexes)} secondary indexes for the initial load")
+
+        if workers > 1:
+            pool = Pool(workers)
+            results = pool.imap_unordered(load_chunk, tasks)
+        else:
+            pool = None
+            results = map(load_chunk, tasks)
+
+        try:
+            for done, stats in enumerate(results, start=1):
+                for key in totals:
+                    totals[key] += stats[key]
+                for error in stats["errors"]:
+                    print(f"Rejected record ({error})", file=sys.stderr)
+
+                elapsed = time.monotonic() - started
+                print(
+                    f"[{done}/{len(tasks)} chunks] {totals['rows']:,} rows read, "
+                    f"{totals['inserted']:,} inserted, {totals['rejected']:,} rejected - "
+                    f"{totals['rows'] / elapsed if elapsed else 0:,.0f} rows/s"
+                )
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+    finally:
+        if dropped_indexes:
+            rebuild_indexes(admin_conn, dropped_indexes)
+        admin_conn.close()
+
+    totals["skipped"] = totals["rows"] - totals["inserted"] - totals["rejected"]
+    totals["seconds"] = round(time.monotonic() - started, 2)
+    print(
+        f"Import finished: {totals['inserted']:,} accounts inserted, {totals['skipped']:,} skipped "
+        f"(existing email), {totals['rejected']:,} rejected in {totals['seconds']}s"
+    )
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import accounts from CSV or NDJSON using COPY")
+    parser.add_argument("path", help="CSV or NDJSON file to import")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="input format (default: from file extension)")
+    parser.add_argument("--workers", type=int, default=1, help="parallel worker processes (default: 1)")
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS, help="rows per COPY batch")
+    parser.add_argument("--chunk-mb", type=int, default=DEFAULT_CHUNK_MB, help="file chunk size per work unit")
+    parser.add_argument(
+        "--initial-load",
+        action="store_true",
+        help="drop secondary indexes before loading and rebuild them afterwards",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        import_accounts(
+            args.path,
+            file_format=args.format,
+            workers=args.workers,
+            batch_rows=args.batch_rows,
+            chunk_mb=args.chunk_mb,
+            initial_load=args.initial_load,
+        )
+    except Exception as e:
+        print(f"Import failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
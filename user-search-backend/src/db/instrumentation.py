@@ -0,0 +1,336 @@
+# src/db/instrumentation.py
+
+import functools
+import inspect
+import os
+import re
+import time
+from contextvars import ContextVar
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+from psycopg2 import extensions
+
+from src.utils.logger import logger
+from src.utils.metrics import ThreadShards
+from .prepared import prepared_statement_sql
+
+load_dotenv()
+
+# Statements slower than this are logged (0 logs every tagged statement)
+slow_query_ms = float(os.getenv("SLOW_QUERY_MS", "500"))
+# Also log the EXPLAIN (ANALYZE, BUFFERS) plan of slow SELECTs; this runs them a second time
+slow_query_explain = os.getenv("SLOW_QUERY_EXPLAIN", "false").lower() in ("1", "true", "yes")
+
+_EXECUTE = re.compile(r"^\s*EXECUTE\s+(\w+)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryStats:
+    """Number of statements and seconds spent executing them, for one request"""
+
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+class MethodStats:
+    """Statements run on behalf of one AccountQueries method"""
+
+    __slots__ = ("statements", "seconds", "max_seconds", "rows", "slow", "errors")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.errors = 0
+
+    def merge(self, other: "MethodStats"):
+        self.statements += other.statements
+        self.seconds += other.seconds
+        self.max_seconds = max(self.max_seconds, other.max_seconds)
+        self.rows += other.rows
+        self.slow += other.slow
+        self.errors += other.errors
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_query_method: ContextVar[Optional[str]] = ContextVar("query_method", default=None)
+_method_stats = ThreadShards(MethodStats)
+
+
+def track_queries() -> QueryStats:
+    """Start counting the statements run in the current context (one request)"""
+    stats = QueryStats()
+    _query_stats.set(stats)
+    return stats
+
+
+def method_stats() -> Dict[str, Dict[str, Any]]:
+    """Totals per AccountQueries method, slowest in total first"""
+    totals = sorted(_method_stats.totals().items(), key=lambda item: item[1].seconds, reverse=True)
+    return {
+        method: {
+            "statements": stats.statements,
+            "total_ms": round(stats.seconds * 1000, 3),
+            "mean_ms": round(stats.seconds * 1000 / stats.statements, 3) if stats.statements else 0.0,
+            "max_ms": round(stats.max_seconds * 1000, 3),
+            "rows": stats.rows,
+            "slow": stats.slow,
+            "errors": stats.errors,
+        }
+        for method, stats in totals
+    }
+
+
+def _tag(method):
+    """Wrap one method so the statements it runs (directly or not) carry its name
+
+    The outermost tagged method wins: helpers called by another method are
+    accounted to the caller.
+    """
+    name = method.__name__
+
+    if inspect.isasyncgenfunction(method):
+
+        @functools.wraps(method)
+        async def async_generator_wrapper(*args, **kwargs):
+            generator = method(*args, **kwargs)
+            try:
+                while True:
+                    token = _query_method.set(_query_method.get() or name)
+                    try:
+                        item = await anext(generator)
+                    except StopAsyncIteration:
+                        return
+                    finally:
+                        _query_method.reset(token)
+                    yield item
+            finally:
+                await generator.aclose()
+
+        return async_generator_wrapper
+
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def coroutine_wrapper(*args, **kwargs):
+            if _query_method.get() is not None:
+                return await method(*args, **kwargs)
+            token = _query_method.set(name)
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                _query_method.reset(token)
+
+        return coroutine_wrapper
+
+    if inspect.isgeneratorfunction(method):
+
+        @functools.wraps(method)
+        def generator_wrapper(*args, **kwargs):
+            generator = method(*args, **kwargs)
+            try:
+                while True:
+                    # Tag each resumption only, so nothing leaks to the consumer between items
+                    token = _query_method.set(_query_method.get() or name)
+                    try:
+                        item = next(generator)
+                    except StopIteration:
+                        return
+                    finally:
+                        _query_method.reset(token)
+                    yield item
+            finally:
+                generator.close()
+
+        return generator_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if _query_method.get() is not None:
+            return method(*args, **kwargs)
+        token = _query_method.set(name)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _query_method.reset(token)
+
+    return wrapper
+
+
+def tag_query_methods(cls):
+    """Class decorator tagging every public method's statements with the method name"""
+    for attribute, value in list(vars(cls).items()):
+        if not attribute.startswith("_") and inspect.isfunction(value):
+            setattr(cls, attribute, _tag(value))
+    return cls
+
+
+def redact(params):
+    """Parameter types (and sizes) without their values, for logs"""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {key: redact([value])[0] for key, value in params.items()}
+
+    redacted = []
+    for value in params:
+        if value is None or isinstance(value, bool):
+            redacted.append(value)
+        elif isinstance(value, (int, float, Decimal)):
+            redacted.append(f"<{type(value).__name__}>")
+        elif isinstance(value, (str, bytes, list, tuple)):
+            redacted.append(f"<{type(value).__name__}:{len(value)}>")
+        else:
+            redacted.append(f"<{type(value).__name__}>")
+    return redacted
+
+
+def statement_shape(query) -> str:
+    """The SQL of a statement with whitespace collapsed, with prepared statements resolved"""
+    if isinstance(query, bytes):
+        query = query.decode(errors="replace")
+    query = _WHITESPACE.sub(" ", str(query)).strip()
+    match = _EXECUTE.match(query)
+    if match:
+        sql = prepared_statement_sql(match.group(1))
+        if sql:
+            return f"{query} -- {sql}"
+    return query
+
+
+def explain(cursor, query, params) -> Optional[str]:
+    """EXPLAIN (ANALYZE, BUFFERS) of a read-only statement on the cursor's connection, or None
+
+    Runs in a savepoint so a failure does not abort the caller's transaction.
+    Statements of the async app (psycopg 3 cursors) are not explained.
+    """
+    if not isinstance(cursor, extensions.cursor):
+        return None
+    shape = statement_shape(query)
+    sql = shape.split(" -- ", 1)[-1]
+    if ";" in (query.decode(errors="replace") if isinstance(query, bytes) else query):
+        return None
+    if not sql.upper().startswith("SELECT") or cursor.name is not None:
+        return None
+
+    conn = cursor.connection
+    savepoint = not conn.autocommit
+    # A plain cursor, so the EXPLAIN itself is neither timed nor tagged
+    with extensions.cursor(conn) as plain:
+        try:
+            if savepoint:
+                plain.execute("SAVEPOINT slow_query_explain")
+            plain.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params)
+            plan = "\n".join(row[0] for row in plain.fetchall())
+            if savepoint:
+                plain.execute("RELEASE SAVEPOINT slow_query_explain")
+            return plan
+        except Exception as e:
+            if savepoint:
+                plain.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return f"(EXPLAIN failed: {e})"
+
+
+def record_statement(cursor, query, params, seconds: float, failed: bool = False) -> None:
+    """Account one executed statement to the request and to the calling method"""
+    request_stats = _query_stats.get()
+    if request_stats is not None:
+        request_stats.queries += 1
+        request_stats.seconds += seconds
+
+    method = _query_method.get()
+    if method is None:
+        return
+
+    stats = _method_stats.get(method)
+    stats.statements += 1
+    stats.seconds += seconds
+    if seconds > stats.max_seconds:
+        stats.max_seconds = seconds
+    if failed:
+        stats.errors += 1
+        return
+
+    rows = cursor.rowcount if cursor.rowcount > 0 else 0
+    stats.rows += rows
+    if seconds * 1000 < slow_query_ms:
+        return
+
+    stats.slow += 1
+    message = (
+        f"Slow query in AccountQueries.{method}: {seconds * 1000:.1f} ms, {rows} rows\n"
+        f"  SQL: {statement_shape(query)}\n"
+        f"  params: {redact(params)}"
+    )
+    if slow_query_explain:
+        plan = explain(cursor, query, params)
+        if plan:
+            message += "\n  plan:\n    " + plan.replace("\n", "\n    ")
+    logger.warning(message, extra={"query_method": method, "duration_ms": round(seconds * 1000, 3), "rows": rows})
+
+
+class TimedCursorMixin:
+    """Times every execute and records it with record_statement"""
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            result = super().execute(query, vars)
+        except Exception:
+            record_statement(self, query, vars, time.perf_counter() - started, failed=True)
+            raise
+        record_statement(self, query, vars, time.perf_counter() - started)
+        return result
+
+    def executemany(self, query, vars_list):
+        started = time.perf_counter()
+        try:
+            result = super().executemany(query, vars_list)
+        except Exception:
+            record_statement(self, query, None, time.perf_counter() - started, failed=True)
+            raise
+        record_statement(self, query, None, time.perf_counter() - started)
+        return result
+
+
+async def timed_execute(cursor, query, params=None):
+    """Await ``cursor.execute`` on a psycopg 3 async cursor, recorded like TimedCursorMixin.execute"""
+    started = time.perf_counter()
+    try:
+        result = await cursor.execute(query, params)
+    except Exception:
+        record_statement(cursor, query, params, time.perf_counter() - started, failed=True)
+        raise
+    record_statement(cursor, query, params, time.perf_counter() - started)
+    return result
+
+
+_timed_cursor_classes = {}
+
+
+def timed_cursor_class(cursor_class):
+    """Subclass of ``cursor_class`` (e.g. RealDictCursor) with TimedCursorMixin"""
+    timed = _timed_cursor_classes.get(cursor_class)
+    if timed is None:
+        timed = type(f"Timed{cursor_class.__name__}", (TimedCursorMixin, cursor_class), {})
+        _timed_cursor_classes[cursor_class] = timed
+    return timed
+
+
+class TimedConnection(extensions.connection):
+    """psycopg2 connection whose cursors are timed, whatever cursor_factory the caller asks for
+
+    Fetches of named (server-side) cursors after their execute are not timed.
+    """
+
+    def cursor(self, *args, **kwargs):
+        cursor_class = kwargs.get("cursor_factory") or self.cursor_factory or extensions.cursor
+        kwargs["cursor_factory"] = timed_cursor_class(cursor_class)
+        return super().cursor(*args, **kwargs)
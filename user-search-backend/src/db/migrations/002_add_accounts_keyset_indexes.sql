@@ -0,0 +1,12 @@
+-- src/db/migrations/002_add_accounts_keyset_indexes.sql
+
+-- Keyset pagination orders by (created_at, id), so created_at must always be set
+UPDATE accounts SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL;
+ALTER TABLE accounts ALTER COLUMN created_at SET NOT NULL;
+
+-- Composite indexes matching ORDER BY a.created_at DESC, a.id DESC
+CREATE INDEX IF NOT EXISTS idx_accounts_created_at_id ON accounts(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_accounts_type_created_at_id ON accounts(account_type, created_at DESC, id DESC);
+
+-- Superseded by idx_accounts_type_created_at_id
+DROP INDEX IF EXISTS idx_accounts_type;
@@ -0,0 +1,23 @@
+-- src/db/migrations/003_add_accounts_search_vector.sql
+
+-- Weighted search document: name (A), tags (B), email local part (C), city (D).
+-- Declared IMMUTABLE so it can back a stored generated column.
+CREATE OR REPLACE FUNCTION accounts_search_document(
+    name TEXT,
+    email TEXT,
+    tags TEXT[],
+    address JSONB
+)
+RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(array_to_string(tags, ' '), '')), 'B')
+        || setweight(to_tsvector('simple', regexp_replace(split_part(coalesce(email, ''), '@', 1), '[._+-]+', ' ', 'g')), 'C')
+        || setweight(to_tsvector('simple', coalesce(address->>'city', '')), 'D');
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- Kept up to date by Postgres on every INSERT/UPDATE (existing rows are backfilled here)
+ALTER TABLE accounts
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (accounts_search_document(name, email, tags, address)) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_accounts_search_vector ON accounts USING GIN(search_vector);
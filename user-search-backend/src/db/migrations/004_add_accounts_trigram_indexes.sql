@@ -0,0 +1,8 @@
+-- src/db/migrations/004_add_accounts_trigram_indexes.sql
+
+-- Trigram matching for typo-tolerant, search-as-you-type suggestions
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- GIN trigram indexes serve the word-similarity operators (<%) used by /suggest
+CREATE INDEX IF NOT EXISTS idx_accounts_name_trgm ON accounts USING GIN(name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_accounts_email_trgm ON accounts USING GIN(email gin_trgm_ops);
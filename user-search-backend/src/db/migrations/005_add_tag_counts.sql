@@ -0,0 +1,75 @@
+-- src/db/migrations/005_add_tag_counts.sql
+
+-- Number of accounts carrying each tag, per account type, for facet counts
+CREATE TABLE IF NOT EXISTS tag_counts (
+    tag TEXT NOT NULL,
+    account_type account_type_enum NOT NULL,
+    count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (tag, account_type)
+);
+
+CREATE INDEX IF NOT EXISTS idx_tag_counts_type_count ON tag_counts(account_type, count DESC);
+
+-- Statement-level trigger: a multi-row INSERT/UPDATE/DELETE applies one delta per
+-- (tag, account_type) instead of one upsert per row. Rows are upserted in tag order
+-- so concurrent writers lock them in the same order.
+CREATE OR REPLACE FUNCTION apply_tag_count_deltas()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO tag_counts (tag, account_type, count)
+        SELECT tag, account_type, count(DISTINCT id)
+        FROM new_rows CROSS JOIN LATERAL unnest(new_rows.tags) AS t(tag)
+        GROUP BY tag, account_type
+        ORDER BY tag, account_type
+        ON CONFLICT (tag, account_type) DO UPDATE SET count = tag_counts.count + EXCLUDED.count;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO tag_counts (tag, account_type, count)
+        SELECT tag, account_type, -count(DISTINCT id)
+        FROM old_rows CROSS JOIN LATERAL unnest(old_rows.tags) AS t(tag)
+        GROUP BY tag, account_type
+        ORDER BY tag, account_type
+        ON CONFLICT (tag, account_type) DO UPDATE SET count = tag_counts.count + EXCLUDED.count;
+
+    ELSE
+        INSERT INTO tag_counts (tag, account_type, count)
+        SELECT tag, account_type, sum(delta)
+        FROM (
+            SELECT DISTINCT o.id, t.tag, o.account_type, -1 AS delta
+            FROM old_rows o CROSS JOIN LATERAL unnest(o.tags) AS t(tag)
+            UNION ALL
+            SELECT DISTINCT n.id, t.tag, n.account_type, 1 AS delta
+            FROM new_rows n CROSS JOIN LATERAL unnest(n.tags) AS t(tag)
+        ) changes
+        GROUP BY tag, account_type
+        HAVING sum(delta) <> 0
+        ORDER BY tag, account_type
+        ON CONFLICT (tag, account_type) DO UPDATE SET count = tag_counts.count + EXCLUDED.count;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS accounts_tag_counts_insert ON accounts;
+CREATE TRIGGER accounts_tag_counts_insert AFTER INSERT ON accounts
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_tag_count_deltas();
+
+DROP TRIGGER IF EXISTS accounts_tag_counts_update ON accounts;
+CREATE TRIGGER accounts_tag_counts_update AFTER UPDATE ON accounts
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_tag_count_deltas();
+
+DROP TRIGGER IF EXISTS accounts_tag_counts_delete ON accounts;
+CREATE TRIGGER accounts_tag_counts_delete AFTER DELETE ON accounts
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_tag_count_deltas();
+
+-- Backfill from existing accounts
+TRUNCATE tag_counts;
+INSERT INTO tag_counts (tag, account_type, count)
+SELECT tag, account_type, count(DISTINCT id)
+FROM accounts CROSS JOIN LATERAL unnest(accounts.tags) AS t(tag)
+GROUP BY tag, account_type;
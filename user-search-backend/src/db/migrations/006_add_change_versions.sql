@@ -0,0 +1,52 @@
+-- src/db/migrations/006_add_change_versions.sql
+
+-- Monotonic change counter per table, used to build ETags for list/search results.
+-- The counter is bumped in the writing transaction, so readers only ever see the
+-- version of committed data.
+CREATE TABLE IF NOT EXISTS change_versions (
+    table_name TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO change_versions (table_name, version) VALUES ('accounts', 0)
+ON CONFLICT (table_name) DO NOTHING;
+
+-- Statement-level: one bump per write statement, skipped when nothing changed.
+-- Subtype writes always go with an UPDATE of the owning accounts row (which bumps
+-- updated_at), so triggers on accounts alone cover them.
+CREATE OR REPLACE FUNCTION bump_change_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM changed_rows) THEN
+        UPDATE change_versions SET version = version + 1 WHERE table_name = TG_TABLE_NAME;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION bump_change_version_on_truncate()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE change_versions SET version = version + 1 WHERE table_name = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS accounts_change_version_insert ON accounts;
+CREATE TRIGGER accounts_change_version_insert AFTER INSERT ON accounts
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_change_version();
+
+DROP TRIGGER IF EXISTS accounts_change_version_update ON accounts;
+CREATE TRIGGER accounts_change_version_update AFTER UPDATE ON accounts
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_change_version();
+
+DROP TRIGGER IF EXISTS accounts_change_version_delete ON accounts;
+CREATE TRIGGER accounts_change_version_delete AFTER DELETE ON accounts
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_change_version();
+
+DROP TRIGGER IF EXISTS accounts_change_version_truncate ON accounts;
+CREATE TRIGGER accounts_change_version_truncate AFTER TRUNCATE ON accounts
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_change_version_on_truncate();
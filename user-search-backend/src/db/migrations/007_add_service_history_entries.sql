@@ -0,0 +1,31 @@
+-- src/db/migrations/007_add_service_history_entries.sql
+
+-- Append-only service history: one row per entry instead of a JSONB array that
+-- had to be rewritten on every append. seq orders entries (and pages) per consumer.
+CREATE TABLE IF NOT EXISTS service_history_entries (
+    consumer_id UUID NOT NULL REFERENCES service_consumers(account_id) ON DELETE CASCADE,
+    seq BIGSERIAL,
+    payload JSONB NOT NULL,
+    added_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (consumer_id, seq)
+);
+
+-- Backfill from the JSONB column, keeping each consumer's array order
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'service_consumers' AND column_name = 'service_history'
+    ) THEN
+        INSERT INTO service_history_entries (consumer_id, payload)
+        SELECT sc.account_id, e.value
+        FROM service_consumers sc
+        CROSS JOIN LATERAL jsonb_array_elements(
+            CASE WHEN jsonb_typeof(sc.service_history) = 'array' THEN sc.service_history ELSE '[]'::jsonb END
+        ) WITH ORDINALITY AS e(value, ord)
+        ORDER BY sc.account_id, e.ord;
+
+        ALTER TABLE service_consumers DROP COLUMN service_history;
+    END IF;
+END;
+$$;
@@ -0,0 +1,8 @@
+-- src/db/migrations/008_add_rate_budget_indexes.sql
+
+-- Range filters and keyset sorts on rate/budget order by (value, account id)
+CREATE INDEX IF NOT EXISTS idx_service_providers_rate_account ON service_providers(hourly_rate, account_id);
+CREATE INDEX IF NOT EXISTS idx_service_consumers_budget_account ON service_consumers(preferred_budget, account_id);
+
+-- Superseded by idx_service_providers_rate_account
+DROP INDEX IF EXISTS idx_service_providers_rate;
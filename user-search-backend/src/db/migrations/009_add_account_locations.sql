@@ -0,0 +1,26 @@
+-- src/db/migrations/009_add_account_locations.sql
+
+-- Proximity search: great-circle distances via earthdistance (built on cube)
+CREATE EXTENSION IF NOT EXISTS cube;
+CREATE EXTENSION IF NOT EXISTS earthdistance;
+
+-- Optional "lat"/"lon" numbers in the address; anything missing, non-numeric or
+-- out of range reads as NULL. Declared IMMUTABLE so it can back a generated column.
+CREATE OR REPLACE FUNCTION address_coordinate(address JSONB, key TEXT, max_abs DOUBLE PRECISION)
+RETURNS DOUBLE PRECISION AS $$
+    SELECT CASE
+        WHEN jsonb_typeof(address->key) = 'number' AND abs((address->>key)::double precision) <= max_abs
+        THEN (address->>key)::double precision
+    END;
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+ALTER TABLE accounts
+    ADD COLUMN IF NOT EXISTS latitude DOUBLE PRECISION
+    GENERATED ALWAYS AS (address_coordinate(address, 'lat', 90)) STORED,
+    ADD COLUMN IF NOT EXISTS longitude DOUBLE PRECISION
+    GENERATED ALWAYS AS (address_coordinate(address, 'lon', 180)) STORED;
+
+-- Serves radius filters (earth_box @>) and nearest-first ordering (<-> KNN scans)
+CREATE INDEX IF NOT EXISTS idx_accounts_location ON accounts
+    USING GIST (ll_to_earth(latitude, longitude))
+    WHERE latitude IS NOT NULL AND longitude IS NOT NULL;
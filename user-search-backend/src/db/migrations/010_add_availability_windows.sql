@@ -0,0 +1,249 @@
+-- src/db/migrations/010_add_availability_windows.sql
+
+-- Provider availability as weekly time ranges: minutes since Monday 00:00
+-- (0-10080), parsed from the free-form availability value so providers can be
+-- filtered by "available at" with an index instead of reading every schedule.
+--
+-- Understood formats (case-insensitive); anything else parses to NULL:
+--   "24/7"
+--   "Mon-Fri 8AM-6PM", "Mon-Fri: 9am-5pm, Sat: 10am-2pm, Sun: closed"
+--   "Weekdays 09:00-17:00", "Daily 7am-11pm", "Fri 10pm-2am" (past midnight)
+--   {"mon-fri": "9am-5pm", "sat": ["10:00-12:00", "13:00-16:00"]}
+
+-- Minutes since midnight of "8am", "8:30 PM", "18:00", "noon" or "midnight"
+CREATE OR REPLACE FUNCTION availability_minute(value TEXT)
+RETURNS INT AS $$
+DECLARE
+    parts TEXT[];
+    hours INT;
+    minutes INT;
+BEGIN
+    value := btrim(value);
+    IF value = 'noon' THEN
+        RETURN 720;
+    ELSIF value = 'midnight' THEN
+        RETURN 0;
+    END IF;
+
+    parts := regexp_match(value, '^(\d{1,2})(?:[:.](\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)?$');
+    IF parts IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    hours := parts[1]::int;
+    minutes := coalesce(parts[2]::int, 0);
+    IF minutes > 59 OR hours > 24 OR (hours = 24 AND minutes > 0) THEN
+        RETURN NULL;
+    END IF;
+
+    IF parts[3] IS NOT NULL THEN
+        IF hours < 1 OR hours > 12 THEN
+            RETURN NULL;
+        END IF;
+        hours := hours % 12 + CASE WHEN left(parts[3], 1) = 'p' THEN 12 ELSE 0 END;
+    END IF;
+    RETURN hours * 60 + minutes;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE;
+
+-- Day numbers (Monday = 0) named by "mon", "Monday", "mon-fri", "fri-mon",
+-- "weekdays", "weekends" or "daily"
+CREATE OR REPLACE FUNCTION availability_days(value TEXT)
+RETURNS INT[] AS $$
+DECLARE
+    names CONSTANT TEXT[] := ARRAY['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun'];
+    parts TEXT[];
+    first_day INT;
+    last_day INT;
+BEGIN
+    value := btrim(value);
+    IF value IN ('daily', 'everyday', 'every day', 'all week') THEN
+        RETURN ARRAY[0, 1, 2, 3, 4, 5, 6];
+    ELSIF value IN ('weekdays', 'weekday') THEN
+        RETURN ARRAY[0, 1, 2, 3, 4];
+    ELSIF value IN ('weekends', 'weekend') THEN
+        RETURN ARRAY[5, 6];
+    END IF;
+
+    parts := regexp_match(value, '^([a-z]+)(?:\s*(?:-|to)\s*([a-z]+))?$');
+    IF parts IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    first_day := array_position(names, left(parts[1], 3)) - 1;
+    last_day := coalesce(array_position(names, left(parts[2], 3)) - 1, first_day);
+    IF first_day IS NULL OR last_day IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- Ranges such as "fri-mon" wrap around the end of the week
+    RETURN ARRAY(SELECT (first_day + n) % 7 FROM generate_series(0, (last_day - first_day + 7) % 7) AS n);
+END;
+$$ LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE;
+
+-- Weekly windows of a time range ("9am-5pm", "all day", "closed") on the given days
+CREATE OR REPLACE FUNCTION availability_day_windows(days INT[], hours TEXT)
+RETURNS int4multirange AS $$
+DECLARE
+    parts TEXT[];
+    open_at INT;
+    close_at INT;
+    day_start INT;
+    windows int4multirange := '{}';
+BEGIN
+    hours := btrim(hours);
+    IF days IS NULL THEN
+        RETURN NULL;
+    ELSIF hours IN ('closed', 'off', 'unavailable') THEN
+        RETURN windows;
+    ELSIF hours IN ('all day', '24h', '24 hours', 'open 24 hours') THEN
+        open_at := 0;
+        close_at := 1440;
+    ELSE
+        parts := regexp_match(hours, '^(.+?)\s*(?:-|–|to)\s*(.+)$');
+        IF parts IS NULL THEN
+            RETURN NULL;
+        END IF;
+        open_at := availability_minute(parts[1]);
+        close_at := availability_minute(parts[2]);
+        IF open_at IS NULL OR close_at IS NULL THEN
+            RETURN NULL;
+        END IF;
+        -- Closing at or before opening time runs past midnight
+        IF close_at <= open_at THEN
+            close_at := close_at + 1440;
+        END IF;
+    END IF;
+
+    FOREACH day_start IN ARRAY days LOOP
+        day_start := day_start * 1440;
+        IF day_start + close_at <= 10080 THEN
+            windows := windows + int4multirange(int4range(day_start + open_at, day_start + close_at));
+        ELSE
+            -- Sunday night into Monday morning
+            windows := windows
+                + int4multirange(int4range(day_start + open_at, 10080))
+                + int4multirange(int4range(0, day_start + close_at - 10080));
+        END IF;
+    END LOOP;
+    RETURN windows;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE;
+
+-- Weekly windows of an availability value; NULL when any part of it is not understood
+CREATE OR REPLACE FUNCTION parse_availability(availability JSONB)
+RETURNS int4multirange AS $$
+DECLARE
+    schedule TEXT;
+    part TEXT;
+    parts TEXT[];
+    entry RECORD;
+    hours JSONB;
+    day_windows int4multirange;
+    windows int4multirange := '{}';
+BEGIN
+    IF jsonb_typeof(availability) = 'string' THEN
+        schedule := lower(btrim(availability #>> '{}'));
+        IF schedule IN ('24/7', '24x7', 'always') THEN
+            RETURN int4multirange(int4range(0, 10080));
+        END IF;
+
+        FOREACH part IN ARRAY regexp_split_to_array(schedule, '\s*[,;]\s*') LOOP
+            -- "<days>[:] <hours>", e.g. "mon-fri 8am-6pm" or "sun: closed"
+            parts := regexp_match(part, '^([a-z]+(?:\s*(?:-|to)\s*[a-z]+)?)\s*:?\s*(.*\S)$');
+            IF parts IS NULL THEN
+                RETURN NULL;
+            END IF;
+            day_windows := availability_day_windows(availability_days(parts[1]), parts[2]);
+            IF day_windows IS NULL THEN
+                RETURN NULL;
+            END IF;
+            windows := windows + day_windows;
+        END LOOP;
+        RETURN windows;
+
+    ELSIF jsonb_typeof(availability) = 'object' THEN
+        FOR entry IN SELECT key, value FROM jsonb_each(availability) LOOP
+            FOR hours IN
+                SELECT * FROM jsonb_array_elements(
+                    CASE WHEN jsonb_typeof(entry.value) = 'array' THEN entry.value ELSE jsonb_build_array(entry.value) END
+                )
+            LOOP
+                IF jsonb_typeof(hours) <> 'string' THEN
+                    RETURN NULL;
+                END IF;
+                day_windows := availability_day_windows(availability_days(lower(entry.key)), lower(hours #>> '{}'));
+                IF day_windows IS NULL THEN
+                    RETURN NULL;
+                END IF;
+                windows := windows + day_windows;
+            END LOOP;
+        END LOOP;
+        RETURN windows;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE;
+
+-- Generated, so every write path (API, batch create, bulk import) keeps it in step
+-- with availability, and adding it parses the existing rows
+ALTER TABLE service_providers
+    ADD COLUMN IF NOT EXISTS availability_windows int4multirange
+    GENERATED ALWAYS AS (parse_availability(availability)) STORED;
+
+-- One row per window, for the index: GiST on the multirange column would index
+-- only each schedule's bounding range (Monday morning to Friday night), so
+-- "available at" would recheck nearly every provider with weekday hours
+CREATE TABLE IF NOT EXISTS provider_availability_windows (
+    account_id UUID NOT NULL REFERENCES service_providers(account_id) ON DELETE CASCADE,
+    minutes int4range NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_provider_availability_windows_minutes
+    ON provider_availability_windows USING GIST (minutes);
+CREATE INDEX IF NOT EXISTS idx_provider_availability_windows_account
+    ON provider_availability_windows(account_id);
+
+-- Statement-level, like the tag counts: one insert per statement, and updates
+-- rewrite only the providers whose windows changed (deletes cascade)
+CREATE OR REPLACE FUNCTION sync_provider_availability_windows()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        DELETE FROM provider_availability_windows w
+        USING old_rows o JOIN new_rows n ON n.account_id = o.account_id
+        WHERE w.account_id = o.account_id
+          AND o.availability_windows IS DISTINCT FROM n.availability_windows;
+
+        INSERT INTO provider_availability_windows (account_id, minutes)
+        SELECT n.account_id, w.minutes
+        FROM new_rows n
+        JOIN old_rows o ON o.account_id = n.account_id
+        CROSS JOIN LATERAL unnest(n.availability_windows) AS w(minutes)
+        WHERE o.availability_windows IS DISTINCT FROM n.availability_windows;
+    ELSE
+        INSERT INTO provider_availability_windows (account_id, minutes)
+        SELECT n.account_id, w.minutes
+        FROM new_rows n CROSS JOIN LATERAL unnest(n.availability_windows) AS w(minutes);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS service_providers_availability_insert ON service_providers;
+CREATE TRIGGER service_providers_availability_insert AFTER INSERT ON service_providers
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_provider_availability_windows();
+
+DROP TRIGGER IF EXISTS service_providers_availability_update ON service_providers;
+CREATE TRIGGER service_providers_availability_update AFTER UPDATE ON service_providers
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_provider_availability_windows();
+
+-- Backfill from existing providers
+INSERT INTO provider_availability_windows (account_id, minutes)
+SELECT sp.account_id, w.minutes
+FROM service_providers sp CROSS JOIN LATERAL unnest(sp.availability_windows) AS w(minutes)
+WHERE NOT EXISTS (SELECT 1 FROM provider_availability_windows);
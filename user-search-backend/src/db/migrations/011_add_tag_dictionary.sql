@@ -0,0 +1,69 @@
+-- src/db/migrations/011_add_tag_dictionary.sql
+
+-- Every distinct tag once, with a small integer id. Accounts keep their tags as
+-- text for responses and search, and the ids in tag_ids for filtering: a GIN
+-- index over int4 keys is a fraction of the size of one over the tag strings.
+CREATE TABLE IF NOT EXISTS tag_dictionary (
+    id SERIAL PRIMARY KEY,
+    tag TEXT NOT NULL UNIQUE
+);
+
+-- Canonical tags: trimmed, lower-case, without blanks or duplicates, in first-seen order
+CREATE OR REPLACE FUNCTION normalize_tags(tags TEXT[])
+RETURNS TEXT[] AS $$
+    SELECT coalesce(array_agg(tag ORDER BY ord), '{}')
+    FROM (
+        SELECT DISTINCT ON (tag) tag, ord
+        FROM unnest(tags) WITH ORDINALITY AS t(raw, ord)
+        CROSS JOIN LATERAL (SELECT lower(btrim(raw)) AS tag) normalized
+        WHERE tag <> ''
+        ORDER BY tag, ord
+    ) distinct_tags;
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- Dictionary ids of (already normalized) tags, in no particular order, adding the
+-- ones not seen before. Known tags, the common case, cost a single index lookup.
+CREATE OR REPLACE FUNCTION tag_ids_for(tags TEXT[])
+RETURNS INT[] AS $$
+DECLARE
+    ids INT[];
+BEGIN
+    SELECT coalesce(array_agg(id), '{}') INTO ids FROM tag_dictionary WHERE tag = ANY(tags);
+    IF cardinality(ids) = cardinality(tags) THEN
+        RETURN ids;
+    END IF;
+
+    -- Only the missing tags, so lookups do not burn sequence values
+    INSERT INTO tag_dictionary (tag)
+    SELECT t.tag FROM unnest(tags) AS t(tag)
+    WHERE NOT EXISTS (SELECT 1 FROM tag_dictionary d WHERE d.tag = t.tag)
+    ON CONFLICT (tag) DO NOTHING;
+
+    SELECT coalesce(array_agg(id), '{}') INTO ids FROM tag_dictionary WHERE tag = ANY(tags);
+    RETURN ids;
+END;
+$$ language 'plpgsql';
+
+ALTER TABLE accounts ADD COLUMN IF NOT EXISTS tag_ids INT[] NOT NULL DEFAULT '{}';
+
+-- Normalize tags on every write (search_vector is generated after this runs, so
+-- it sees the normalized tags too) and keep tag_ids in step
+CREATE OR REPLACE FUNCTION set_account_tag_ids()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.tags = normalize_tags(NEW.tags);
+    NEW.tag_ids = tag_ids_for(NEW.tags);
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS accounts_tag_ids ON accounts;
+CREATE TRIGGER accounts_tag_ids BEFORE INSERT OR UPDATE OF tags ON accounts
+    FOR EACH ROW EXECUTE FUNCTION set_account_tag_ids();
+
+-- Convert existing accounts: merges case/whitespace duplicates and fills tag_ids
+-- (tag_counts follows through its own trigger)
+UPDATE accounts SET tags = tags WHERE cardinality(tags) > 0 AND cardinality(tag_ids) = 0;
+
+CREATE INDEX IF NOT EXISTS idx_accounts_tag_ids ON accounts USING GIN(tag_ids);
+DROP INDEX IF EXISTS idx_accounts_tags;
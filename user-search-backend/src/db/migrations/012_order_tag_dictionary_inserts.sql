@@ -0,0 +1,27 @@
+-- src/db/migrations/012_order_tag_dictionary_inserts.sql
+
+-- tag_ids_for (migration 011) runs in the writer's transaction, so the tags it
+-- adds stay locked until that commits. Adding them in sorted order makes every
+-- writer take those locks in the same order: concurrent writers meeting the same
+-- new tags wait for each other instead of deadlocking.
+CREATE OR REPLACE FUNCTION tag_ids_for(tags TEXT[])
+RETURNS INT[] AS $$
+DECLARE
+    ids INT[];
+BEGIN
+    SELECT coalesce(array_agg(id), '{}') INTO ids FROM tag_dictionary WHERE tag = ANY(tags);
+    IF cardinality(ids) = cardinality(tags) THEN
+        RETURN ids;
+    END IF;
+
+    -- Only the missing tags, so lookups do not burn sequence values
+    INSERT INTO tag_dictionary (tag)
+    SELECT t.tag FROM unnest(tags) AS t(tag)
+    WHERE NOT EXISTS (SELECT 1 FROM tag_dictionary d WHERE d.tag = t.tag)
+    ORDER BY t.tag
+    ON CONFLICT (tag) DO NOTHING;
+
+    SELECT coalesce(array_agg(id), '{}') INTO ids FROM tag_dictionary WHERE tag = ANY(tags);
+    RETURN ids;
+END;
+$$ language 'plpgsql';
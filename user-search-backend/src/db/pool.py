@@ -0,0 +1,208 @@
+# src/db/pool.py
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Any
+
+from psycopg2 import extensions
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection could be acquired within the pool timeout"""
+
+
+class ConnectionPool:
+    """Thread-safe pool of psycopg2 connections
+
+    Connections are validated on checkout (closed connections are dropped and
+    connections idle for longer than ``health_check_idle`` seconds are pinged)
+    and recycled once they are older than ``max_lifetime`` seconds.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 5.0,
+        max_lifetime: float = 1800.0,
+        health_check_idle: float = 30.0,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_idle = health_check_idle
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, created_at, last_used_at)
+        self._created_at = {}  # id(conn) -> created_at for checked out connections
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+
+        self._counters = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "acquired": 0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+            "wait_seconds_total": 0.0,
+        }
+
+    # ============ CHECKOUT / CHECKIN ============
+
+    def getconn(self):
+        """Borrow a connection, waiting up to ``timeout`` seconds for one to free up"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+
+        while True:
+            entry = None
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counters["timeouts"] += 1
+                        raise PoolTimeoutError(
+                            f"Timed out after {self.timeout}s waiting for a database connection "
+                            f"(pool size {self.max_size})"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+
+                if self._idle:
+                    entry = self._idle.pop()
+                else:
+                    # Reserve a slot and open the connection outside the lock
+                    self._size += 1
+
+            if entry is None:
+                conn, created_at = self._open_reserved()
+            else:
+                conn, created_at, last_used_at = entry
+                if not self._is_usable(conn, created_at, last_used_at):
+                    self._discard(conn)
+                    continue
+
+            with self._cond:
+                self._created_at[id(conn)] = created_at
+                self._counters["acquired"] += 1
+                self._counters["wait_seconds_total"] += time.monotonic() - started
+            return conn
+
+    def putconn(self, conn, discard: bool = False) -> None:
+        """Return a borrowed connection, resetting any open transaction"""
+        with self._cond:
+            created_at = self._created_at.pop(id(conn), None)
+
+        if created_at is None:
+            raise ValueError("Connection does not belong to this pool")
+
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        if discard or conn.closed or self._expired(created_at) or self._closed:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, created_at, time.monotonic()))
+            self._cond.notify()
+
+    def fill(self) -> None:
+        """Open connections until at least ``min_size`` exist"""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            conn, created_at = self._open_reserved()
+            with self._cond:
+                self._idle.appendleft((conn, created_at, time.monotonic()))
+                self._cond.notify()
+
+    def closeall(self) -> None:
+        """Close idle connections and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool utilization and lifetime counters"""
+        with self._cond:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._created_at),
+                "waiting": self._waiting,
+                **self._counters,
+            }
+
+    # ============ HELPERS ============
+
+    def _open_reserved(self):
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._counters["connections_created"] += 1
+        return conn, time.monotonic()
+
+    def _discard(self, conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+        with self._cond:
+            self._size -= 1
+            self._counters["connections_closed"] += 1
+            self._cond.notify()
+
+    def _expired(self, created_at: float) -> bool:
+        return self.max_lifetime > 0 and time.monotonic() - created_at >= self.max_lifetime
+
+    def _is_usable(self, conn, created_at: float, last_used_at: float) -> bool:
+        if conn.closed or self._expired(created_at):
+            return False
+
+        if time.monotonic() - last_used_at < self.health_check_idle:
+            return True
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            with self._cond:
+                self._counters["health_check_failures"] += 1
+            return False
@@ -0,0 +1,115 @@
+# src/db/prepared.py
+
+import hashlib
+import os
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+# Statements kept prepared per connection; the least recently used one is
+# deallocated past this (0 disables prepared statements)
+PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("PREPARED_STATEMENT_CACHE_SIZE", "100"))
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = re.compile(r"%[s%]")
+
+
+def statement_signature(query: str) -> str:
+    """The query with whitespace collapsed, so statements built from the same pieces share a key"""
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def to_positional(query: str) -> Tuple[str, int]:
+    """Rewrite a psycopg2 query (%s placeholders, %% escapes) for PREPARE ($1, $2, ...)
+
+    Returns the rewritten query and its number of parameters.
+    """
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        if match.group() == "%%":
+            return "%"
+        count += 1
+        return f"${count}"
+
+    return _PLACEHOLDER.sub(replace, query), count
+
+
+class PreparedStatements:
+    """The statements prepared on one connection, least recently used first"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._names = OrderedDict()  # signature -> statement name
+
+    def get(self, signature: str) -> Optional[str]:
+        name = self._names.get(signature)
+        if name is not None:
+            self._names.move_to_end(signature)
+        return name
+
+    def add(self, signature: str, name: str) -> Optional[str]:
+        """Remember a prepared statement; returns the name of the one to deallocate, if any"""
+        self._names[signature] = name
+        if len(self._names) > self.max_size:
+            return self._names.popitem(last=False)[1]
+        return None
+
+    def __len__(self):
+        return len(self._names)
+
+
+_statements = weakref.WeakKeyDictionary()  # connection -> PreparedStatements
+_statements_lock = threading.Lock()
+
+# Statement name -> signature, the same on every connection (names derive from signatures)
+_statement_sql = {}
+
+
+def prepared_statement_sql(name: str) -> Optional[str]:
+    """The SQL (with %s placeholders) a prepared statement name stands for, if prepared here"""
+    return _statement_sql.get(name)
+
+
+def connection_statements(conn) -> PreparedStatements:
+    with _statements_lock:
+        statements = _statements.get(conn)
+        if statements is None:
+            statements = _statements[conn] = PreparedStatements(PREPARED_STATEMENT_CACHE_SIZE)
+        return statements
+
+
+def prepared(cursor, query: str, params: List[Any]) -> Tuple[str, List[Any]]:
+    """EXECUTE statement (and its params) running ``query`` as a prepared statement
+
+    The statement is prepared on the cursor's connection the first time its
+    signature is seen there, so later calls skip parsing and planning (Postgres
+    switches to a generic plan once it is no costlier than the custom ones).
+    Prepared statements outlive transactions, including rolled back ones. With
+    PREPARED_STATEMENT_CACHE_SIZE=0 the query is returned unchanged.
+    """
+    if PREPARED_STATEMENT_CACHE_SIZE <= 0:
+        return query, params
+
+    signature = statement_signature(query)
+    statements = connection_statements(cursor.connection)
+    name = statements.get(signature)
+
+    if name is None:
+        body, count = to_positional(signature)
+        if count != len(params):
+            raise ValueError(f"Statement has {count} placeholders but {len(params)} params")
+
+        name = "account_stmt_" + hashlib.sha1(signature.encode()).hexdigest()[:16]
+        cursor.execute(f"PREPARE {name} AS {body}")
+        _statement_sql[name] = signature
+        evicted = statements.add(signature, name)
+        if evicted:
+            cursor.execute(f"DEALLOCATE {evicted}")
+
+    if not params:
+        return f"EXECUTE {name}", []
+    return f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", list(params)
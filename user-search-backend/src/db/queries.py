@@ -1,8 +1,294 @@
+import math
+import re
 import uuid
-from psycopg2.extras import RealDictCursor, Json
-from typing import Optional, List, Dict, Any
+from datetime import datetime
+from decimal import Decimal
+from psycopg2.extras import RealDictCursor, Json, execute_values
+from typing import Optional, List, Dict, Any, Tuple, Iterator
+from .pagination import DEFAULT_PAGE_SIZE, encode_cursor, decode_cursor
+from .cache import get_account_cache, invalidation_statement
+from .prepared import prepared
+from .instrumentation import tag_query_methods
 
 
+# Account reads include only the latest service history entries; the full
+# history is paginated by get_service_history
+SERVICE_HISTORY_PREVIEW_SIZE = 5
+
+SERVICE_HISTORY_PREVIEW = f"""
+    CASE WHEN a.account_type = 'service_consumer' THEN (
+        SELECT jsonb_agg(h.payload ORDER BY h.seq) FROM (
+            SELECT payload, seq FROM service_history_entries
+            WHERE consumer_id = a.id
+            ORDER BY seq DESC
+            LIMIT {SERVICE_HISTORY_PREVIEW_SIZE}
+        ) h
+    ) END
+"""
+
+# Columns of a full account row (search_vector and other internal columns are left out)
+ACCOUNT_COLUMNS = f"""
+    a.id, a.name, a.email, a.address, a.tags, a.account_type, a.created_at, a.updated_at,
+    sp.hourly_rate, sp.availability,
+    sc.preferred_budget, {SERVICE_HISTORY_PREVIEW} AS service_history
+"""
+
+ACCOUNT_JOINS = """
+    FROM accounts a
+    LEFT JOIN service_providers sp ON a.id = sp.account_id
+    LEFT JOIN service_consumers sc ON a.id = sc.account_id
+"""
+
+# Response field -> column, and the subtype join it needs (None for the accounts table)
+ACCOUNT_FIELD_COLUMNS = {
+    "id": ("a.id", None),
+    "name": ("a.name", None),
+    "email": ("a.email", None),
+    "address": ("a.address", None),
+    "tags": ("a.tags", None),
+    "account_type": ("a.account_type", None),
+    "created_at": ("a.created_at", None),
+    "updated_at": ("a.updated_at", None),
+    "hourly_rate": ("sp.hourly_rate", "sp"),
+    "availability": ("sp.availability", "sp"),
+    "preferred_budget": ("sc.preferred_budget", "sc"),
+    "service_history": (f"{SERVICE_HISTORY_PREVIEW} AS service_history", None),
+}
+
+SUBTYPE_JOINS = {
+    "sp": "LEFT JOIN service_providers sp ON a.id = sp.account_id",
+    "sc": "LEFT JOIN service_consumers sc ON a.id = sc.account_id",
+}
+
+# Always selected by projected queries: identity, type checks, sort keys and ETags need them
+ACCOUNT_KEY_FIELDS = ("id", "account_type", "created_at", "updated_at")
+
+# Point reads, shared with the async queries
+ACCOUNT_BY_ID_QUERY = f"SELECT {ACCOUNT_COLUMNS} {ACCOUNT_JOINS} WHERE a.id = %s"
+ACCOUNT_VERSION_QUERY = "SELECT id, account_type, updated_at FROM accounts WHERE id = %s"
+CHANGE_VERSION_QUERY = "SELECT version FROM change_versions WHERE table_name = 'accounts'"
+
+# Columns of the accounts table returned by writes (RETURNING / CTE output)
+ACCOUNT_BASE_COLUMNS = "id, name, email, address, tags, account_type, created_at, updated_at"
+
+# Subtype tables: name, columns returned, and the remaining response columns (NULL
+# placeholders for the other subtype, plus the service history preview)
+SUBTYPES = {
+    "service_provider": {
+        "table": "service_providers",
+        "columns": ["hourly_rate", "availability"],
+        "other": "NULL::numeric AS preferred_budget, NULL::jsonb AS service_history",
+    },
+    "service_consumer": {
+        "table": "service_consumers",
+        "columns": ["preferred_budget"],
+        "other": f"NULL::numeric AS hourly_rate, NULL::jsonb AS availability, {SERVICE_HISTORY_PREVIEW} AS service_history",
+    },
+}
+
+# Appends a JSON array of entries to the history of the account in the `a` CTE, in array order
+SERVICE_HISTORY_INSERT = """
+    INSERT INTO service_history_entries (consumer_id, payload)
+    SELECT a.id, e.value
+    FROM a CROSS JOIN LATERAL jsonb_array_elements(%s::jsonb) WITH ORDINALITY AS e(value, ord)
+    ORDER BY e.ord
+"""
+
+# Sort orders: row key, direction and the cast of its cursor value. Every order
+# ends with id as a tie-breaker. Rate and budget orders skip accounts without a value.
+SORTS = {
+    "created_at": ("created_at", "DESC", ""),
+    "rate": ("hourly_rate", "ASC", "::numeric"),
+    "budget": ("preferred_budget", "ASC", "::numeric"),
+    "relevance": ("rank", "DESC", "::real"),
+    "distance": ("distance_key", "ASC", "::float8"),
+}
+LIST_SORTS = ("created_at", "rate", "budget", "distance")
+SEARCH_SORTS = ("relevance",) + LIST_SORTS
+
+# Cursor values are JSON; these restore the sort key's type
+CURSOR_VALUE_TYPES = {
+    "created_at": datetime.fromisoformat,
+    "hourly_rate": Decimal,
+    "preferred_budget": Decimal,
+    "rank": float,
+    "distance_key": float,
+}
+NULLABLE_SORT_KEYS = ("hourly_rate", "preferred_budget")
+
+# Tag filter modes: accounts with any of the tags, or with all of them
+TAG_MODES = ("any", "all")
+
+# Tag dictionary ids (migration 011) by tag. An id never changes once assigned,
+# so ids are cached for the life of the process; unknown tags are looked up again.
+TAG_ID_CACHE_SIZE = 10000
+_tag_id_cache: Dict[str, int] = {}
+
+TAG_IDS_QUERY = "SELECT tag, id FROM tag_dictionary WHERE tag = ANY(%s)"
+
+# A batch's new tags, added in one sorted statement before its accounts, so
+# concurrent batches take the dictionary's row locks in the same order
+ADD_TAGS_QUERY = """
+    INSERT INTO tag_dictionary (tag)
+    SELECT t.tag FROM unnest(normalize_tags(%s::text[])) AS t(tag)
+    WHERE NOT EXISTS (SELECT 1 FROM tag_dictionary d WHERE d.tag = t.tag)
+    ORDER BY t.tag
+    ON CONFLICT (tag) DO NOTHING
+"""
+
+# Numeric range filters: parameter -> (field, operator)
+RANGE_FILTERS = {
+    "min_rate": ("hourly_rate", ">="),
+    "max_rate": ("hourly_rate", "<="),
+    "min_budget": ("preferred_budget", ">="),
+    "max_budget": ("preferred_budget", "<="),
+}
+
+# Proximity search (migration 009): account coordinates as a point on the earth
+# cube, indexed with GiST for both earth_box() radius checks and `<->` ordering
+ACCOUNT_LOCATION = "ll_to_earth(a.latitude, a.longitude)"
+
+# Provider availability (migration 010): weekly windows in minutes since Monday 00:00
+MINUTES_PER_WEEK = 7 * 24 * 60
+
+# Rows fetched per round-trip when streaming through a server-side cursor
+STREAM_BATCH_SIZE = 2000
+
+# Rows per multi-row INSERT statement in batch creates
+BATCH_INSERT_PAGE_SIZE = 1000
+
+
+def is_valid_id(account_id: Any) -> bool:
+    """Whether an account id is a well-formed UUID (anything else cannot exist)"""
+    try:
+        uuid.UUID(str(account_id))
+    except ValueError:
+        return False
+    return True
+
+
+def prefix_tsquery(q: str) -> str:
+    """to_tsquery text matching every word of ``q``, the last one as a prefix (search-as-you-type)"""
+    words = re.findall(r"\w+", q.lower())
+    if not words:
+        raise ValueError("q must contain a letter or digit")
+    return " & ".join(words[:-1] + [words[-1] + ":*"])
+
+
+def normalize_tags(tags: List[str]) -> List[str]:
+    """Tags in the stored form (see normalize_tags() in migration 011): trimmed,
+    lower-case, without blanks or duplicates. Like btrim(), only spaces are trimmed"""
+    return list(dict.fromkeys(tag.strip(" ").lower() for tag in tags if tag.strip(" ")))
+
+
+def cached_tag_ids(tags: List[str]) -> Tuple[Dict[str, int], List[str]]:
+    """Cached dictionary ids of tags, and the tags to look up"""
+    ids = {tag: _tag_id_cache[tag] for tag in tags if tag in _tag_id_cache}
+    return ids, [tag for tag in tags if tag not in ids]
+
+
+def remember_tag_ids(rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Cache the (tag, id) rows of TAG_IDS_QUERY and return them as a dict"""
+    found = {row["tag"]: row["id"] for row in rows}
+    if len(_tag_id_cache) + len(found) > TAG_ID_CACHE_SIZE:
+        _tag_id_cache.clear()
+    _tag_id_cache.update(found)
+    return found
+
+
+def parse_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse a comma-separated sparse fieldset; id is always included
+
+    Returns None (every field) when no fields are requested.
+    """
+    if not value:
+        return None
+
+    fields = ["id"]
+    for field in value.split(","):
+        field = field.strip()
+        if field and field not in fields:
+            fields.append(field)
+
+    unknown = [field for field in fields if field not in ACCOUNT_FIELD_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(fields)
+
+
+def account_projection(fields: Optional[Tuple[str, ...]] = None, include: Tuple[str, ...] = ()) -> Tuple[str, str]:
+    """SELECT list and FROM clause reading only the requested fields
+
+    Subtype tables are joined only when one of their columns is requested, or
+    is in ``include`` (fields that filters and sort orders refer to).
+    """
+    if not fields:
+        return ACCOUNT_COLUMNS, ACCOUNT_JOINS
+
+    columns = []
+    joins = []
+    for field in ACCOUNT_KEY_FIELDS + tuple(include) + fields:
+        column, join = ACCOUNT_FIELD_COLUMNS[field]
+        if column not in columns:
+            columns.append(column)
+        if join and join not in joins:
+            joins.append(join)
+
+    return ", ".join(columns), " ".join(["FROM accounts a"] + [SUBTYPE_JOINS[join] for join in joins])
+
+
+def proximity_columns(near: Optional[Dict[str, float]]) -> Dict[str, str]:
+    """Distance columns for a ``near`` filter ({"lat", "lon", "radius_km"}), by row key
+
+    distance_km is the great-circle distance; distance_key is the straight-line
+    (chord) distance `<->` returns, which orders rows the same way and lets the
+    GiST index return them nearest first.
+    """
+    if not near:
+        return {}
+
+    center = earth_point(near)
+    return {
+        "distance_km": f"earth_distance({center}, {ACCOUNT_LOCATION}) / 1000",
+        "distance_key": f"({ACCOUNT_LOCATION} <-> {center})",
+    }
+
+
+def earth_point(near: Dict[str, float]) -> str:
+    """ll_to_earth() of the search center, inlined as float literals
+
+    Literals rather than parameters so the planner can match the ORDER BY to
+    the index; the values are validated floats, so nothing is interpolated unchecked.
+    """
+    return f"ll_to_earth({float(near['lat'])!r}, {float(near['lon'])!r})"
+
+
+def week_minute(moment: datetime) -> int:
+    """Minutes since Monday 00:00 of a timestamp's wall-clock time"""
+    return moment.weekday() * 24 * 60 + moment.hour * 60 + moment.minute
+
+
+def availability_ranges(start: datetime, end: Optional[datetime] = None) -> List[Tuple[int, int]]:
+    """Week-minute ranges [lower, upper) a provider's windows must cover to be
+    available at ``start`` (or from ``start`` until ``end``)
+
+    An interval running past Sunday midnight is split in two.
+    """
+    first = week_minute(start)
+    if end is None:
+        length = 1
+    else:
+        length = math.ceil((end - start.replace(second=0, microsecond=0)).total_seconds() / 60)
+        if length > MINUTES_PER_WEEK:
+            raise ValueError("available_between must span at most a week")
+
+    last = first + length
+    if last <= MINUTES_PER_WEEK:
+        return [(first, last)]
+    return [(first, MINUTES_PER_WEEK), (0, last - MINUTES_PER_WEEK)]
+
+
+@tag_query_methods
 class AccountQueries:
     """Database queries for account operations"""
 
@@ -11,142 +297,647 @@ class AccountQueries:
 
     # ============ GENERAL ACCOUNT OPERATIONS ============
 
+    def _tag_ids(self, tags: List[str]) -> List[int]:
+        """Dictionary ids of normalized tags; tags that were never stored are left out"""
+        ids, missing = cached_tag_ids(tags)
+        if missing:
+            with self.db.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(TAG_IDS_QUERY, [missing])
+                ids.update(remember_tag_ids(cursor.fetchall()))
+        return list(ids.values())
+
+    def _build_filters(
+        self,
+        account_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        ranges: Optional[Dict[str, float]] = None,
+        near: Optional[Dict[str, float]] = None,
+        available: Optional[List[Tuple[int, int]]] = None,
+        tags_mode: str = "any",
+    ) -> Tuple[str, List[Any]]:
+        """WHERE clause fragments shared by the list and search queries"""
+        clauses = ""
+        params = []
+
+        if tags_mode not in TAG_MODES:
+            raise ValueError(f"tags_mode must be one of {', '.join(TAG_MODES)}")
+
+        # Filter by account type
+        if account_type:
+            clauses += " AND a.account_type = %s"
+            params.append(account_type)
+
+        # Filter by tags, matched on dictionary ids (migration 011). The ids are
+        # bound as one int[] parameter: once a prepared list page (see prepared())
+        # switches to a generic plan, every tag set is estimated alike, whatever
+        # the statistics of its ids.
+        tags = normalize_tags(tags or [])
+        if tags:
+            tag_ids = self._tag_ids(tags)
+            if tags_mode == "all" and len(tag_ids) < len(tags):
+                clauses += " AND false"
+            elif tags_mode == "all":
+                clauses += " AND a.tag_ids @> %s::int[]"
+                params.append(tag_ids)
+            else:
+                clauses += " AND a.tag_ids && %s::int[]"
+                params.append(tag_ids)
+
+        # Filter by hourly rate / preferred budget ranges. The cast keeps the
+        # comparison on numeric (psycopg 3 binds floats as float8), so the rate and
+        # budget indexes stay usable
+        for name, value in (ranges or {}).items():
+            field, operator = RANGE_FILTERS[name]
+            clauses += f" AND {ACCOUNT_FIELD_COLUMNS[field][0]} {operator} %s::numeric"
+            params.append(value)
+
+        # Only located accounts, within radius_km of the center when given. The
+        # earth_box() check is the indexable one; earth_distance() trims its corners.
+        if near:
+            clauses += " AND a.latitude IS NOT NULL AND a.longitude IS NOT NULL"
+            if near.get("radius_km"):
+                center = earth_point(near)
+                clauses += (
+                    f" AND earth_box({center}, %s) @> {ACCOUNT_LOCATION}"
+                    f" AND earth_distance({center}, {ACCOUNT_LOCATION}) <= %s"
+                )
+                radius_m = near["radius_km"] * 1000
+                params += [radius_m, radius_m]
+
+        # Only providers with an availability window covering the requested time
+        # (each part of it, when it runs past the end of the week)
+        for lower, upper in available or []:
+            clauses += (
+                " AND a.id IN (SELECT account_id FROM provider_availability_windows"
+                " WHERE minutes @> int4range(%s, %s))"
+            )
+            params += [lower, upper]
+
+        return clauses, params
+
+    @staticmethod
+    def _required_fields(ranges: Optional[Dict[str, float]], sort: str) -> Tuple[str, ...]:
+        """Fields that range filters and the sort order refer to, so projections select (and join) them"""
+        fields = [RANGE_FILTERS[name][0] for name in ranges or {}]
+        key = SORTS[sort][0]
+        if key in ACCOUNT_FIELD_COLUMNS:
+            fields.append(key)
+        return tuple(dict.fromkeys(fields))
+
+    @staticmethod
+    def _validate_sort(sort: str, allowed: Tuple[str, ...], near: Optional[Dict[str, float]] = None) -> None:
+        if sort not in allowed:
+            raise ValueError(f"sort must be one of {', '.join(allowed)}")
+        if sort == "distance" and not near:
+            raise ValueError("sort=distance requires near")
+
+    @classmethod
+    def _select_columns(
+        cls,
+        fields: Optional[Tuple[str, ...]],
+        ranges: Optional[Dict[str, float]],
+        sort: str,
+        near: Optional[Dict[str, float]],
+    ) -> Tuple[str, str, Dict[str, str]]:
+        """SELECT list, FROM clause and distance column expressions for a list or search page"""
+        columns, joins = account_projection(fields, cls._required_fields(ranges, sort))
+        distances = proximity_columns(near)
+        for name, expression in distances.items():
+            columns += f", {expression} AS {name}"
+        return columns, joins, distances
+
+    @staticmethod
+    def _sort_clauses(sort: str, cursor: Optional[str], column) -> Tuple[str, str, List[Any]]:
+        """Keyset WHERE fragment, ORDER BY and cursor params for a sort order
+
+        ``column`` maps a row key (e.g. "hourly_rate") to its SQL expression.
+        """
+        key, direction, cast = SORTS[sort]
+        clauses = ""
+        params = []
+
+        if key in NULLABLE_SORT_KEYS:
+            clauses += f" AND {column(key)} IS NOT NULL"
+
+        # Resume after the last row of the previous page
+        if cursor:
+            value, last_id = decode_cursor(cursor, 2)
+            try:
+                params = [CURSOR_VALUE_TYPES[key](value), str(uuid.UUID(last_id))]
+            except (TypeError, ValueError, AttributeError, ArithmeticError):
+                raise ValueError("Invalid cursor")
+            operator = "<" if direction == "DESC" else ">"
+            clauses += f" AND ({column(key)}, {column('id')}) {operator} (%s{cast}, %s::uuid)"
+
+        order_by = f" ORDER BY {column(key)} {direction}, {column('id')} {direction}"
+        return clauses, order_by, params
+
+    @staticmethod
+    def _page(rows: List[Dict[str, Any]], limit: int, sort: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Trim the extra row fetched past ``limit`` and build the next page's cursor from the last row"""
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        key = SORTS[sort][0]
+        return rows, encode_cursor([rows[-1][key], rows[-1]["id"]])
+
     def get_all_accounts(
         self,
         account_type: Optional[str] = None,
         tags: Optional[List[str]] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        ranges: Optional[Dict[str, float]] = None,
+        sort: str = "created_at",
+        near: Optional[Dict[str, float]] = None,
+        available: Optional[List[Tuple[int, int]]] = None,
+        tags_mode: str = "any",
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of accounts with optional filters, newest first (or by rate/budget, lowest
+        first, or nearest first)
+
+        Returns the page and the cursor for the next page (None on the last page).
+        """
+        query, params = self._list_statement(
+            account_type, tags, limit, cursor, fields, ranges, sort, near, available, tags_mode
+        )
+
+        with self.db.cursor(cursor_factory=RealDictCursor) as db_cursor:
+            # Proximity queries inline the search center, so each one is a new statement
+            if near:
+                db_cursor.execute(query, params)
+            else:
+                db_cursor.execute(*prepared(db_cursor, query, params))
+            rows = db_cursor.fetchall()
+
+        return self._page(rows, limit, sort)
+
+    def _list_statement(
+        self, account_type, tags, limit, cursor, fields, ranges, sort, near, available, tags_mode
+    ) -> Tuple[str, List[Any]]:
+        """SQL and parameters of one get_all_accounts page (shared with the async queries)"""
+        self._validate_sort(sort, LIST_SORTS, near)
+        columns, joins, distances = self._select_columns(fields, ranges, sort, near)
+
+        filters, params = self._build_filters(account_type, tags, ranges, near, available, tags_mode)
+        keyset, order_by, keyset_params = self._sort_clauses(
+            sort, cursor, lambda key: distances.get(key) or ACCOUNT_FIELD_COLUMNS[key][0]
+        )
+
+        # Fetch one extra row to know whether another page exists
+        query = f"SELECT {columns} {joins} WHERE 1=1 {filters}{keyset}{order_by} LIMIT %s"
+        return query, params + keyset_params + [limit + 1]
+
+    def iter_accounts(
+        self,
+        account_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        fields: Optional[Tuple[str, ...]] = None,
+        ranges: Optional[Dict[str, float]] = None,
+        sort: str = "created_at",
+        near: Optional[Dict[str, float]] = None,
+        available: Optional[List[Tuple[int, int]]] = None,
+        tags_mode: str = "any",
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield every matching account, in list order, through a named server-side cursor
+
+        Only `batch_size` rows are held in memory at a time, however many rows match.
+        """
+        query, params = self._stream_statement(account_type, tags, fields, ranges, sort, near, available, tags_mode)
+
+        with self.db.cursor(name=f"stream_accounts_{uuid.uuid4().hex}", cursor_factory=RealDictCursor) as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(query, params)
+            yield from cursor
+
+    def _stream_statement(
+        self, account_type, tags, fields, ranges, sort, near, available, tags_mode
+    ) -> Tuple[str, List[Any]]:
+        """SQL and parameters of iter_accounts: the list query without paging"""
+        self._validate_sort(sort, LIST_SORTS, near)
+        columns, joins, distances = self._select_columns(fields, ranges, sort, near)
+        filters, params = self._build_filters(account_type, tags, ranges, near, available, tags_mode)
+        not_null, order_by, _ = self._sort_clauses(
+            sort, None, lambda key: distances.get(key) or ACCOUNT_FIELD_COLUMNS[key][0]
+        )
+        return f"SELECT {columns} {joins} WHERE 1=1 {filters}{not_null}{order_by}", params
+
+    def search_accounts(
+        self,
+        q: str,
+        account_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        ranges: Optional[Dict[str, float]] = None,
+        sort: str = "relevance",
+        near: Optional[Dict[str, float]] = None,
+        available: Optional[List[Tuple[int, int]]] = None,
+        tags_mode: str = "any",
+        prefix: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Full-text search over name, email, tags and city, best matches first (or in a list order)
+
+        With ``prefix`` the last word of ``q`` also matches longer words ("plu"
+        finds "plumber"). Returns the page and the cursor for the next page
+        (None on the last page).
+        """
+        query, params = self._search_statement(
+            q, account_type, tags, limit, cursor, fields, ranges, sort, near, available, tags_mode, prefix
+        )
+
+        with self.db.cursor(cursor_factory=RealDictCursor) as db_cursor:
+            db_cursor.execute(query, params)
+            rows = db_cursor.fetchall()
+
+        return self._page(rows, limit, sort)
+
+    def _search_statement(
+        self, q, account_type, tags, limit, cursor, fields, ranges, sort, near, available, tags_mode, prefix=False
+    ) -> Tuple[str, List[Any]]:
+        """SQL and parameters of one search_accounts page (shared with the async queries)"""
+        self._validate_sort(sort, SEARCH_SORTS, near)
+        columns, joins, _ = self._select_columns(fields, ranges, sort, near)
+
+        filters, filter_params = self._build_filters(account_type, tags, ranges, near, available, tags_mode)
+        keyset, order_by, keyset_params = self._sort_clauses(sort, cursor, lambda key: f"ranked.{key}")
+        tsquery = "to_tsquery('simple', %s)" if prefix else "websearch_to_tsquery('simple', %s)"
+
+        # Fetch one extra row to know whether another page exists
+        query = f"""
+            SELECT * FROM (
+                SELECT {columns},
+                       ts_rank_cd(a.search_vector, tsq) AS rank
+                {joins}
+                CROSS JOIN {tsquery} tsq
+                WHERE a.search_vector @@ tsq {filters}
+            ) ranked
+            WHERE 1=1 {keyset}
+            {order_by}
+            LIMIT %s
+        """
+        q = prefix_tsquery(q) if prefix else q
+        return query, [q] + filter_params + keyset_params + [limit + 1]
+
+    def suggest_accounts(
+        self,
+        q: str,
+        account_type: Optional[str] = None,
+        limit: int = 10,
+        threshold: float = 0.3,
     ) -> List[Dict[str, Any]]:
-        """Get all accounts with optional filters"""
+        """Typo-tolerant prefix matches on name and email for typeahead
+
+        Uses pg_trgm word similarity so partial words ("ali") and small typos
+        ("alcie") still match; only rows scoring at least `threshold` are returned.
+        """
         with self.db.cursor(cursor_factory=RealDictCursor) as cursor:
             query = """
-                SELECT a.*,
-                       sp.hourly_rate, sp.availability,
-                       sc.preferred_budget, sc.service_history
+                SELECT set_config('pg_trgm.word_similarity_threshold', %s, true);
+                SELECT a.id, a.name, a.account_type,
+                       GREATEST(word_similarity(%s, a.name), word_similarity(%s, a.email)) AS score
                 FROM accounts a
-                LEFT JOIN service_providers sp ON a.id = sp.account_id
-                LEFT JOIN service_consumers sc ON a.id = sc.account_id
-                WHERE 1=1
+                WHERE (%s <%% a.name OR %s <%% a.email)
             """
-            params = []
+            params = [str(threshold), q, q, q, q]
 
-            # Filter by account type
             if account_type:
                 query += " AND a.account_type = %s"
                 params.append(account_type)
 
-            # Filter by tags (accounts that have ANY of the specified tags)
-            if tags:
-                query += " AND a.tags && %s"
-                params.append(tags)
+            query += " ORDER BY score DESC, a.name LIMIT %s"
+            params.append(limit)
+
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def get_tag_facets(
+        self,
+        account_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        q: Optional[str] = None,
+        limit: int = 20,
+        tags_mode: str = "any",
+    ) -> List[Dict[str, Any]]:
+        """Most common tags with account counts for the given filters
+
+        Unfiltered (or type-only) counts come from the trigger-maintained tag_counts
+        table; tag and text filters fall back to aggregating the matching accounts.
+        """
+        with self.db.cursor(cursor_factory=RealDictCursor) as cursor:
+            if not tags and not q:
+                query = "SELECT tag, SUM(count)::bigint AS count FROM tag_counts"
+                params = []
+                if account_type:
+                    query += " WHERE account_type = %s"
+                    params.append(account_type)
+                query += " GROUP BY tag HAVING SUM(count) > 0"
+            else:
+                filters, params = self._build_filters(account_type, tags, tags_mode=tags_mode)
+                query = f"""
+                    SELECT t.tag, COUNT(DISTINCT a.id) AS count
+                    FROM accounts a
+                    CROSS JOIN LATERAL unnest(a.tags) AS t(tag)
+                    WHERE 1=1 {filters}
+                """
+                if q:
+                    query += " AND a.search_vector @@ websearch_to_tsquery('simple', %s)"
+                    params.append(q)
+                query += " GROUP BY t.tag"
 
-            query += " ORDER BY a.created_at DESC"
+            query += " ORDER BY count DESC, tag LIMIT %s"
+            params.append(limit)
 
             cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            return cursor.fetchall()
+
+    def get_account_by_id(
+        self, account_id: str, fields: Optional[Tuple[str, ...]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get account by ID with all related data (read-through cached)
+
+        With ``fields`` a cache miss reads only those columns, and the partial
+        row is not cached.
+        """
+        if not is_valid_id(account_id):
+            return None
+
+        cache = get_account_cache()
+        key = str(account_id).lower()
+
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        if fields:
+            columns, joins = account_projection(fields)
+            with self.db.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(*prepared(cursor, f"SELECT {columns} {joins} WHERE a.id = %s", [account_id]))
+                result = cursor.fetchone()
+            return dict(result) if result else None
 
-    def get_account_by_id(self, account_id: str) -> Optional[Dict[str, Any]]:
-        """Get account by ID with all related data"""
+        generation = cache.generation
         with self.db.cursor(cursor_factory=RealDictCursor) as cursor:
-            query = """
-                SELECT a.*,
-                       sp.hourly_rate, sp.availability,
-                       sc.preferred_budget, sc.service_history
-                FROM accounts a
-                LEFT JOIN service_providers sp ON a.id = sp.account_id
-                LEFT JOIN service_consumers sc ON a.id = sc.account_id
-                WHERE a.id = %s
-            """
-            cursor.execute(query, [account_id])
+            cursor.execute(*prepared(cursor, ACCOUNT_BY_ID_QUERY, [account_id]))
             result = cursor.fetchone()
-            return dict(result) if result else None
 
-    def delete_account_by_id(self, account_id: str) -> bool:
-        """Delete account by ID (CASCADE will handle related tables)"""
-        with self.db.cursor() as cursor:
-            cursor.execute("DELETE FROM accounts WHERE id = %s", [account_id])
+        if not result:
+            return None
+
+        account = dict(result)
+        cache.set(key, account, generation)
+        return account
+
+    def get_account_version(self, account_id: str) -> Optional[Dict[str, Any]]:
+        """Primary-key lookup of an account's type and updated_at, enough to check an ETag"""
+        if not is_valid_id(account_id):
+            return None
+
+        with self.db.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(*prepared(cursor, ACCOUNT_VERSION_QUERY, [account_id]))
+            result = cursor.fetchone()
+        return dict(result) if result else None
+
+    def get_change_version(self) -> int:
+        """Counter bumped by every committed write to accounts (see migration 006)
+
+        Read it before the data it versions: a write committed in between then
+        only makes the ETag stale, never the cached body.
+        """
+        with self.db.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(CHANGE_VERSION_QUERY)
+            result = cursor.fetchone()
+        return result["version"] if result else 0
+
+    def get_account_type(self, account_id: str) -> Optional[str]:
+        """Primary-key lookup of an account's type (None if it does not exist)
+
+        Used only after a type-guarded write matched nothing, to tell a missing
+        account apart from one of the wrong type.
+        """
+        version = self.get_account_version(account_id)
+        return version["account_type"] if version else None
+
+    @staticmethod
+    def _evict_cached_account(account_id: str) -> None:
+        """Drop this worker's cached copy; call after committing"""
+        get_account_cache().invalidate(str(account_id).lower())
+
+    @staticmethod
+    def _cache_written_account(account: Dict[str, Any]) -> None:
+        """Replace this worker's cached copy with the row a write just returned"""
+        cache = get_account_cache()
+        key = str(account["id"]).lower()
+        cache.invalidate(key)
+        cache.set(key, account, cache.generation)
+
+    def _execute_write(self, query: str, params: List[Any], invalidate_id: Optional[str] = None):
+        """Run a write (plus the cache invalidation NOTIFY) in one round-trip and commit
+
+        The write runs as a prepared statement. Returns the first row of its
+        result, or None.
+        """
+        try:
+            with self.db.cursor(cursor_factory=RealDictCursor) as cursor:
+                query, params = prepared(cursor, query, params)
+                if invalidate_id is not None:
+                    notify_sql, notify_params = invalidation_statement(str(invalidate_id).lower())
+                    query = notify_sql + query
+                    params = notify_params + params
+
+                cursor.execute(query, params)
+                result = cursor.fetchone() if cursor.description else None
             self.db.commit()
-            return cursor.rowcount > 0
+        except Exception:
+            self.db.rollback()
+            raise
 
-    # ============ SERVICE PROVIDER OPERATIONS ============
+        return dict(result) if result else None
 
-    def create_service_provider(
+    @staticmethod
+    def _account_result_sql(account_type: str) -> str:
+        """Final SELECT joining the `a` and `subtype` CTEs into a full account row"""
+        subtype = SUBTYPES[account_type]
+        subtype_columns = ", ".join(f"s.{column}" for column in subtype["columns"])
+        account_columns = ", ".join(f"a.{column}" for column in ACCOUNT_BASE_COLUMNS.split(", "))
+        return f"""
+            SELECT {account_columns}, {subtype_columns}, {subtype["other"]}
+            FROM a JOIN subtype s ON s.account_id = a.id
+        """
+
+    @staticmethod
+    def _history_preview(entries: List) -> Optional[List]:
+        """The service_history value an account read would return after writing ``entries``"""
+        return entries[-SERVICE_HISTORY_PREVIEW_SIZE:] or None
+
+    def _create_account(
         self,
+        account_type: str,
         name: str,
         email: str,
         address: Dict,
-        tags: Optional[List[str]] = None,
-        hourly_rate: Optional[float] = None,
-        availability: Optional[Dict] = None,
-    ) -> str:
-        """Create a new service provider account"""
-        account_id = str(uuid.uuid4())
+        tags: Optional[List[str]],
+        subtype_values: List,
+        history: Optional[List] = None,
+    ) -> Dict[str, Any]:
+        """Insert an account, its subtype row and any service history, returning the full account in one statement"""
+        subtype = SUBTYPES[account_type]
+        subtype_list = ", ".join(subtype["columns"])
+        placeholders = ", ".join(["%s"] * len(subtype["columns"]))
+        history_cte = f", history AS ({SERVICE_HISTORY_INSERT})" if history else ""
 
-        with self.db.cursor() as cursor:
-            # Insert into accounts table
-            cursor.execute(
-                """
-                INSERT INTO accounts (id, name, email, address, tags, account_type)
-                VALUES (%s, %s, %s, %s, %s, 'service_provider')
-            """,
-                [account_id, name, email, Json(address), tags or []],
-            )
+        query = f"""
+            WITH a AS (
+                INSERT INTO accounts (name, email, address, tags, account_type)
+                VALUES (%s, %s, %s, %s, %s)
+                RETURNING {ACCOUNT_BASE_COLUMNS}
+            ),
+            subtype AS (
+                INSERT INTO {subtype["table"]} (account_id, {subtype_list})
+                SELECT id, {placeholders} FROM a
+                RETURNING account_id, {subtype_list}
+            ){history_cte}
+            {self._account_result_sql(account_type)}
+        """
+        params = [name, email, Json(address), tags or [], account_type] + subtype_values
+        if history:
+            params.append(Json(history))
 
-            # Insert into service_providers table
-            cursor.execute(
-                """
-                INSERT INTO service_providers (account_id, hourly_rate, availability)
-                VALUES (%s, %s, %s)
-            """,
-                [account_id, hourly_rate, Json(availability) if availability else None],
-            )
+        account = self._execute_write(query, params)
+        if account_type == "service_consumer":
+            # The statement's own inserts are not visible to its preview subquery
+            account["service_history"] = self._history_preview(history or [])
 
-            self.db.commit()
+        self._cache_written_account(account)
+        return account
 
-        return account_id
-
-    def update_service_provider(self, account_id: str, **updates) -> bool:
-        """Update service provider account"""
-        with self.db.cursor() as cursor:
-            # Update accounts table if basic fields are provided
-            account_updates = {k: v for k, v in updates.items() if k in ["name", "email", "address", "tags"]}
-
-            if account_updates:
-                # Convert address to Json if provided
-                if "address" in account_updates:
-                    account_updates["address"] = Json(account_updates["address"])
-
-                set_clause = ", ".join([f"{k} = %s" for k in account_updates.keys()])
-                values = list(account_updates.values()) + [account_id]
-                cursor.execute(
-                    f"""
-                    UPDATE accounts
-                    SET {set_clause}, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """,
-                    values,
-                )
+    def _update_account(
+        self,
+        account_type: str,
+        account_id: str,
+        updates: Dict[str, Any],
+        subtype_json_fields: List[str],
+        history: Optional[List] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Update an account and/or its subtype row, returning the full account in one statement
 
-            # Update service_providers table if provider-specific fields are provided
-            provider_updates = {k: v for k, v in updates.items() if k in ["hourly_rate", "availability"]}
-
-            if provider_updates:
-                # Convert availability to Json if provided
-                if "availability" in provider_updates:
-                    provider_updates["availability"] = Json(provider_updates["availability"])
-
-                set_clause = ", ".join([f"{k} = %s" for k in provider_updates.keys()])
-                values = list(provider_updates.values()) + [account_id]
-                cursor.execute(
-                    f"""
-                    UPDATE service_providers
-                    SET {set_clause}, updated_at = CURRENT_TIMESTAMP
-                    WHERE account_id = %s
-                """,
-                    values,
-                )
+        The write is guarded by ``account_type`` and the subtype update only
+        touches the row of the account matched by `a`, so no existence check is
+        needed beforehand. A ``history`` list replaces the service history.
+        Returns None if no account of that type has this id.
+        """
+        if not is_valid_id(account_id):
+            return None
 
-            self.db.commit()
-            return True
+        subtype = SUBTYPES[account_type]
+        subtype_list = ", ".join(subtype["columns"])
+        params = []
+
+        # Update accounts table if basic fields are provided
+        account_updates = {k: v for k, v in updates.items() if k in ["name", "email", "address", "tags"]}
+        if "address" in account_updates:
+            account_updates["address"] = Json(account_updates["address"])
+
+        # Update the subtype table if type-specific fields are provided
+        subtype_updates = {k: v for k, v in updates.items() if k in subtype["columns"]}
+        for field in subtype_json_fields:
+            if field in subtype_updates:
+                subtype_updates[field] = Json(subtype_updates[field])
+
+        # accounts.updated_at is bumped on any change (it drives the account ETag)
+        if account_updates or subtype_updates or history is not None:
+            set_clause = "".join([f"{k} = %s, " for k in account_updates.keys()])
+            account_cte = f"""
+                UPDATE accounts
+                SET {set_clause}updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s AND account_type = %s
+                RETURNING {ACCOUNT_BASE_COLUMNS}
+            """
+            params += list(account_updates.values()) + [account_id, account_type]
+        else:
+            account_cte = f"SELECT {ACCOUNT_BASE_COLUMNS} FROM accounts WHERE id = %s AND account_type = %s"
+            params += [account_id, account_type]
+
+        if subtype_updates:
+            set_clause = ", ".join([f"{k} = %s" for k in subtype_updates.keys()])
+            subtype_cte = f"""
+                UPDATE {subtype["table"]}
+                SET {set_clause}, updated_at = CURRENT_TIMESTAMP
+                WHERE account_id IN (SELECT id FROM a)
+                RETURNING account_id, {subtype_list}
+            """
+            params += list(subtype_updates.values())
+        else:
+            subtype_cte = f"SELECT account_id, {subtype_list} FROM {subtype['table']} WHERE account_id IN (SELECT id FROM a)"
+
+        history_ctes = ""
+        if history is not None:
+            history_ctes = f""",
+            cleared AS (DELETE FROM service_history_entries WHERE consumer_id IN (SELECT id FROM a)),
+            history AS ({SERVICE_HISTORY_INSERT})"""
+            params.append(Json(history))
+
+        query = f"""
+            WITH a AS ({account_cte}),
+            subtype AS ({subtype_cte}){history_ctes}
+            {self._account_result_sql(account_type)}
+        """
+
+        account = self._execute_write(query, params, invalidate_id=account_id)
+        if account is None:
+            self._evict_cached_account(account_id)
+            return None
+
+        if history is not None:
+            account["service_history"] = self._history_preview(history)
+
+        self._cache_written_account(account)
+        return account
+
+    def delete_account_by_id(self, account_id: str, account_type: Optional[str] = None) -> bool:
+        """Delete account by ID, optionally only if it has the given type (CASCADE will handle related tables)"""
+        if not is_valid_id(account_id):
+            return False
+
+        query = "DELETE FROM accounts WHERE id = %s"
+        params = [account_id]
+        if account_type:
+            query += " AND account_type = %s"
+            params.append(account_type)
+        query += " RETURNING id"
+
+        deleted = self._execute_write(query, params, account_id)
+        self._evict_cached_account(account_id)
+        return deleted is not None
+
+    # ============ SERVICE PROVIDER OPERATIONS ============
+
+    def create_service_provider(
+        self,
+        name: str,
+        email: str,
+        address: Dict,
+        tags: Optional[List[str]] = None,
+        hourly_rate: Optional[float] = None,
+        availability: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        """Create a new service provider account and return it"""
+        return self._create_account(
+            "service_provider",
+            name,
+            email,
+            address,
+            tags,
+            [hourly_rate, Json(availability) if availability else None],
+        )
+
+    def update_service_provider(self, account_id: str, **updates) -> Optional[Dict[str, Any]]:
+        """Update service provider account and return it (None if it does not exist)"""
+        return self._update_account("service_provider", account_id, updates, ["availability"])
 
     # ============ SERVICE CONSUMER OPERATIONS ============
 
@@ -158,89 +949,195 @@ class AccountQueries:
         tags: Optional[List[str]] = None,
         preferred_budget: Optional[float] = None,
         service_history: Optional[List] = None,
-    ) -> str:
-        """Create a new service consumer account"""
-        account_id = str(uuid.uuid4())
+    ) -> Dict[str, Any]:
+        """Create a new service consumer account and return it"""
+        return self._create_account(
+            "service_consumer",
+            name,
+            email,
+            address,
+            tags,
+            [preferred_budget],
+            history=service_history,
+        )
 
-        with self.db.cursor() as cursor:
-            # Insert into accounts table
-            cursor.execute(
-                """
-                INSERT INTO accounts (id, name, email, address, tags, account_type)
-                VALUES (%s, %s, %s, %s, %s, 'service_consumer')
-            """,
-                [account_id, name, email, Json(address), tags or []],
-            )
+    def update_service_consumer(self, account_id: str, **updates) -> Optional[Dict[str, Any]]:
+        """Update service consumer account and return it (None if it does not exist)
 
-            # Insert into service_consumers table
-            cursor.execute(
-                """
-                INSERT INTO service_consumers (account_id, preferred_budget, service_history)
-                VALUES (%s, %s, %s)
-            """,
-                [account_id, preferred_budget, Json(service_history or [])],
-            )
+        A ``service_history`` list replaces the whole history.
+        """
+        history = (updates["service_history"] or []) if "service_history" in updates else None
+        return self._update_account("service_consumer", account_id, updates, [], history=history)
 
-            self.db.commit()
+    def add_service_to_consumer_history(self, account_id: str, service_data: Dict) -> Optional[Dict[str, Any]]:
+        """Add a service to consumer's service history and return the updated account
 
-        return account_id
-
-    def update_service_consumer(self, account_id: str, **updates) -> bool:
-        """Update service consumer account"""
-        with self.db.cursor() as cursor:
-            # Update accounts table if basic fields are provided
-            account_updates = {k: v for k, v in updates.items() if k in ["name", "email", "address", "tags"]}
-
-            if account_updates:
-                # Convert address to Json if provided
-                if "address" in account_updates:
-                    account_updates["address"] = Json(account_updates["address"])
-
-                set_clause = ", ".join([f"{k} = %s" for k in account_updates.keys()])
-                values = list(account_updates.values()) + [account_id]
-                cursor.execute(
-                    f"""
-                    UPDATE accounts
-                    SET {set_clause}, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """,
-                    values,
-                )
+        The entry is a single-row insert, whatever the length of the history.
+        Returns None if no service consumer has this id.
+        """
+        if not is_valid_id(account_id):
+            return None
 
-            # Update service_consumers table if consumer-specific fields are provided
-            consumer_updates = {k: v for k, v in updates.items() if k in ["preferred_budget", "service_history"]}
-
-            if consumer_updates:
-                # Convert service_history to Json if provided
-                if "service_history" in consumer_updates:
-                    consumer_updates["service_history"] = Json(consumer_updates["service_history"])
-
-                set_clause = ", ".join([f"{k} = %s" for k in consumer_updates.keys()])
-                values = list(consumer_updates.values()) + [account_id]
-                cursor.execute(
-                    f"""
-                    UPDATE service_consumers
-                    SET {set_clause}, updated_at = CURRENT_TIMESTAMP
-                    WHERE account_id = %s
-                """,
-                    values,
-                )
+        query = f"""
+            WITH a AS (
+                UPDATE accounts SET updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s AND account_type = 'service_consumer'
+                RETURNING {ACCOUNT_BASE_COLUMNS}
+            ),
+            subtype AS (
+                SELECT account_id, preferred_budget FROM service_consumers
+                WHERE account_id IN (SELECT id FROM a)
+            ),
+            history AS ({SERVICE_HISTORY_INSERT})
+            {self._account_result_sql("service_consumer")}
+        """
 
-            self.db.commit()
-            return True
+        account = self._execute_write(query, [account_id, Json([service_data])], invalidate_id=account_id)
+        if account is None:
+            self._evict_cached_account(account_id)
+            return None
 
-    def add_service_to_consumer_history(self, account_id: str, service_data: Dict) -> bool:
-        """Add a service to consumer's service history"""
-        with self.db.cursor() as cursor:
-            cursor.execute(
-                """
-                UPDATE service_consumers
-                SET service_history = service_history || %s::jsonb,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE account_id = %s
-            """,
-                [Json([service_data]), account_id],
-            )
+        # The preview was read before this statement's insert
+        account["service_history"] = self._history_preview((account["service_history"] or []) + [service_data])
+
+        self._cache_written_account(account)
+        return account
+
+    def get_service_history(
+        self, account_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One page of a consumer's service history, oldest first
+
+        Returns the page and the cursor for the next page (None on the last page).
+        """
+        if not is_valid_id(account_id):
+            return [], None
+
+        with self.db.cursor(cursor_factory=RealDictCursor) as db_cursor:
+            query = """
+                SELECT seq, payload, added_at FROM service_history_entries
+                WHERE consumer_id = %s
+            """
+            params = [account_id]
+
+            # Resume after the last entry of the previous page
+            if cursor:
+                (last_seq,) = decode_cursor(cursor, 1)
+                if not isinstance(last_seq, int):
+                    raise ValueError("Invalid cursor")
+                query += " AND seq > %s"
+                params.append(last_seq)
+
+            # Fetch one extra row to know whether another page exists
+            query += " ORDER BY seq LIMIT %s"
+            params.append(limit + 1)
+
+            db_cursor.execute(query, params)
+            rows = db_cursor.fetchall()
 
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1]["seq"]])
+
+        return rows, next_cursor
+
+    # ============ BATCH OPERATIONS ============
+
+    def _create_accounts_batch(
+        self,
+        account_type: str,
+        subtype_table: str,
+        subtype_columns: List[str],
+        subtype_casts: List[str],
+        rows: List[List[Any]],
+        with_history: bool = False,
+    ) -> Dict[str, str]:
+        """Insert accounts and their subtype rows with multi-row statements in one transaction
+
+        Each row is [name, email, address, tags, *subtype values], followed by a
+        JSON array of service history entries when ``with_history`` is set. Rows
+        whose email already exists are skipped. Returns {email: new account id}
+        for inserted rows.
+        """
+        values = [[str(uuid.uuid4())] + row for row in rows]
+        subtype_list = ", ".join(subtype_columns)
+        subtype_select = ", ".join(f"input.{column}" for column in subtype_columns)
+        casts = subtype_casts + (["jsonb"] if with_history else [])
+        template = "(%s::uuid, %s, %s, %s::jsonb, %s::text[], " + ", ".join(f"%s::{c}" for c in casts) + ")"
+
+        input_columns = f"id, name, email, address, tags, {subtype_list}" + (", service_history" if with_history else "")
+        history_cte = ""
+        if with_history:
+            history_cte = """,
+            history AS (
+                INSERT INTO service_history_entries (consumer_id, payload)
+                SELECT input.id, e.value
+                FROM input JOIN inserted USING (id)
+                CROSS JOIN LATERAL jsonb_array_elements(input.service_history) WITH ORDINALITY AS e(value, ord)
+                ORDER BY input.id, e.ord
+            )"""
+
+        query = f"""
+            WITH input ({input_columns}) AS (VALUES %s),
+            inserted AS (
+                INSERT INTO accounts (id, name, email, address, tags, account_type)
+                SELECT id, name, email, address, tags, '{account_type}' FROM input
+                ON CONFLICT (email) DO NOTHING
+                RETURNING id, email
+            ),
+            subtype AS (
+                INSERT INTO {subtype_table} (account_id, {subtype_list})
+                SELECT input.id, {subtype_select} FROM input JOIN inserted USING (id)
+            ){history_cte}
+            SELECT id, email FROM inserted
+        """
+
+        try:
+            with self.db.cursor(cursor_factory=RealDictCursor) as cursor:
+                tags = [tag for row in rows for tag in (row[3] or [])]
+                if tags:
+                    cursor.execute(ADD_TAGS_QUERY, [tags])
+                inserted = execute_values(
+                    cursor, query, values, template=template, page_size=BATCH_INSERT_PAGE_SIZE, fetch=True
+                )
             self.db.commit()
-            return cursor.rowcount > 0
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return {row["email"]: row["id"] for row in inserted}
+
+    def create_service_providers_batch(self, providers: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Create many service providers at once; returns {email: account id} for created rows"""
+        rows = [
+            [
+                p["name"],
+                p["email"],
+                Json(p["address"]),
+                p.get("tags") or [],
+                p.get("hourly_rate"),
+                Json(p["availability"]) if p.get("availability") else None,
+            ]
+            for p in providers
+        ]
+        return self._create_accounts_batch(
+            "service_provider", "service_providers", ["hourly_rate", "availability"], ["numeric", "jsonb"], rows
+        )
+
+    def create_service_consumers_batch(self, consumers: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Create many service consumers at once; returns {email: account id} for created rows"""
+        rows = [
+            [
+                c["name"],
+                c["email"],
+                Json(c["address"]),
+                c.get("tags") or [],
+                c.get("preferred_budget"),
+                Json(c.get("service_history") or []),
+            ]
+            for c in consumers
+        ]
+        return self._create_accounts_batch(
+            "service_consumer", "service_consumers", ["preferred_budget"], ["numeric"], rows, with_history=True
+        )
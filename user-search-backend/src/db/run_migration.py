@@ -6,9 +6,39 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+
+
+def get_migration_files():
+    """Migration files in the order they must be applied"""
+    return sorted(f for f in os.listdir(MIGRATIONS_DIR) if f.endswith(".sql"))
+
+
+def get_applied_migrations(cursor):
+    """Create the bookkeeping table if needed and return applied migration names"""
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            name TEXT PRIMARY KEY,
+            applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        );
+    """
+    )
+    cursor.execute("SELECT name FROM schema_migrations")
+    applied = {row[0] for row in cursor.fetchall()}
+
+    # Databases created before migrations were tracked already have the initial schema
+    if not applied:
+        cursor.execute("SELECT to_regclass('public.accounts') IS NOT NULL")
+        if cursor.fetchone()[0]:
+            cursor.execute("INSERT INTO schema_migrations (name) VALUES ('001_create_accounts_schema.sql')")
+            applied.add("001_create_accounts_schema.sql")
+
+    return applied
+
 
 def run_migration():
-    """Run the initial database migration"""
+    """Apply all pending database migrations"""
 
     # Database connection parameters
     conn_params = {
@@ -19,21 +49,30 @@ def run_migration():
         "password": os.getenv("DB_PASSWORD"),
     }
 
-    # Read the migration file
-    migration_file = os.path.join(os.path.dirname(__file__), "migrations", "001_create_accounts_schema.sql")
-
     try:
-        with open(migration_file, "r") as f:
-            migration_sql = f.read()
-
-        # Connect and execute
         conn = psycopg2.connect(**conn_params)
         conn.autocommit = True
 
         with conn.cursor() as cursor:
-            cursor.execute(migration_sql)
+            applied = get_applied_migrations(cursor)
+
+        pending = [name for name in get_migration_files() if name not in applied]
+        if not pending:
+            print("Database schema is up to date.")
+
+        for name in pending:
+            with open(os.path.join(MIGRATIONS_DIR, name), "r") as f:
+                migration_sql = f.read()
+
+            # Each migration and its bookkeeping row commit together
+            conn.autocommit = False
+            with conn.cursor() as cursor:
+                cursor.execute(migration_sql)
+                cursor.execute("INSERT INTO schema_migrations (name) VALUES (%s)", [name])
+            conn.commit()
+            conn.autocommit = True
 
-        print("Database schema created successfully!")
+            print(f"Applied migration {name}")
 
         # Verify tables were created
         with conn.cursor() as cursor:
@@ -1,13 +1,149 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import random
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
 logger = logging.getLogger("user-search-backend")
 
+# "text": coloured lines written by the logging thread (development);
+# "json": one JSON object per line, written by a background thread (production)
+LOG_FORMAT_ENV = "LOG_FORMAT"
+# Level of the app logger (the root logger stays at WARNING)
+LOG_LEVEL_ENV = "LOG_LEVEL"
+# Fraction of DEBUG records kept, e.g. 0.01 keeps one in a hundred
+LOG_DEBUG_SAMPLE_RATE_ENV = "LOG_DEBUG_SAMPLE_RATE"
+
+TEXT_FORMAT = "\033[91m[%(asctime)s]\033[0m \033[92m[%(filename)s:%(lineno)d]\033[0m \033[93m%(levelname)s\033[0m - %(message)s"
+TEXT_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+# Ids accepted from an X-Request-ID header; anything else is replaced by a fresh id
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed with extra= and goes into the JSON record
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "request_id"}
+
+_listener: Optional[QueueListener] = None
+_configured = False
+
+
+def set_request_id(header_value: Optional[str] = None) -> str:
+    """Correlate the records logged in the current context (one request) under one id
+
+    Uses the caller's X-Request-ID when it is a sane id, else generates one.
+    """
+    request_id = header_value if header_value and _REQUEST_ID.match(header_value) else uuid.uuid4().hex
+    _request_id.set(request_id)
+    return request_id
+
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the current request id (a handler filter, so it runs in the thread that logs)"""
+
+    def filter(self, record):
+        record.request_id = _request_id.get()
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """Keeps a ``rate`` fraction of DEBUG (and lower) records, and every record above DEBUG"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, source, request id and extras"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "source": f"{record.filename}:{record.lineno}",
+            "thread": record.threadName,
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class LocalQueueHandler(QueueHandler):
+    """Enqueues records as they are, leaving all formatting to the listener thread
+
+    The queue stays in this process, so the record (and its exc_info) needs no
+    pickling; only the message is resolved here, since its args may change.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()  # drains the queue
+        _listener = None
+
 
 def setup_logging():
-    logging.basicConfig(
-        level=logging.WARNING,
-        format="\033[91m[%(asctime)s]\033[0m \033[92m[%(filename)s:%(lineno)d]\033[0m \033[93m%(levelname)s\033[0m - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    logger.setLevel("DEBUG")
+    """Configure the root handler once per process (see LOG_FORMAT)
+
+    In JSON mode the request thread only filters and enqueues records; a
+    QueueListener thread formats and writes them to stderr.
+    """
+    global _configured, _listener
+    if _configured:
+        return logger
+    _configured = True
+
+    sample_rate = float(os.getenv(LOG_DEBUG_SAMPLE_RATE_ENV, "1"))
+    filters = [RequestIdFilter()]
+    if sample_rate < 1:
+        filters.insert(0, DebugSampler(sample_rate))
+
+    if os.getenv(LOG_FORMAT_ENV, "text").lower() == "json":
+        stream = logging.StreamHandler(sys.stderr)
+        stream.setFormatter(JsonFormatter())
+        handler = LocalQueueHandler(queue.SimpleQueue())
+        _listener = QueueListener(handler.queue, stream, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_stop_listener)
+    else:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT, datefmt=TEXT_DATEFMT))
+
+    for log_filter in filters:
+        handler.addFilter(log_filter)
+    logging.basicConfig(level=logging.WARNING, handlers=[handler])
+    logger.setLevel(os.getenv(LOG_LEVEL_ENV, "DEBUG").upper())
     return logger
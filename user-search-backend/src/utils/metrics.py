@@ -0,0 +1,189 @@
+import bisect
+import threading
+from typing import Any, Dict, List, Tuple
+
+# Histogram upper bounds (the +Inf bucket is implicit)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+
+class Histogram:
+    """Bucket counts (not cumulative; the last one is +Inf), sum and count"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: "Histogram"):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.sum += other.sum
+        self.count += other.count
+
+
+class RouteStats:
+    """Everything recorded for one (route, method)"""
+
+    __slots__ = ("statuses", "latency", "size", "db_seconds", "db_queries")
+
+    def __init__(self):
+        self.statuses = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.db_seconds = Histogram(LATENCY_BUCKETS)
+        self.db_queries = Histogram(QUERY_COUNT_BUCKETS)
+
+    def merge(self, other: "RouteStats"):
+        for status, count in list(other.statuses.items()):
+            self.statuses[status] = self.statuses.get(status, 0) + count
+        for name in ("latency", "size", "db_seconds", "db_queries"):
+            getattr(self, name).merge(getattr(other, name))
+
+
+class ThreadShards:
+    """A dict per thread, written by its thread only, so updates take no lock
+
+    ``totals`` merges the dicts (values may be an update behind, never
+    corrupted); dicts of finished threads are folded into a retired total.
+    Values need a no-argument constructor and ``merge``.
+    """
+
+    def __init__(self, value_class):
+        self.value_class = value_class
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[Tuple[threading.Thread, Dict]] = []
+        self._retired: Dict[Any, Any] = {}
+
+    def local(self) -> Dict[Any, Any]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def get(self, key):
+        """This thread's value for ``key``, created on first use"""
+        shard = self.local()
+        value = shard.get(key)
+        if value is None:
+            value = shard[key] = self.value_class()
+        return value
+
+    def totals(self) -> Dict[Any, Any]:
+        totals = {}
+
+        def add(source):
+            for key, value in list(source.items()):
+                total = totals.get(key)
+                if total is None:
+                    total = totals[key] = self.value_class()
+                total.merge(value)
+
+        with self._lock:
+            alive = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                else:
+                    for key, value in list(shard.items()):
+                        self._retired.setdefault(key, self.value_class()).merge(value)
+            self._shards = alive
+
+            add(self._retired)
+            for _, shard in alive:
+                add(shard)
+        return totals
+
+
+class RequestMetrics:
+    """Per-route request metrics, recorded without locks (see ThreadShards)"""
+
+    def __init__(self):
+        self._stats = ThreadShards(RouteStats)
+
+    def observe(self, route, method, status, seconds, size=None, db_seconds=0.0, db_queries=0):
+        """Record one request; ``size`` is None when unknown (streamed bodies)"""
+        stats = self._stats.get((route, method))
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        stats.latency.observe(seconds)
+        if size is not None:
+            stats.size.observe(size)
+        stats.db_seconds.observe(db_seconds)
+        stats.db_queries.observe(db_queries)
+
+    def snapshot(self) -> Dict[Tuple[str, str], RouteStats]:
+        """Totals per (route, method) across all threads"""
+        return self._stats.totals()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_bound(bound) -> str:
+    return repr(float(bound)) if isinstance(bound, float) else str(bound)
+
+
+def _histogram_lines(name, histogram: Histogram, **labels) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.bounds, histogram.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=_format_bound(bound))} {cumulative}")
+    lines.append(f'{name}_bucket{_labels(**labels, le="+Inf")} {histogram.count}')
+    lines.append(f"{name}_sum{_labels(**labels)} {histogram.sum}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+    return lines
+
+
+HISTOGRAMS = [
+    ("latency", "http_request_duration_seconds", "Time to the response headers, by route and method"),
+    ("size", "http_response_size_bytes", "Response body size (streamed bodies excluded), by route and method"),
+    ("db_seconds", "http_request_db_seconds", "Time spent executing SQL statements per request"),
+    ("db_queries", "http_request_db_queries", "SQL statements executed per request"),
+]
+
+# Pool stats reported as gauges; every other pool stat is a lifetime counter
+POOL_GAUGES = ("min_size", "max_size", "size", "idle", "in_use", "waiting")
+
+
+def render_metrics(metrics: RequestMetrics, pool: Dict[str, Any]) -> str:
+    """Request metrics and pool stats in the Prometheus text exposition format"""
+    totals = sorted(metrics.snapshot().items())
+    lines = [
+        "# HELP http_requests_total Requests handled, by route, method and status",
+        "# TYPE http_requests_total counter",
+    ]
+    for (route, method), stats in totals:
+        for status, count in sorted(stats.statuses.items()):
+            lines.append(f"http_requests_total{_labels(route=route, method=method, status=status)} {count}")
+
+    for attribute, name, help_text in HISTOGRAMS:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (route, method), stats in totals:
+            lines += _histogram_lines(name, getattr(stats, attribute), route=route, method=method)
+
+    for key, value in pool.items():
+        if key in POOL_GAUGES:
+            name, kind = f"db_pool_{key}", "gauge"
+        else:
+            name, kind = f"db_pool_{key}" + ("" if key.endswith("_total") else "_total"), "counter"
+        lines += [f"# TYPE {name} {kind}", f"{name} {value}"]
+
+    return "\n".join(lines) + "\n"
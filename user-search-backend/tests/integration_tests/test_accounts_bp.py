@@ -1,3 +1,5 @@
+import json
+import threading
 import pytest
 from app import create_app
 from api.v1.accounts import accounts_storage
@@ -55,6 +57,16 @@ def test_create_service_consumer(client):
     assert data["data"]["name"] == "Test Consumer"
     assert data["data"]["account_type"] == "service_consumer"
 
+    response = client.post(
+        "/api/v1/consumers",
+        json={"name": "Bad History", "email": "bad-history@consumer.com", "address": {}, "service_history": {"a": 1}},
+    )
+    assert response.status_code == 400
+    assert response.get_json()["details"] == "service_history must be a list of objects"
+
+    response = client.put(f"/api/v1/consumers/{data['data']['id']}", json={"service_history": "not a list"})
+    assert response.status_code == 400
+
 
 def test_list_all_accounts(client):
     client.post(
@@ -153,6 +165,48 @@ def test_add_service_to_history(client):
     assert data["data"]["service_history"][0]["service"] == "plumbing repair"
 
 
+def test_paginate_service_history(client):
+    create_response = client.post(
+        "/api/v1/consumers",
+        json={
+            "name": "Long History",
+            "email": "long-history@test.com",
+            "address": {"street": "1 Archive St", "city": "Archive City"},
+            "service_history": [{"service": "service 0"}],
+        },
+    )
+    consumer_id = create_response.get_json()["data"]["id"]
+    for i in range(1, 8):
+        response = client.post(f"/api/v1/consumers/{consumer_id}/service-history", json={"service": f"service {i}"})
+
+    # Account reads carry only the latest entries
+    preview = response.get_json()["data"]["service_history"]
+    assert [entry["service"] for entry in preview] == [f"service {i}" for i in range(3, 8)]
+    assert client.get(f"/api/v1/consumers/{consumer_id}").get_json()["data"]["service_history"] == preview
+
+    services = []
+    cursor = None
+    while True:
+        url = f"/api/v1/consumers/{consumer_id}/service-history?limit=3"
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == 200
+        body = response.get_json()
+        services += [entry["payload"]["service"] for entry in body["data"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert services == [f"service {i}" for i in range(8)]
+
+    # PUT replaces the whole history
+    response = client.put(f"/api/v1/consumers/{consumer_id}", json={"service_history": [{"service": "only"}]})
+    assert response.get_json()["data"]["service_history"] == [{"service": "only"}]
+    response = client.get(f"/api/v1/consumers/{consumer_id}/service-history")
+    assert [entry["payload"] for entry in response.get_json()["data"]] == [{"service": "only"}]
+
+    missing_id = "00000000-0000-0000-0000-000000000000"
+    assert client.get(f"/api/v1/consumers/{missing_id}/service-history").status_code == 404
+
+
 def test_filter_by_account_type(client):
     client.post(
         "/api/v1/providers",
@@ -188,3 +242,453 @@ def test_account_not_found(client):
     assert response.status_code == 404
     data = response.get_json()
     assert "not found" in data["error"]
+
+
+def test_type_guarded_writes(client):
+    create_response = client.post(
+        "/api/v1/providers",
+        json={
+            "name": "Guarded Provider",
+            "email": "guarded@test.com",
+            "address": {"street": "1 Guard St", "city": "Guard City"},
+        },
+    )
+    provider_id = create_response.get_json()["data"]["id"]
+
+    # Consumer writes against a provider are rejected and leave it untouched
+    response = client.put(f"/api/v1/consumers/{provider_id}", json={"name": "Wrong Type"})
+    assert response.status_code == 400
+    assert "not a ServiceConsumer" in response.get_json()["error"]
+    response = client.post(f"/api/v1/consumers/{provider_id}/service-history", json={"service": "x"})
+    assert response.status_code == 400
+    response = client.delete(f"/api/v1/consumers/{provider_id}")
+    assert response.status_code == 400
+    assert client.get(f"/api/v1/{provider_id}").get_json()["data"]["name"] == "Guarded Provider"
+
+    # Unknown and malformed ids are not found
+    missing_id = "00000000-0000-0000-0000-000000000000"
+    assert client.put(f"/api/v1/providers/{missing_id}", json={"name": "Nobody"}).status_code == 404
+    assert client.delete(f"/api/v1/providers/{missing_id}").status_code == 404
+    assert client.delete("/api/v1/providers/not-a-uuid").status_code == 404
+
+    response = client.delete(f"/api/v1/providers/{provider_id}")
+    assert response.status_code == 200
+    assert client.delete(f"/api/v1/{provider_id}").status_code == 404
+
+
+def test_account_conditional_get(client):
+    create_response = client.post(
+        "/api/v1/consumers",
+        json={
+            "name": "ETag Consumer",
+            "email": "etag@test.com",
+            "address": {"street": "1 Cache St", "city": "Cache City"},
+        },
+    )
+    consumer_id = create_response.get_json()["data"]["id"]
+
+    response = client.get(f"/api/v1/consumers/{consumer_id}")
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+
+    for path in (f"/api/v1/{consumer_id}", f"/api/v1/consumers/{consumer_id}"):
+        response = client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+
+    # Wrong type still reports the error
+    response = client.get(f"/api/v1/providers/{consumer_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 400
+
+    # A subtype-only change bumps updated_at and so the ETag
+    client.post(f"/api/v1/consumers/{consumer_id}/service-history", json={"service": "cleaning"})
+    response = client.get(f"/api/v1/consumers/{consumer_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_list_conditional_get(client):
+    response = client.get("/api/v1/?limit=5")
+    etag = response.headers["ETag"]
+
+    response = client.get("/api/v1/?limit=5", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    # Different query, different ETag
+    response = client.get("/api/v1/?limit=6", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+    client.post(
+        "/api/v1/providers",
+        json={
+            "name": "Version Bump",
+            "email": "version-bump@test.com",
+            "address": {"street": "1 Version St", "city": "Version City"},
+        },
+    )
+    response = client.get("/api/v1/?limit=5", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_sparse_fieldsets(client):
+    create_response = client.post(
+        "/api/v1/providers",
+        json={
+            "name": "Sparse Provider",
+            "email": "sparse@test.com",
+            "address": {"street": "1 Narrow St", "city": "Narrow City"},
+            "tags": ["sparse"],
+            "hourly_rate": 42.0,
+        },
+    )
+    provider_id = create_response.get_json()["data"]["id"]
+
+    response = client.get("/api/v1/?tags=sparse&fields=name,tags")
+    assert response.status_code == 200
+    assert response.get_json()["data"] == [{"id": provider_id, "name": "Sparse Provider", "tags": ["sparse"]}]
+
+    response = client.get(f"/api/v1/providers/{provider_id}?fields=hourly_rate")
+    assert response.get_json()["data"] == {"id": provider_id, "hourly_rate": 42.0}
+
+    # A fieldset is a different representation, so it has its own ETag
+    full_etag = client.get(f"/api/v1/{provider_id}").headers["ETag"]
+    response = client.get(f"/api/v1/{provider_id}?fields=name", headers={"If-None-Match": full_etag})
+    assert response.status_code == 200
+
+    response = client.get("/api/v1/?fields=name,password")
+    assert response.status_code == 400
+
+
+def test_rate_range_sorted_by_rate(client):
+    for i, rate in enumerate([95.0, 40.0, 75.5, 60.0, None]):
+        provider = {
+            "name": f"Rate Provider {i}",
+            "email": f"rate-provider{i}@test.com",
+            "address": {"city": "Rate City"},
+            "tags": ["rate-test"],
+        }
+        if rate is not None:
+            provider["hourly_rate"] = rate
+        client.post("/api/v1/providers", json=provider)
+
+    rates = []
+    cursor = None
+    while True:
+        url = "/api/v1/?tags=rate-test&max_rate=80&sort=rate&limit=2&fields=hourly_rate"
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == 200
+        body = response.get_json()
+        rates += [account["hourly_rate"] for account in body["data"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert rates == [40.0, 60.0, 75.5]
+
+    response = client.get("/api/v1/search?q=rate&tags=rate-test&min_rate=70&sort=rate")
+    assert [account["hourly_rate"] for account in response.get_json()["data"]] == [75.5, 95.0]
+
+    assert client.get("/api/v1/?sort=relevance").status_code == 400
+    assert client.get("/api/v1/?min_budget=cheap").status_code == 400
+
+
+def test_providers_near_a_point(client):
+    # Roughly 0 km, 6 km and 300 km from downtown Boston, plus one without coordinates
+    places = [("Downtown", 42.3601, -71.0589), ("Cambridge", 42.3736, -71.1097), ("New York", 40.7128, -74.0060)]
+    for name, lat, lon in places + [("Nowhere", None, None)]:
+        address = {"city": name}
+        if lat is not None:
+            address.update(lat=lat, lon=lon)
+        client.post(
+            "/api/v1/providers",
+            json={"name": f"{name} Plumber", "email": f"{name.lower()}-geo@test.com", "address": address, "tags": ["geo-test"]},
+        )
+
+    names = []
+    distances = []
+    cursor = None
+    while True:
+        url = "/api/v1/?tags=geo-test&near=42.3601,-71.0589&radius_km=50&limit=1&fields=name"
+        body = client.get(url + (f"&cursor={cursor}" if cursor else "")).get_json()
+        names += [account["name"] for account in body["data"]]
+        distances += [account["distance_km"] for account in body["data"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert names == ["Downtown Plumber", "Cambridge Plumber"]
+    assert distances[0] == 0 and 4 < distances[1] < 6
+
+    # Without a radius every located provider comes back, nearest first
+    response = client.get("/api/v1/search?q=plumber&tags=geo-test&near=42.3601,-71.0589")
+    assert [account["address"]["city"] for account in response.get_json()["data"]] == ["Downtown", "Cambridge", "New York"]
+
+    assert client.get("/api/v1/?sort=distance").status_code == 400
+    assert client.get("/api/v1/?near=95,0").status_code == 400
+    assert client.get("/api/v1/?near=42,-71&radius_km=0").status_code == 400
+    response = client.post(
+        "/api/v1/providers", json={"name": "Bad", "email": "bad-geo@test.com", "address": {"lat": "north", "lon": 0}}
+    )
+    assert response.status_code == 400
+
+
+def test_providers_available_at(client):
+    schedules = {
+        "Office": "Mon-Fri 8AM-6PM",
+        "Weekend": {"sat-sun": "10:00-16:00"},
+        "Night": "Sun 10pm-2am",
+        "Always": "24/7",
+        "Vague": "Weekdays",
+    }
+    for name, availability in schedules.items():
+        client.post(
+            "/api/v1/providers",
+            json={
+                "name": f"{name} Cleaner",
+                "email": f"{name.lower()}-cleaner@test.com",
+                "address": {"city": "Schedule City"},
+                "tags": ["availability-test"],
+                "availability": availability,
+            },
+        )
+
+    def available(query):
+        response = client.get(f"/api/v1/?tags=availability-test&{query}&fields=name&limit=100")
+        assert response.status_code == 200
+        return sorted(account["name"].split()[0] for account in response.get_json()["data"])
+
+    # 2024-05-06 is a Monday, 2024-05-11 a Saturday and 2024-05-12 a Sunday
+    assert available("available_at=2024-05-06T09:30") == ["Always", "Office"]
+    assert available("available_at=2024-05-06T18:00") == ["Always"]
+    assert available("available_at=2024-05-11T12:00") == ["Always", "Weekend"]
+    assert available("available_at=2024-05-06T01:30:00%2B02:00") == ["Always", "Night"]
+    assert available("available_between=2024-05-12T23:00,2024-05-13T01:00") == ["Always", "Night"]
+    assert available("available_between=2024-05-06T17:00,2024-05-06T19:00") == ["Always"]
+
+    # Editing the schedule updates the windows
+    office = client.get("/api/v1/?tags=availability-test&available_at=2024-05-06T09:30&fields=name").get_json()
+    office_id = next(account["id"] for account in office["data"] if account["name"].startswith("Office"))
+    client.put(f"/api/v1/providers/{office_id}", json={"availability": "Mon-Fri: 8am-8pm"})
+    assert available("available_at=2024-05-06T19:00") == ["Always", "Office"]
+
+    assert client.get("/api/v1/?available_at=soon").status_code == 400
+    assert client.get("/api/v1/?available_between=2024-05-06T10:00,2024-05-06T09:00").status_code == 400
+
+
+def test_tags_are_normalized_and_match_all_or_any(client):
+    for i, tags in enumerate([["Mode-Roofer", " mode-urgent ", "MODE-URGENT"], ["mode-roofer"], ["mode-urgent"]]):
+        client.post(
+            "/api/v1/providers",
+            json={"name": f"Mode {i}", "email": f"mode{i}@test.com", "address": {"city": "Mode City"}, "tags": tags},
+        )
+
+    def names(query):
+        response = client.get(f"/api/v1/?{query}&fields=name,tags")
+        assert response.status_code == 200
+        return sorted(account["name"] for account in response.get_json()["data"])
+
+    first = client.get("/api/v1/?tags=mode-roofer&tags=mode-urgent&tags_mode=all").get_json()["data"]
+    assert [account["tags"] for account in first] == [["mode-roofer", "mode-urgent"]]
+
+    assert names("tags=Mode-Roofer&tags=mode-urgent") == ["Mode 0", "Mode 1", "Mode 2"]
+    assert names("tags=mode-roofer&tags=MODE-URGENT&tags_mode=all") == ["Mode 0"]
+    assert names("tags=mode-roofer&tags=mode-unknown&tags_mode=all") == []
+    assert names("tags=mode-roofer&tags=mode-unknown") == ["Mode 0", "Mode 1"]
+    assert client.get("/api/v1/?tags=mode-roofer&tags_mode=most").status_code == 400
+
+
+def test_list_accounts_pagination(client):
+    for i in range(3):
+        client.post(
+            "/api/v1/providers",
+            json={
+                "name": f"Page Provider {i}",
+                "email": f"page{i}@test.com",
+                "address": {"street": "1 Page St", "city": "Page City"},
+                "tags": ["pagination-test"],
+            },
+        )
+
+    first = client.get("/api/v1/?tags=pagination-test&limit=2").get_json()
+    assert len(first["data"]) == 2
+    assert first["next_cursor"]
+
+    second = client.get(f"/api/v1/?tags=pagination-test&limit=2&cursor={first['next_cursor']}").get_json()
+    assert len(second["data"]) == 1
+    assert second["next_cursor"] is None
+
+    names = [a["name"] for a in first["data"] + second["data"]]
+    assert names == ["Page Provider 2", "Page Provider 1", "Page Provider 0"]
+
+
+def test_list_accounts_invalid_pagination(client):
+    assert client.get("/api/v1/?limit=0").status_code == 400
+    assert client.get("/api/v1/?cursor=garbage").status_code == 400
+
+
+def test_stream_accounts_as_ndjson(client):
+    for i in range(3):
+        client.post(
+            "/api/v1/consumers",
+            json={
+                "name": f"Stream Consumer {i}",
+                "email": f"stream{i}@test.com",
+                "address": {"street": "1 Stream St", "city": "Stream City"},
+                "tags": ["stream-test"],
+            },
+        )
+
+    for query, headers in [
+        ("/api/v1/?tags=stream-test&stream=1", {}),
+        ("/api/v1/?tags=stream-test", {"Accept": "application/x-ndjson"}),
+    ]:
+        response = client.get(query, headers=headers)
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        lines = response.get_data(as_text=True).splitlines()
+        names = [json.loads(line)["name"] for line in lines]
+        assert names == ["Stream Consumer 2", "Stream Consumer 1", "Stream Consumer 0"]
+
+    # The stream keeps its connection while other requests come and go (without
+    # the fixture's app context, each request returns its connection when it ends)
+    bare_client = create_app().test_client()
+    response = bare_client.get("/api/v1/?tags=stream-test&stream=1&fields=name", buffered=False)
+    body = iter(response.response)
+    first = next(body)
+    other = threading.Thread(target=bare_client.get, args=("/api/v1/?limit=1",))
+    other.start()
+    other.join()
+    lines = (first + b"".join(body)).decode().splitlines()
+    assert len(lines) == 3
+    response.close()
+
+    # Invalid parameters are rejected before the stream starts, as without stream=1
+    for url in ("/api/v1/?stream=1&sort=distance", "/api/v1/?stream=1&tags=x&tags_mode=bogus"):
+        response = client.get(url)
+        assert response.status_code == 400, url
+        assert response.get_json()["error"] == "Validation error"
+
+    response = client.get("/api/v1/?tags=no-such-stream-tag&stream=1")
+    assert response.status_code == 200
+    assert response.get_data() == b""
+
+
+def test_batch_create_service_providers(client):
+    client.post(
+        "/api/v1/providers",
+        json={"name": "Existing", "email": "batch-existing@test.com", "address": {"city": "Batch City"}},
+    )
+
+    response = client.post(
+        "/api/v1/providers/batch",
+        json=[
+            {"name": "Batch 0", "email": "batch0@test.com", "address": {"city": "Batch City"}, "hourly_rate": 50},
+            {"name": "Batch 1", "email": "batch1@test.com", "address": "not a dict"},
+            {"name": "Batch 2", "email": "batch-existing@test.com", "address": {"city": "Batch City"}},
+            {"name": "Batch 3", "email": "batch0@test.com", "address": {"city": "Batch City"}},
+            {"name": "Batch 4", "email": "batch4@test.com", "address": {"city": "Batch City"}, "tags": ["batch"]},
+        ],
+    )
+    assert response.status_code == 201
+    data = response.get_json()
+    assert data["created"] == 2
+    assert data["failed"] == 3
+
+    results = data["data"]
+    assert "id" in results[0] and "id" in results[4]
+    assert results[1]["error"] == "Address must be a dictionary"
+    assert results[2]["error"] == "Email already exists"
+    assert results[3]["error"] == "Duplicate email in batch"
+
+    provider = client.get(f"/api/v1/providers/{results[0]['id']}").get_json()["data"]
+    assert provider["hourly_rate"] == 50.0
+
+    # Out of range amounts and bad availability are item errors, not a failed batch
+    response = client.post(
+        "/api/v1/providers/batch",
+        json=[
+            {"name": "Batch 5", "email": "batch5@test.com", "address": {"city": "Batch City"}, "hourly_rate": 1e12},
+            {"name": "Batch 6", "email": "batch6@test.com", "address": {"city": "Batch City"}, "hourly_rate": -1},
+            {"name": "Batch 7", "email": "batch7@test.com", "address": {"city": "Batch City"}, "availability": 5},
+            {"name": "Batch 8", "email": "batch8@test.com", "address": {"city": "Batch City"}, "availability": "24/7"},
+        ],
+    )
+    assert response.status_code == 201
+    results = response.get_json()["data"]
+    assert results[0]["error"] == results[1]["error"] == "hourly_rate must be at least 0 and less than 100000000"
+    assert results[2]["error"] == "availability must be a string or an object"
+    assert "id" in results[3]
+
+
+def test_concurrent_batches_with_the_same_new_tags(client):
+    # Each batch adds the same unseen tags in the opposite order; the dictionary
+    # rows must be locked in one order or the two transactions deadlock
+    bare_client = create_app().test_client()
+    statuses = []
+
+    def create(round_number, worker, tags):
+        batch = [
+            {
+                "name": f"Tag Race {round_number}-{worker}-{i}",
+                "email": f"tag-race-{round_number}-{worker}-{i}@test.com",
+                "address": {"city": "Race City"},
+                "tags": [tag],
+            }
+            for i, tag in enumerate(tags)
+        ]
+        statuses.append(bare_client.post("/api/v1/providers/batch", json=batch).status_code)
+
+    for round_number in range(5):
+        tags = [f"tag-race-{round_number}-{i}" for i in range(30)]
+        threads = [
+            threading.Thread(target=create, args=(round_number, 0, tags)),
+            threading.Thread(target=create, args=(round_number, 1, tags[::-1])),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert statuses == [201] * 10
+
+
+def test_batch_create_service_consumers(client):
+    response = client.post(
+        "/api/v1/consumers/batch",
+        json=[
+            {"name": f"Batch Consumer {i}", "email": f"batch-consumer{i}@test.com", "address": {"city": "Batch City"}}
+            for i in range(25)
+        ],
+    )
+    assert response.status_code == 201
+    assert response.get_json()["created"] == 25
+
+    response = client.post(
+        "/api/v1/consumers/batch",
+        json=[
+            {
+                "name": "Batch History",
+                "email": "batch-history@test.com",
+                "address": {"city": "Batch City"},
+                "service_history": [{"service": "first"}, {"service": "second"}],
+            }
+        ],
+    )
+    consumer_id = response.get_json()["data"][0]["id"]
+    response = client.get(f"/api/v1/consumers/{consumer_id}")
+    assert response.get_json()["data"]["service_history"] == [{"service": "first"}, {"service": "second"}]
+
+    response = client.post(
+        "/api/v1/consumers/batch",
+        json=[
+            {"name": "Bad History", "email": "bad-history@test.com", "address": {}, "service_history": {"a": 1}},
+            {"name": "Bad Entries", "email": "bad-entries@test.com", "address": {}, "service_history": ["x"]},
+            {"name": "Good History", "email": "good-history@test.com", "address": {}, "service_history": []},
+        ],
+    )
+    assert response.status_code == 201
+    results = response.get_json()["data"]
+    assert results[0]["error"] == results[1]["error"] == "service_history must be a list of objects"
+    assert "id" in results[2]
+
+    assert client.post("/api/v1/consumers/batch", json=[]).status_code == 400
+    assert client.post("/api/v1/consumers/batch", json={"name": "not a list"}).status_code == 400
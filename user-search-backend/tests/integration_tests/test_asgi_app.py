@@ -0,0 +1,106 @@
+import pytest
+
+pytest.importorskip("starlette")
+pytest.importorskip("psycopg_pool")
+pytest.importorskip("a2wsgi")
+
+from starlette.testclient import TestClient
+from app import create_app
+from asgi import create_asgi_app
+
+
+@pytest.fixture
+def client():
+    """Fixture to create a test client for the ASGI app (the lifespan opens its pool)"""
+    with TestClient(create_asgi_app()) as client:
+        yield client
+
+
+@pytest.fixture
+def flask_client():
+    """Fixture to create a test client for the Flask app, to compare responses with"""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        with app.app_context():
+            yield client
+
+
+def test_async_reads_match_flask(client, flask_client):
+    # Writes fall through to the Flask app
+    response = client.post(
+        "/api/v1/providers",
+        json={
+            "name": "Zarathine Async Carpentry",
+            "email": "zarathine.async@asgi.com",
+            "address": {"street": "1 Async St", "city": "Eventloop", "lat": 40.0, "lon": -75.0},
+            "tags": ["carpenter", "asgi"],
+            "availability": "Mon-Fri 8AM-6PM",
+            "hourly_rate": 42.5,
+        },
+    )
+    assert response.status_code == 201
+    provider_id = response.json()["data"]["id"]
+
+    for url in [
+        f"/api/v1/{provider_id}",
+        f"/api/v1/providers/{provider_id}",
+        f"/api/v1/{provider_id}?fields=name,tags",
+        f"/api/v1/consumers/{provider_id}",
+        "/api/v1/?tags=asgi&tags=carpenter&tags_mode=all&min_rate=40&limit=5",
+        "/api/v1/?tags=asgi&near=40.01,-75.01&radius_km=5",
+        "/api/v1/?tags=asgi&available_at=2024-05-06T09:30",
+        "/api/v1/search?q=zarathine",
+        "/api/v1/search?q=zarathine&sort=rate&fields=name",
+        "/api/v1/search?q=zarath&prefix=1",
+        "/api/v1/?limit=0",
+        "/api/v1/?stream=1&sort=distance",
+        "/api/v1/?stream=1&tags=x&tags_mode=bogus",
+    ]:
+        response, expected = client.get(url), flask_client.get(url)
+        assert response.status_code == expected.status_code, url
+        assert response.json() == expected.get_json(), url
+        assert response.headers.get("ETag") == expected.headers.get("ETag"), url
+    assert client.get("/api/v1/?tags=asgi&near=40.01,-75.01&radius_km=5").json()["data"][0]["id"] == provider_id
+
+    # Conditional requests use the same ETags
+    etag = client.get(f"/api/v1/{provider_id}").headers["ETag"]
+    assert client.get(f"/api/v1/{provider_id}", headers={"If-None-Match": etag}).status_code == 304
+    etag = client.get("/api/v1/search?q=zarathine").headers["ETag"]
+    assert client.get("/api/v1/search?q=zarathine", headers={"If-None-Match": etag}).status_code == 304
+
+    # Streaming
+    response = client.get("/api/v1/?tags=asgi&stream=1")
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    expected = flask_client.get("/api/v1/?tags=asgi&stream=1")
+    assert response.text == expected.get_data(as_text=True)
+
+
+def test_other_routes_fall_through_to_flask(client):
+    assert client.get("/").json()["status"] == "healthy"
+    assert client.get("/api/v1/not-a-uuid").status_code == 404
+    assert client.get("/api/v1/search").json()["error"] == "Missing search query"
+
+
+def test_request_id_reaches_flask_once(client):
+    for url in ("/api/v1/?limit=1", "/"):
+        response = client.get(url, headers={"X-Request-ID": "asgi-id-1"})
+        assert response.headers.get_list("x-request-id") == ["asgi-id-1"], url
+    assert len(client.get("/").headers["x-request-id"]) == 32
+
+
+def test_async_routes_are_measured(client):
+    before = client.get("/db/queries").json()["data"].get("iter_accounts", {}).get("statements", 0)
+    missing_id = "00000000-0000-0000-0000-000000000000"
+    assert client.get(f"/api/v1/providers/{missing_id}").status_code == 404
+    assert client.get("/api/v1/?limit=1&stream=1").status_code == 200
+
+    # Recorded under the same labels as the Flask routes, next to the passed-through ones
+    metrics = client.get("/metrics").text
+    route = 'route="/api/v1/providers/<account_id>",method="GET"'
+    assert f'http_requests_total{{{route},status="404"}} 1' in metrics
+    assert f"http_request_db_queries_sum{{{route}}} 1" in metrics
+    assert 'http_requests_total{route="/api/v1/",method="GET",status="200"} 1' in metrics
+
+    # Statements of the async queries are accounted per method too
+    assert client.get("/db/queries").json()["data"]["iter_accounts"]["statements"] > before
@@ -0,0 +1,67 @@
+import pytest
+from app import create_app
+
+
+@pytest.fixture
+def client():
+    """Fixture to create a test client for the app"""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        with app.app_context():
+            yield client
+
+
+def test_metrics_endpoint(client):
+    response = client.post(
+        "/api/v1/providers",
+        json={"name": "Metrics Provider", "email": "metrics@test.com", "address": {"city": "Metrics City"}},
+    )
+    account_id = response.get_json()["data"]["id"]
+    client.get(f"/api/v1/providers/{account_id}?fields=name")
+    client.get("/api/v1/?limit=1")
+    client.get("/api/v1/no-such-route/at-all")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    text = response.get_data(as_text=True)
+
+    assert 'http_requests_total{route="/api/v1/providers",method="POST",status="201"} 1' in text
+    assert 'http_requests_total{route="/api/v1/providers/<account_id>",method="GET",status="200"} 1' in text
+    assert 'http_requests_total{route="<unmatched>",method="GET",status="404"} 1' in text
+    assert 'route="/metrics"' not in text
+
+    # SQL statements are counted per request (the by-id read above was a cache hit)
+    samples = dict(line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+    labels = '{route="/api/v1/",method="GET"}'
+    assert samples[f"http_request_db_queries_count{labels}"] == "1"
+    assert int(samples[f"http_request_db_queries_sum{labels}"]) >= 1
+    assert float(samples[f"http_request_db_seconds_sum{labels}"]) > 0
+    assert "db_pool_in_use " in text
+
+
+def test_query_stats_by_method(client):
+    client.get("/api/v1/?limit=2")
+    client.get("/api/v1/search?q=metrics")
+
+    response = client.get("/db/queries")
+    assert response.status_code == 200
+    data = response.get_json()["data"]
+
+    listed = data["get_all_accounts"]
+    assert listed["statements"] >= 1
+    assert listed["total_ms"] > 0
+    assert listed["max_ms"] <= listed["total_ms"]
+    assert data["search_accounts"]["statements"] >= 1
+    # Private helpers are accounted to the public method that called them
+    assert not any(method.startswith("_") for method in data)
+
+
+def test_request_id_is_echoed_or_generated(client):
+    response = client.get("/", headers={"X-Request-ID": "client-id-1"})
+    assert response.headers["X-Request-ID"] == "client-id-1"
+
+    generated = client.get("/", headers={"X-Request-ID": "not a valid id"}).headers["X-Request-ID"]
+    assert generated != "not a valid id"
+    assert len(generated) == 32
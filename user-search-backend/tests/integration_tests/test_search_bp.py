@@ -0,0 +1,145 @@
+import pytest
+from app import create_app
+
+
+@pytest.fixture
+def client():
+    """Fixture to create a test client for the app"""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        with app.app_context():
+            yield client
+
+
+def test_search_accounts(client):
+    client.post(
+        "/api/v1/providers",
+        json={
+            "name": "Zebediah Plumbing",
+            "email": "zebediah.pipes@search.com",
+            "address": {"street": "1 Search St", "city": "Springfield"},
+            "tags": ["plumber", "emergency"],
+        },
+    )
+    client.post(
+        "/api/v1/consumers",
+        json={
+            "name": "Zebediah Homeowner",
+            "email": "zeb.home@search.com",
+            "address": {"street": "2 Search St", "city": "Shelbyville"},
+            "tags": ["homeowner"],
+        },
+    )
+
+    response = client.get("/api/v1/search?q=zebediah")
+    assert response.status_code == 200
+    data = response.get_json()
+    assert {a["name"] for a in data["data"]} >= {"Zebediah Plumbing", "Zebediah Homeowner"}
+
+    # Combined with the list filters
+    response = client.get("/api/v1/search?q=zebediah&account_type=service_consumer")
+    names = [a["name"] for a in response.get_json()["data"]]
+    assert "Zebediah Homeowner" in names
+    assert "Zebediah Plumbing" not in names
+
+    # Tags, email local part and city are searchable too
+    assert client.get("/api/v1/search?q=pipes").get_json()["data"][0]["name"] == "Zebediah Plumbing"
+    assert client.get("/api/v1/search?q=shelbyville").get_json()["data"][0]["name"] == "Zebediah Homeowner"
+
+    # Whole words only, unless the last word may be a prefix (search-as-you-type)
+    assert client.get("/api/v1/search?q=zebediah+plu").get_json()["data"] == []
+    names = [a["name"] for a in client.get("/api/v1/search?q=zebediah+plu&prefix=1").get_json()["data"]]
+    assert names == ["Zebediah Plumbing"]
+    assert client.get("/api/v1/search?q=%26%21&prefix=1").status_code == 400
+
+
+def test_search_ranks_name_matches_first(client):
+    client.post(
+        "/api/v1/providers",
+        json={
+            "name": "Quillon Electric",
+            "email": "sparks@rank.com",
+            "address": {"city": "Rank City"},
+            "tags": ["electrician"],
+        },
+    )
+    client.post(
+        "/api/v1/providers",
+        json={
+            "name": "Other Electric",
+            "email": "other@rank.com",
+            "address": {"city": "Rank City"},
+            "tags": ["quillon"],
+        },
+    )
+
+    first = client.get("/api/v1/search?q=quillon&limit=1").get_json()
+    assert first["data"][0]["name"] == "Quillon Electric"
+    assert first["next_cursor"]
+
+    second = client.get(f"/api/v1/search?q=quillon&limit=1&cursor={first['next_cursor']}").get_json()
+    assert second["data"][0]["name"] == "Other Electric"
+    assert second["next_cursor"] is None
+
+
+def test_search_requires_query(client):
+    response = client.get("/api/v1/search")
+    assert response.status_code == 400
+
+
+def test_suggest_tolerates_partial_words_and_typos(client):
+    client.post(
+        "/api/v1/providers",
+        json={
+            "name": "Bartholomew Carpentry",
+            "email": "bart@suggest.com",
+            "address": {"city": "Suggest City"},
+        },
+    )
+
+    for q in ["barth", "bartholmew", "carpentr"]:
+        response = client.get(f"/api/v1/suggest?q={q}")
+        assert response.status_code == 200
+        suggestions = response.get_json()["data"]
+        assert suggestions[0]["name"] == "Bartholomew Carpentry"
+        assert set(suggestions[0]) == {"id", "name", "account_type", "score"}
+
+
+def test_suggest_validates_parameters(client):
+    assert client.get("/api/v1/suggest").status_code == 400
+    assert client.get("/api/v1/suggest?q=ab&limit=0").status_code == 400
+    assert client.get("/api/v1/suggest?q=ab&threshold=2").status_code == 400
+
+
+def facet_counts(client, query=""):
+    response = client.get(f"/api/v1/facets/tags?limit=200{query}")
+    assert response.status_code == 200
+    return {f["tag"]: f["count"] for f in response.get_json()["data"]}
+
+
+def test_tag_facets_follow_writes(client):
+    before = facet_counts(client)
+
+    ids = []
+    for i, tags in enumerate([["facet-roofer", "facet-urgent"], ["facet-roofer"]]):
+        response = client.post(
+            "/api/v1/providers",
+            json={"name": f"Facet {i}", "email": f"facet{i}@test.com", "address": {"city": "Facet City"}, "tags": tags},
+        )
+        ids.append(response.get_json()["data"]["id"])
+
+    counts = facet_counts(client)
+    assert counts["facet-roofer"] == before.get("facet-roofer", 0) + 2
+    assert counts["facet-urgent"] == before.get("facet-urgent", 0) + 1
+    assert "facet-roofer" not in facet_counts(client, "&account_type=service_consumer")
+
+    client.put(f"/api/v1/providers/{ids[0]}", json={"tags": ["facet-urgent"]})
+    client.delete(f"/api/v1/{ids[1]}")
+
+    counts = facet_counts(client)
+    assert counts.get("facet-roofer", 0) == before.get("facet-roofer", 0)
+    assert counts["facet-urgent"] == before.get("facet-urgent", 0) + 1
+
+    # Filtered sub-queries are aggregated on the fly
+    assert facet_counts(client, "&tags=facet-urgent") == {"facet-urgent": counts["facet-urgent"]}
@@ -0,0 +1,27 @@
+import pytest
+from datetime import datetime
+from src.db.queries import MINUTES_PER_WEEK, availability_ranges, week_minute
+
+
+def test_week_minute_starts_on_monday():
+    assert week_minute(datetime(2024, 5, 6, 0, 0)) == 0  # Monday
+    assert week_minute(datetime(2024, 5, 8, 14, 30, 59)) == 2 * 1440 + 870
+
+
+def test_available_at_is_a_one_minute_range():
+    assert availability_ranges(datetime(2024, 5, 6, 9, 15)) == [(555, 556)]
+
+
+def test_available_between_rounds_out_to_whole_minutes():
+    start = datetime(2024, 5, 6, 9, 15, 30)
+    assert availability_ranges(start, datetime(2024, 5, 6, 10, 0, 1)) == [(555, 601)]
+
+
+def test_available_between_wraps_past_sunday_midnight():
+    start = datetime(2024, 5, 12, 23, 0)  # Sunday
+    assert availability_ranges(start, datetime(2024, 5, 13, 1, 0)) == [(10020, MINUTES_PER_WEEK), (0, 60)]
+
+
+def test_available_between_spans_at_most_a_week():
+    with pytest.raises(ValueError):
+        availability_ranges(datetime(2024, 5, 6), datetime(2024, 5, 14))
@@ -0,0 +1,64 @@
+import time
+from src.db.cache import AccountCache
+
+
+def test_get_returns_copies_and_counts_hits():
+    cache = AccountCache(max_size=10, ttl=60)
+    assert cache.get("a") is None
+
+    cache.set("a", {"name": "Alice"})
+    value = cache.get("a")
+    value["name"] = "Mutated"
+
+    assert cache.get("a") == {"name": "Alice"}
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = AccountCache(max_size=2, ttl=60)
+    cache.set("a", {"id": "a"})
+    cache.set("b", {"id": "b"})
+    cache.get("a")
+    cache.set("c", {"id": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl():
+    cache = AccountCache(max_size=10, ttl=0.01)
+    cache.set("a", {"id": "a"})
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_invalidate_removes_entry():
+    cache = AccountCache(max_size=10, ttl=60)
+    cache.set("a", {"id": "a"})
+    cache.invalidate("a")
+
+    assert cache.get("a") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_stale_load_is_not_cached_after_invalidation():
+    cache = AccountCache(max_size=10, ttl=60)
+    generation = cache.generation
+
+    # A write invalidates the key while the reader is still querying
+    cache.invalidate("a")
+    cache.set("a", {"id": "a", "name": "stale"}, generation)
+
+    assert cache.get("a") is None
+
+
+def test_disabled_cache_stores_nothing():
+    cache = AccountCache(max_size=0, ttl=60)
+    cache.set("a", {"id": "a"})
+    assert cache.get("a") is None
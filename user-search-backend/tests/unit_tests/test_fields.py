@@ -0,0 +1,41 @@
+import pytest
+from src.db.queries import ACCOUNT_COLUMNS, ACCOUNT_JOINS, AccountQueries, account_projection, normalize_tags, parse_fields
+
+
+def test_parse_fields():
+    assert parse_fields(None) is None
+    assert parse_fields("") is None
+    assert parse_fields("name, tags,name") == ("id", "name", "tags")
+
+
+def test_parse_fields_rejects_unknown_fields():
+    with pytest.raises(ValueError) as excinfo:
+        parse_fields("name,search_vector")
+    assert "search_vector" in str(excinfo.value)
+
+
+def test_projection_defaults_to_full_row():
+    assert account_projection(None) == (ACCOUNT_COLUMNS, ACCOUNT_JOINS)
+
+
+def test_projection_skips_unneeded_joins():
+    columns, joins = account_projection(("id", "name", "tags"))
+    assert columns == "a.id, a.account_type, a.created_at, a.updated_at, a.name, a.tags"
+    assert joins == "FROM accounts a"
+
+    columns, joins = account_projection(("id", "hourly_rate"))
+    assert "sp.hourly_rate" in columns
+    assert "service_providers" in joins
+    assert "service_consumers" not in joins
+
+
+def test_normalize_tags_matches_stored_form():
+    assert normalize_tags([" Plumber", "plumber", "", "  ", "EMERGENCY "]) == ["plumber", "emergency"]
+    assert normalize_tags(["\tplumber", "plumber\n"]) == ["\tplumber", "plumber\n"]
+
+
+def test_range_filters_compare_as_numeric():
+    # psycopg 3 binds floats as float8, which would hide the rate index
+    clauses, params = AccountQueries(None)._build_filters(ranges={"min_rate": 40.0})
+    assert clauses == " AND sp.hourly_rate >= %s::numeric"
+    assert params == [40.0]
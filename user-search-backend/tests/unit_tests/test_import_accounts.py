@@ -0,0 +1,83 @@
+import json
+import pytest
+from src.db.import_accounts import normalize_record, iter_records, plan_chunks, read_chunk_lines
+
+PROVIDER = {
+    "name": "Alice Johnson",
+    "email": "alice@plumbing.com",
+    "account_type": "service_provider",
+    "address": {"city": "Boston"},
+    "tags": ["plumber"],
+    "hourly_rate": 75,
+    "availability": "Mon-Fri 8AM-6PM",
+}
+
+
+def test_normalize_ndjson_record():
+    row = normalize_record(PROVIDER)
+    assert row[:3] == ["Alice Johnson", "alice@plumbing.com", "service_provider"]
+    assert json.loads(row[3]) == {"city": "Boston"}
+    assert json.loads(row[4]) == ["plumber"]
+    assert row[5] == 75.0
+    assert json.loads(row[6]) == "Mon-Fri 8AM-6PM"
+    assert json.loads(row[8]) == []
+
+
+def test_normalize_csv_record():
+    record = {
+        "name": "David Wilson",
+        "email": "david@homeowner.com",
+        "account_type": "service_consumer",
+        "address": '{"city": "Seattle"}',
+        "tags": "homeowner; budget-conscious",
+        "preferred_budget": "200",
+        "service_history": '[{"service": "plumbing repair"}]',
+    }
+    row = normalize_record(record)
+    assert json.loads(row[3]) == {"city": "Seattle"}
+    assert json.loads(row[4]) == ["homeowner", "budget-conscious"]
+    assert row[7] == 200.0
+    assert json.loads(row[8]) == [{"service": "plumbing repair"}]
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"name": ""},
+        {"email": "not-an-email"},
+        {"account_type": "admin"},
+        {"address": {}},
+        {"address": "123 Main St"},
+        {"tags": [1, 2]},
+        {"hourly_rate": "cheap"},
+    ],
+)
+def test_normalize_rejects_invalid_records(changes):
+    with pytest.raises(ValueError):
+        normalize_record({**PROVIDER, **changes})
+
+
+def test_iter_records_reports_bad_lines():
+    ndjson = ['{"name": "a"}\n', "\n", "{broken\n"]
+    results = list(iter_records(ndjson, "ndjson"))
+    assert results[0] == ({"name": "a"}, None)
+    assert results[1][0] is None and "invalid JSON" in results[1][1]
+
+    rows = list(iter_records(["a,b@x.com\n", "only-one\n"], "csv", header=["name", "email"]))
+    assert rows[0] == ({"name": "a", "email": "b@x.com"}, None)
+    assert rows[1][1] == "expected 2 columns, got 1"
+
+
+def test_chunks_are_line_aligned(tmp_path):
+    path = tmp_path / "accounts.ndjson"
+    lines = [json.dumps({**PROVIDER, "email": f"user{i}@example.com"}) + "\n" for i in range(100)]
+    path.write_text("".join(lines))
+
+    chunks = plan_chunks(str(path), 1000)
+    assert len(chunks) > 1
+    assert chunks[0][0] == 0 and chunks[-1][1] == path.stat().st_size
+
+    read_back = []
+    for start, end in chunks:
+        read_back.extend(read_chunk_lines(str(path), start, end).readlines())
+    assert read_back == lines
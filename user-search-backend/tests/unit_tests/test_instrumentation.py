@@ -0,0 +1,72 @@
+import asyncio
+from decimal import Decimal
+from src.db import instrumentation
+from src.db.instrumentation import redact, statement_shape, tag_query_methods
+from src.db.prepared import _statement_sql
+
+
+def test_redact_keeps_types_and_sizes_only():
+    params = ["secret@example.com", 42, Decimal("4.5"), None, True, ["a", "b"]]
+    assert redact(params) == ["<str:18>", "<int>", "<Decimal>", None, True, "<list:2>"]
+    assert redact({"email": "x@y.z"}) == {"email": "<str:5>"}
+    assert redact(None) is None
+
+
+def test_statement_shape_resolves_prepared_statements():
+    _statement_sql["account_stmt_test"] = "SELECT * FROM accounts WHERE id = %s"
+    assert statement_shape("SELECT  1\n  FROM accounts") == "SELECT 1 FROM accounts"
+    assert statement_shape("EXECUTE account_stmt_test (%s)") == (
+        "EXECUTE account_stmt_test (%s) -- SELECT * FROM accounts WHERE id = %s"
+    )
+
+
+def test_outermost_tagged_method_wins():
+    seen = []
+
+    @tag_query_methods
+    class Queries:
+        def outer(self):
+            self.inner()
+            seen.append(instrumentation._query_method.get())
+
+        def inner(self):
+            seen.append(instrumentation._query_method.get())
+
+        def rows(self):
+            seen.append(instrumentation._query_method.get())
+            yield 1
+            seen.append(instrumentation._query_method.get())
+            yield 2
+
+    Queries().outer()
+    items = Queries().rows()
+    assert next(items) == 1
+    # Nothing is tagged between items, while the consumer runs
+    assert instrumentation._query_method.get() is None
+    assert list(items) == [2]
+    assert seen == ["outer", "outer", "rows", "rows"]
+
+
+def test_async_methods_are_tagged():
+    seen = []
+
+    @tag_query_methods
+    class Queries:
+        async def outer(self):
+            seen.append(instrumentation._query_method.get())
+
+        async def rows(self):
+            seen.append(instrumentation._query_method.get())
+            yield 1
+            seen.append(instrumentation._query_method.get())
+            yield 2
+
+    async def run():
+        await Queries().outer()
+        items = Queries().rows()
+        assert await anext(items) == 1
+        assert instrumentation._query_method.get() is None
+        assert [item async for item in items] == [2]
+
+    asyncio.run(run())
+    assert seen == ["outer", "rows", "rows"]
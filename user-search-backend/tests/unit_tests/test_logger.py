@@ -0,0 +1,71 @@
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+from src.utils.logger import (
+    DebugSampler,
+    JsonFormatter,
+    LocalQueueHandler,
+    RequestIdFilter,
+    set_request_id,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+def make_logger(name, handler):
+    log = logging.getLogger(name)
+    log.propagate = False
+    log.setLevel(logging.DEBUG)
+    log.handlers = [handler]
+    return log
+
+
+def test_set_request_id_keeps_sane_ids_only():
+    assert set_request_id("abc-123.x:y_z") == "abc-123.x:y_z"
+    assert len(set_request_id("bad id\nInjected: 1")) == 32
+    assert len(set_request_id(None)) == 32
+
+
+def test_queued_json_records_carry_request_id_and_extras():
+    output = ListHandler()
+    output.setFormatter(JsonFormatter())
+    handler = LocalQueueHandler(queue.SimpleQueue())
+    handler.addFilter(RequestIdFilter())
+    listener = QueueListener(handler.queue, output)
+    listener.start()
+    log = make_logger("test-json-logging", handler)
+
+    set_request_id("req-1")
+    log.warning("Account %s not found", "a1", extra={"account_type": "provider"})
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        log.exception("Failed")
+    listener.stop()
+
+    first, second = [json.loads(line) for line in output.lines]
+    assert first["message"] == "Account a1 not found"
+    assert first["level"] == "WARNING"
+    assert first["request_id"] == "req-1"
+    assert first["account_type"] == "provider"
+    assert first["source"].startswith("test_logger.py:")
+    assert "ValueError: boom" in second["exception"]
+
+
+def test_debug_sampler_keeps_records_above_debug():
+    output = ListHandler()
+    output.addFilter(DebugSampler(0))
+    log = make_logger("test-sampled-logging", output)
+
+    for _ in range(100):
+        log.debug("noisy")
+    log.info("kept")
+    assert output.lines == ["kept"]
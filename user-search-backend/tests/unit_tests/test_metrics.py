@@ -0,0 +1,52 @@
+import threading
+from src.utils.metrics import Histogram, RequestMetrics, render_metrics
+
+
+def test_histogram_buckets():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.sum == 3.65
+
+
+def test_threads_record_into_their_own_shards():
+    metrics = RequestMetrics()
+
+    def record():
+        for _ in range(1000):
+            metrics.observe("/api/v1/", "GET", 200, 0.01, 100, 0.002, 2)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    metrics.observe("/api/v1/", "GET", 500, 0.2)
+
+    stats = metrics.snapshot()[("/api/v1/", "GET")]
+    assert stats.statuses == {200: 4000, 500: 1}
+    assert stats.latency.count == 4001
+    assert stats.size.count == 4000
+    assert stats.db_queries.sum == 8000
+
+    # Finished threads are folded into the retired totals, which later scrapes keep
+    assert len(metrics._stats._shards) == 1
+    assert metrics.snapshot()[("/api/v1/", "GET")].statuses == {200: 4000, 500: 1}
+
+
+def test_render_prometheus_text():
+    metrics = RequestMetrics()
+    metrics.observe("/api/v1/<account_id>", "GET", 404, 0.003, 30, 0.001, 1)
+    text = render_metrics(metrics, {"in_use": 2, "acquired": 7, "wait_seconds_total": 0.5})
+
+    labels = 'route="/api/v1/<account_id>",method="GET"'
+    assert f'http_requests_total{{{labels},status="404"}} 1' in text
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.005"}} 1' in text
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+    assert f'http_response_size_bytes_bucket{{{labels},le="256"}} 1' in text
+    assert f'http_request_db_queries_bucket{{{labels},le="0"}} 0' in text
+    assert "# TYPE db_pool_in_use gauge\ndb_pool_in_use 2" in text
+    assert "# TYPE db_pool_acquired_total counter\ndb_pool_acquired_total 7" in text
+    assert "db_pool_wait_seconds_total 0.5" in text
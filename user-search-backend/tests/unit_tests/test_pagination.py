@@ -0,0 +1,33 @@
+import pytest
+from datetime import datetime, timezone
+from src.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, parse_limit, encode_cursor, decode_cursor
+
+
+def test_parse_limit_defaults():
+    assert parse_limit(None) == DEFAULT_PAGE_SIZE
+    assert parse_limit("") == DEFAULT_PAGE_SIZE
+    assert parse_limit("25") == 25
+
+
+def test_parse_limit_rejects_invalid_values():
+    with pytest.raises(ValueError):
+        parse_limit("abc")
+    with pytest.raises(ValueError):
+        parse_limit("0")
+    with pytest.raises(ValueError):
+        parse_limit(str(MAX_PAGE_SIZE + 1))
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 8, 10, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    token = encode_cursor([created_at, "0b7e1c9e-4c1e-4b8a-9a43-0d2f6f1f7c11"])
+
+    assert "=" not in token
+    assert decode_cursor(token, 2) == [created_at.isoformat(), "0b7e1c9e-4c1e-4b8a-9a43-0d2f6f1f7c11"]
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor!", 2)
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(["only-one"]), 2)
@@ -0,0 +1,139 @@
+import threading
+import pytest
+from psycopg2 import extensions
+from src.db.pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        if self.conn.broken:
+            raise Exception("server closed the connection unexpectedly")
+        self.conn.pings += 1
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.pings = 0
+        self.rollbacks = 0
+        self.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.transaction_status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def connect():
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    return ConnectionPool(connect, **kwargs), created
+
+
+def test_connections_are_reused():
+    pool, created = make_pool(min_size=0, max_size=2)
+
+    conn = pool.getconn()
+    pool.putconn(conn)
+    assert pool.getconn() is conn
+    assert len(created) == 1
+
+
+def test_fill_opens_min_size_connections():
+    pool, created = make_pool(min_size=3, max_size=5)
+    pool.fill()
+
+    stats = pool.stats()
+    assert len(created) == 3
+    assert stats["size"] == 3
+    assert stats["idle"] == 3
+    assert stats["in_use"] == 0
+
+
+def test_acquire_times_out_when_exhausted():
+    pool, _ = make_pool(min_size=0, max_size=1, timeout=0.05)
+    pool.getconn()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.getconn()
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_waiter_gets_returned_connection():
+    pool, created = make_pool(min_size=0, max_size=1, timeout=2)
+    conn = pool.getconn()
+    result = {}
+
+    waiter = threading.Thread(target=lambda: result.setdefault("conn", pool.getconn()))
+    waiter.start()
+    pool.putconn(conn)
+    waiter.join(timeout=2)
+
+    assert result["conn"] is conn
+    assert len(created) == 1
+
+
+def test_open_transaction_is_rolled_back_on_return():
+    pool, _ = make_pool(min_size=0, max_size=1)
+    conn = pool.getconn()
+    conn.transaction_status = extensions.TRANSACTION_STATUS_INTRANS
+
+    pool.putconn(conn)
+    assert conn.rollbacks == 1
+
+
+def test_expired_connections_are_recycled():
+    pool, created = make_pool(min_size=0, max_size=1, max_lifetime=0.01)
+    conn = pool.getconn()
+    threading.Event().wait(0.02)
+    pool.putconn(conn)
+
+    assert conn.closed
+    assert pool.getconn() is not conn
+    assert len(created) == 2
+
+
+def test_health_check_discards_broken_connection():
+    pool, created = make_pool(min_size=0, max_size=1, health_check_idle=0)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    conn.broken = True
+
+    fresh = pool.getconn()
+    assert fresh is not conn
+    assert conn.closed
+    assert pool.stats()["health_check_failures"] == 1
+
+
+def test_foreign_connection_is_rejected():
+    pool, _ = make_pool(min_size=0, max_size=1)
+    with pytest.raises(ValueError):
+        pool.putconn(FakeConnection())
+
+
+def test_invalid_sizes():
+    with pytest.raises(ValueError):
+        make_pool(min_size=5, max_size=2)
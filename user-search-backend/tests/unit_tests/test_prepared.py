@@ -0,0 +1,67 @@
+import pytest
+from src.db import prepared as prepared_module
+from src.db.prepared import PreparedStatements, prepared, statement_signature, to_positional
+
+
+class FakeConnection:
+    pass
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.executed = []
+
+    def execute(self, query, params=None):
+        self.executed.append(query)
+
+
+def test_to_positional():
+    assert to_positional("SELECT * FROM t WHERE a = %s AND b LIKE 'x%%' LIMIT %s") == (
+        "SELECT * FROM t WHERE a = $1 AND b LIKE 'x%' LIMIT $2",
+        2,
+    )
+    assert to_positional("SELECT 1") == ("SELECT 1", 0)
+
+
+def test_signature_ignores_whitespace():
+    assert statement_signature("SELECT a\n    FROM t\n  WHERE id = %s ") == "SELECT a FROM t WHERE id = %s"
+
+
+def test_statements_are_prepared_once_per_connection(monkeypatch):
+    monkeypatch.setattr(prepared_module, "PREPARED_STATEMENT_CACHE_SIZE", 100)
+    cursor = FakeCursor(FakeConnection())
+
+    query, params = prepared(cursor, "SELECT * FROM t WHERE id = %s", ["x"])
+    assert query.startswith("EXECUTE account_stmt_") and query.endswith(" (%s)")
+    assert params == ["x"]
+    assert len(cursor.executed) == 1 and cursor.executed[0].endswith("AS SELECT * FROM t WHERE id = $1")
+
+    # Same shape: no new PREPARE; a new connection prepares its own
+    assert prepared(cursor, "SELECT *  FROM t\nWHERE id = %s", ["y"]) == (query, ["y"])
+    assert len(cursor.executed) == 1
+    other = FakeCursor(FakeConnection())
+    assert prepared(other, "SELECT * FROM t WHERE id = %s", ["x"])[0] == query
+    assert len(other.executed) == 1
+
+    query, params = prepared(cursor, "SELECT 1", [])
+    assert query.startswith("EXECUTE account_stmt_") and "(" not in query
+    with pytest.raises(ValueError):
+        prepared(cursor, "SELECT %s", [])
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.setattr(prepared_module, "PREPARED_STATEMENT_CACHE_SIZE", 0)
+    cursor = FakeCursor(FakeConnection())
+    assert prepared(cursor, "SELECT %s", [1]) == ("SELECT %s", [1])
+    assert cursor.executed == []
+
+
+def test_least_recently_used_statement_is_deallocated():
+    statements = PreparedStatements(max_size=2)
+    assert statements.add("a", "stmt_a") is None
+    assert statements.add("b", "stmt_b") is None
+    assert statements.get("a") == "stmt_a"
+    assert statements.add("c", "stmt_c") == "stmt_b"
+    assert statements.get("b") is None
+    assert len(statements) == 2
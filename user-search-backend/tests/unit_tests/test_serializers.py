@@ -0,0 +1,75 @@
+import json
+import uuid
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+from flask import Flask
+from api import json_provider
+from api.json_provider import AccountJSONProvider
+from api.v1.serializers import format_account
+
+CREATED_AT = datetime(2024, 8, 10, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def make_row(**overrides):
+    row = {
+        "id": uuid.UUID("0b7e1c9e-4c1e-4b8a-9a43-0d2f6f1f7c11"),
+        "name": "Alice",
+        "email": "alice@test.com",
+        "address": {"city": "Boston"},
+        "tags": ["plumber"],
+        "account_type": "service_provider",
+        "created_at": CREATED_AT,
+        "updated_at": CREATED_AT,
+        "hourly_rate": Decimal("85.50"),
+        "availability": None,
+        "preferred_budget": None,
+        "service_history": None,
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture(params=["orjson", "json"])
+def app(request, monkeypatch):
+    if request.param == "orjson":
+        if json_provider.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(json_provider, "orjson", None)
+
+    app = Flask(__name__)
+    app.json = AccountJSONProvider(app)
+    return app
+
+
+def test_format_account_keeps_only_set_type_fields():
+    data = format_account(make_row())
+
+    assert data["hourly_rate"] == Decimal("85.50")
+    assert "availability" not in data
+    assert "preferred_budget" not in data
+    assert "service_history" not in data
+
+
+def test_provider_encodes_database_types(app):
+    with app.app_context():
+        response = app.json.response({"data": format_account(make_row())})
+
+    data = json.loads(response.get_data())["data"]
+    assert data["id"] == "0b7e1c9e-4c1e-4b8a-9a43-0d2f6f1f7c11"
+    assert data["created_at"] == CREATED_AT.isoformat()
+    assert data["hourly_rate"] == 85.5
+    assert list(data)[:3] == ["id", "name", "email"]
+    assert response.mimetype == "application/json"
+
+
+def test_provider_rejects_unknown_types(app):
+    with pytest.raises(TypeError):
+        app.json.dumps({"value": object()})
+
+
+def test_format_account_sparse_fieldset():
+    data = format_account(make_row(), ("id", "name", "hourly_rate", "service_history"))
+
+    assert list(data) == ["id", "name", "hourly_rate"]
@@ -6,6 +6,8 @@ function App() {
   const [filteredAccounts, setFilteredAccounts] = useState([]);
   const [searchTerm, setSearchTerm] = useState('');
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null); // null once the last page is loaded
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedAccount, setSelectedAccount] = useState(null);
   const [showCreateForm, setShowCreateForm] = useState(null); // 'provider' or 'consumer'
 
@@ -14,14 +16,23 @@ function App() {
     fetchAccounts();
   }, []);
 
-  // Filter accounts when search term changes
+  // Search on the server when the search term changes (debounced)
   useEffect(() => {
-    filterAccounts();
+    const controller = new AbortController();
+    const timeout = setTimeout(() => filterAccounts(controller.signal), 250);
+    return () => {
+      clearTimeout(timeout);
+      controller.abort();
+    };
   }, [searchTerm, accounts]);
 
-  const fetchAccounts = async () => {
+  // Loads the first page, or appends the page after `cursor`
+  const fetchAccounts = async (cursor = null) => {
     try {
-      const response = await fetch('http://localhost:3000/api/v1/');
+      const url = cursor
+        ? `http://localhost:3000/api/v1/?cursor=${encodeURIComponent(cursor)}`
+        : 'http://localhost:3000/api/v1/';
+      const response = await fetch(url);
       const data = await response.json();
       console.log('API Response:', data); // Debug log
       console.log('Sample account availability:', data.data?.[0]?.availability); // Debug availability field
@@ -49,40 +60,41 @@ function App() {
         accountsArray = [];
       }
 
-      setAccounts(accountsArray);
+      setAccounts(prev => (cursor ? [...prev, ...accountsArray] : accountsArray));
+      setNextCursor(data?.next_cursor || null);
       setLoading(false);
+      setLoadingMore(false);
     } catch (error) {
       console.error('Error fetching accounts:', error);
-      setAccounts([]); // Set empty array on error
+      if (!cursor) setAccounts([]); // Set empty array on error, keep loaded pages otherwise
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
-  const filterAccounts = () => {
+  const loadMoreAccounts = () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    fetchAccounts(nextCursor);
+  };
+
+  const filterAccounts = async (signal) => {
     if (!searchTerm.trim()) {
       setFilteredAccounts(accounts);
       return;
     }
 
-    const filtered = accounts.filter(account => {
-      const searchLower = searchTerm.toLowerCase();
-
-      // Search in name
-      if (account.name?.toLowerCase().includes(searchLower)) return true;
-
-      // Search in tags
-      if (account.tags?.some(tag => tag.toLowerCase().includes(searchLower))) return true;
-
-      // Search in account type
-      if (account.account_type?.toLowerCase().includes(searchLower)) return true;
-
-      // Search in email
-      if (account.email?.toLowerCase().includes(searchLower)) return true;
-
-      return false;
-    });
-
-    setFilteredAccounts(filtered);
+    try {
+      const query = encodeURIComponent(searchTerm.trim());
+      // prefix=1: the word being typed matches as a prefix ("plu" finds "plumber")
+      const response = await fetch(`http://localhost:3000/api/v1/search?q=${query}&prefix=1`, { signal });
+      const data = await response.json();
+      setFilteredAccounts(Array.isArray(data.data) ? data.data : []);
+    } catch (error) {
+      if (error.name === 'AbortError') return;
+      console.error('Error searching accounts:', error);
+      setFilteredAccounts([]);
+    }
   };
 
   const handleSearchChange = (e) => {
@@ -508,7 +520,9 @@ function App() {
         {loading ? (
           <p>Loading...</p>
         ) : (
-          <p>{filteredAccounts.length} results found</p>
+          <p>
+            {filteredAccounts.length}{!searchTerm.trim() && nextCursor ? '+' : ''} results found
+          </p>
         )}
       </div>
 
@@ -527,6 +541,19 @@ function App() {
         )}
       </div>
 
+      {/* Next page of the account list */}
+      {!loading && !searchTerm.trim() && nextCursor && (
+        <div className="load-more">
+          <button
+            className="add-button load-more-button"
+            onClick={loadMoreAccounts}
+            disabled={loadingMore}
+          >
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
+
       {/* Modal for account details */}
       {selectedAccount && (
         <AccountModal account={selectedAccount} onClose={closeModal} />